@@ -2,19 +2,29 @@ from __future__ import annotations
 
 import copy
 import re
-from itertools import combinations
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
 
+from ai import combat_eval
+from ai.decision_context import DecisionContext, decision_cached
+from ai.decision_profile import CountingRulesEngine, DecisionProfile
 from ai.endgame_policy import should_force_closure, should_force_inevitability_line
-from ai.heuristics import evaluate_board
+from ai.heuristics import _noncreature_value, evaluate_board
 from ai.log_priors import load_log_priors
 from ai.matchup_profiles import profile_for
+from ai.mcts import MCTSSearch
+from ai.parallel_search import RootTask, run_root_tasks
+from ai.search_budget import SearchBudget, default_max_nodes
+from ai.transposition import TranspositionTable, move_key
+from game_state.serializers import serialize_match_snapshot
 from game_state.state import MatchState, Zone
-from rules_engine.engine import RulesEngine
+from game_state.state_hash import state_hash
 from rules_engine import combat
 from rules_engine.continuous import effective_keywords, effective_power, effective_toughness
 from rules_engine.land_rules import compute_max_land_plays_this_turn
 from rules_engine.mana import can_pay_with_pool_and_lands, mana_value, parse_mana_cost
+from rules_engine.restrictions import card_cant_block
 
 
 def _has_counter_spell_text(text: str) -> bool:
@@ -22,6 +32,23 @@ def _has_counter_spell_text(text: str) -> bool:
     return "counter target spell" in normalized or "counter target noncreature spell" in normalized or "counterspell" in normalized
 
 
+def _position_hash(state) -> int | None:
+    """Position hash for transposition lookups; duck-typed test states opt out."""
+    if not isinstance(state, MatchState):
+        return None
+    return state_hash(state)
+
+
+@lru_cache(maxsize=1)
+def _learned_eval_model():
+    """The fitted linear evaluation from ai/data, or None without NumPy or weights."""
+    try:
+        from ai.linear_eval import load_linear_eval
+    except ImportError:
+        return None
+    return load_linear_eval()
+
+
 def _effective_combat_stats(state: MatchState, card_id: str) -> tuple[int, int]:
     """Read resolved combat stats, falling back safely for lightweight fixtures."""
     card = state.cards.get(card_id)
@@ -39,88 +66,190 @@ class AIDecision:
     reasoning: str
 
 
+# Experimental: master_plus can swap its greedy rollout layer for a UCT
+# search (ai.mcts). It stays off until scripts/benchmark_mcts.py shows it
+# beating the rollouts; so far it has only tied them.
+DEFAULT_MCTS_SIMULATIONS = 0
+# Leaves scored per MCTS wave when a batch evaluator is loaded.
+_MCTS_LEAF_BATCH = 8
+# Board size the analytic block search takes on; larger boards use the greedy blocker.
+_BLOCK_SEARCH_MAX_ATTACKERS = 8
+_BLOCK_SEARCH_MAX_BLOCKERS = 10
+# Attack planning: creatures per side, subsets enumerated outright, and
+# node limits for the modelled block and crackback responses.
+_ATTACK_SEARCH_MAX_CREATURES = 12
+_ATTACK_SEARCH_EXHAUSTIVE = 64
+_ATTACK_RESPONSE_SEARCH_NODES = 200
+_CRACKBACK_SEARCH_NODES = 100
+
+
 class AIAgent:
     _log_priors_cache: dict | None = None
 
-    def __init__(self, difficulty: str = "strong", archetype: str = "Midrange", opponent_archetype: str | None = None):
+    def __init__(
+        self,
+        difficulty: str = "strong",
+        archetype: str = "Midrange",
+        opponent_archetype: str | None = None,
+        think_ms: float | None = None,
+        max_nodes: int | None = None,
+        mcts_simulations: int | None = None,
+        search_workers: int = 0,
+        learned_eval: bool = False,
+    ):
         self.difficulty = difficulty.lower()
         self.archetype = archetype
         self.opponent_archetype = opponent_archetype
         self.matchup_profile = profile_for(archetype, opponent_archetype)
-        self.engine = RulesEngine()
+        self.engine = CountingRulesEngine()
         self._main_pass_signature_counts: dict[tuple, int] = {}
+        # Strategic search results, shared by the decisions of one turn.
+        self.transpositions = TranspositionTable()
+        # Per-decision search allowance; lookahead stops deepening once spent.
+        # Only the node limit is on by default, so seeded games stay
+        # deterministic; interactive play passes a think_ms cap.
+        self.think_ms = None if think_ms is None else float(think_ms)
+        self.max_nodes = default_max_nodes(self.difficulty) if max_nodes is None else int(max_nodes)
+        self._search_budget: SearchBudget | None = None
+        self.last_search: dict = {}
+        self._decision_context: DecisionContext | None = None
+        # Per-stage wall time and simulation work of the latest decision, for AI traces.
+        self.last_profile: dict = {}
+        self._profile: DecisionProfile | None = None
+        # Opt-in, experimental: master_plus replaces its rollout layer with a UCT
+        # search of this many simulations. 0, the default, keeps the rollouts.
+        self.mcts_simulations = DEFAULT_MCTS_SIMULATIONS if mcts_simulations is None else int(mcts_simulations)
+        # The fitted linear model from ai/data scores strategic beam children
+        # and MCTS leaf waves in one batch; without NumPy or weights the
+        # hand-tuned board is used.
+        self.eval_model = _learned_eval_model() if learned_eval else None
+        self.mcts = MCTSSearch(
+            self.engine,
+            self._mcts_moves,
+            simulations=self.mcts_simulations,
+            spend=self._search_node,
+            work=self.engine.work,
+            evaluate=self._board_values,
+            batch=_MCTS_LEAF_BATCH if self.eval_model is not None else 1,
+        )
+        # Root candidates of the strategic planner are searched on this many
+        # worker processes; 0 keeps the search in-process.
+        self.search_workers = max(0, int(search_workers))
         if AIAgent._log_priors_cache is None:
             AIAgent._log_priors_cache = load_log_priors()
 
     def choose_action(self, state: MatchState, legal_moves: list[dict], player_id: int) -> AIDecision:
+        scope = (getattr(state, "id", None), getattr(state, "turn", None))
+        self.transpositions.begin_decision(scope)
+        self.mcts.begin_decision(scope)
+        self._search_budget = SearchBudget(self.think_ms, self.max_nodes)
+        self._decision_context = DecisionContext(state)
+        self._profile = DecisionProfile(self.engine.work)
+        try:
+            return self._choose_action(state, legal_moves, player_id)
+        finally:
+            self.last_search = self._search_budget.stats()
+            self.last_profile = self._profile.summary()
+            self._search_budget = None
+            self._decision_context = None
+            self._profile = None
+
+    def _stage(self, name: str, probe, *args):
+        """Run one stage of the decision cascade, profiled when a decision is open."""
+        profile = self._profile
+        if profile is None:
+            return probe(*args)
+        return profile.run(name, probe, *args)
+
+    def _fork_state(self, state):
+        """Branch a state for lookahead; duck-typed test states fall back to deepcopy."""
+        self.engine.work.forks += 1
+        fork = getattr(state, "fork", None)
+        if callable(fork):
+            return fork()
+        return copy.deepcopy(state)
+
+    def _search_node(self) -> bool:
+        """Charge one simulated node to the current decision; False once spent."""
+        budget = self._search_budget
+        return budget is None or budget.spend()
+
+    def _combat_stats(self, state: MatchState, card_id: str) -> tuple[int, int]:
+        context = self._decision_context
+        if context is None or context.state is not state:
+            return _effective_combat_stats(state, card_id)
+        stats = context.combat_stats.get(card_id)
+        if stats is None:
+            stats = context.combat_stats[card_id] = _effective_combat_stats(state, card_id)
+        return stats
+
+    @decision_cached
+    def _root_evaluation(self, state: MatchState, player_id: int) -> float:
+        return evaluate_board(state, player_id)
+
+    def _search_exhausted(self) -> bool:
+        budget = self._search_budget
+        return budget is not None and budget.exhausted
+
+    def _choose_action(self, state: MatchState, legal_moves: list[dict], player_id: int) -> AIDecision:
         legal_moves = [move for move in legal_moves if not str(move.get("type", "")).endswith("_restricted")]
         if getattr(state, "pregame_pending", False):
-            return self.choose_mulligan_action(state, player_id)
+            return self._stage("mulligan", self.choose_mulligan_action, state, player_id)
         if not legal_moves:
             return AIDecision(action={"type": "pass_priority"}, reasoning="No legal actions")
         if _step_key(getattr(state, "step", "")) == "declare_blockers" and getattr(state, "active_player", player_id) != player_id:
             if bool(getattr(state, "blocks", {})):
                 return AIDecision(action={"type": "pass_priority"}, reasoning="Blocks already declared; pass priority")
         if _step_key(getattr(state, "step", "")) == "declare_attackers" and getattr(state, "active_player", player_id) == player_id:
-            forced_attack = self._forced_progress_attack(state, legal_moves, player_id)
+            forced_attack = self._stage("progress_attack", self._forced_progress_attack, state, legal_moves, player_id)
             if forced_attack is not None:
                 return AIDecision(action=forced_attack, reasoning="Late-game progress attack to avoid stall timeout")
 
-        forced_land = self._choose_forced_land_play(state, legal_moves, player_id)
+        forced_land = self._stage("forced_land_play", self._choose_forced_land_play, state, legal_moves, player_id)
         if forced_land is not None:
             return AIDecision(action=forced_land, reasoning="Prioritize reliable land development on own main phase")
 
-        forced_stabilize = self._forced_sweeper_stabilization_line(state, legal_moves, player_id)
+        forced_stabilize = self._stage("sweeper_stabilization", self._forced_sweeper_stabilization_line, state, legal_moves, player_id)
         if forced_stabilize is not None:
             return AIDecision(action=forced_stabilize, reasoning="Burn matchup stabilization: remove pressure before value lines")
 
-        stack_interaction = self._forced_stack_interaction(state, legal_moves, player_id)
+        stack_interaction = self._stage("stack_interaction", self._forced_stack_interaction, state, legal_moves, player_id)
         if stack_interaction is not None:
             return AIDecision(action=stack_interaction, reasoning="Answer threatening stack item with available interaction")
 
-        endstep_draw = self._forced_endstep_card_advantage(state, legal_moves, player_id)
+        endstep_draw = self._stage("endstep_card_advantage", self._forced_endstep_card_advantage, state, legal_moves, player_id)
         if endstep_draw is not None:
             return AIDecision(action=endstep_draw, reasoning="Use opponent end step for instant-speed card advantage")
-        tempo_closure = self._choose_forced_tempo_noncontrol_closure_action(state, legal_moves, player_id)
+        tempo_closure = self._stage("tempo_closure", self._choose_forced_tempo_noncontrol_closure_action, state, legal_moves, player_id)
         if tempo_closure is not None:
             return AIDecision(action=tempo_closure, reasoning="Tempo non-control closure: force proactive conversion to avoid stalls")
 
-        inevitability = self._choose_forced_inevitability_action(state, legal_moves, player_id)
+        inevitability = self._stage("inevitability", self._choose_forced_inevitability_action, state, legal_moves, player_id)
         if inevitability is not None:
             return AIDecision(action=inevitability, reasoning="Control endgame planner selected long-game conversion line")
-        closure = self._choose_forced_closure_action(state, legal_moves, player_id)
+        closure = self._stage("closure", self._choose_forced_closure_action, state, legal_moves, player_id)
         if closure is not None:
             return AIDecision(action=closure, reasoning="Force late-game proactive line to avoid control stall/timeouts")
 
-        strategic = self._strategic_plan_action(state, legal_moves, player_id)
+        strategic = self._stage("strategic_plan", self._strategic_plan_action, state, legal_moves, player_id)
         if strategic is not None:
             return AIDecision(action=strategic, reasoning="Complex-board strategic planner selected best line")
 
-        sorted_moves = self._rank_moves(state, legal_moves, player_id)
+        sorted_moves = self._stage("rank_moves", self._rank_moves, state, legal_moves, player_id)
         if self._should_break_stall(state, legal_moves, player_id):
             proactive = self._best_proactive_non_pass(sorted_moves, state, player_id)
             if proactive is not None:
-                proactive = self._materialize_action(state, proactive, player_id)
+                proactive = self._stage("materialize", self._materialize_action, state, proactive, player_id)
                 if not proactive.get("_invalid_ai_choice") and not self._is_unplayable_x_action(proactive):
                     return AIDecision(action=proactive, reasoning="Break pass-loop by selecting proactive legal action")
         if self.difficulty == "casual":
             ranked_candidates = sorted_moves[min(1, len(sorted_moves) - 1) :]
         else:
             ranked_candidates = sorted_moves
-        move = None
-        for cand in ranked_candidates:
-            materialized = self._materialize_action(state, cand, player_id)
-            if materialized.get("_invalid_ai_choice"):
-                continue
-            if self._is_action_obviously_illegal(state, materialized, player_id):
-                continue
-            if self._is_unplayable_x_action(materialized):
-                continue
-            move = materialized
-            break
+        move = self._stage("materialize", self._first_playable_candidate, state, ranked_candidates, player_id)
         if move is None:
             move = {"type": "pass_priority"}
-        move = self._avoid_pass_with_main_phase_options(state, legal_moves, player_id, move)
+        move = self._stage("avoid_pass", self._avoid_pass_with_main_phase_options, state, legal_moves, player_id, move)
         if move.get("type") == "block" and not move.get("blocks"):
             return AIDecision(action={"type": "pass_priority"}, reasoning="No profitable/legal block assignment; pass")
         if move.get("type") == "attack" and not (move.get("attackers") or []):
@@ -128,6 +257,19 @@ class AIAgent:
 
         return AIDecision(action=move, reasoning=f"{self.archetype} plan selected best-scoring move")
 
+    def _first_playable_candidate(self, state: MatchState, candidates: list[dict], player_id: int) -> dict | None:
+        """Materialize ranked candidates in order and return the first one that can be played."""
+        for cand in candidates:
+            materialized = self._materialize_action(state, cand, player_id)
+            if materialized.get("_invalid_ai_choice"):
+                continue
+            if self._is_action_obviously_illegal(state, materialized, player_id):
+                continue
+            if self._is_unplayable_x_action(materialized):
+                continue
+            return materialized
+        return None
+
     def _strategic_plan_action(self, state: MatchState, legal_moves: list[dict], player_id: int) -> dict | None:
         if self.difficulty not in {"master", "master_plus"}:
             return None
@@ -157,10 +299,28 @@ class AIAgent:
             candidates.append(mat)
         if not candidates:
             return None
-        scored: list[tuple[float, dict]] = []
-        for mv in candidates:
-            score = self._strategic_line_score(state, mv, player_id, depth=search_depth)
-            scored.append((score, mv))
+        # Iterative deepening: keep the last fully scored depth, or the best
+        # partial scores if even the shallowest pass ran out of budget.
+        # Fanning out only pays for deeper searches; shallower ones finish
+        # faster than a round trip to the pool.
+        workers = self.search_workers if search_depth >= 2 and isinstance(state, MatchState) else 0
+        if workers > 1 and len(candidates) > 1:
+            scored = self._pooled_root_scores(state, candidates, player_id, search_depth, workers)
+        else:
+            scored = []
+            for depth in range(search_depth + 1):
+                level: list[tuple[float, dict]] = []
+                for mv in candidates:
+                    score = self._strategic_line_score(state, mv, player_id, depth=depth)
+                    if self._search_exhausted():
+                        break
+                    level.append((score, mv))
+                if len(level) == len(candidates) or not scored:
+                    scored = level
+                if self._search_exhausted():
+                    break
+        if not scored:
+            return None
         scored.sort(key=lambda x: (x[0], self._move_sort_key(x[1])), reverse=True)
         top = scored[0][1]
         if top.get("type") == "pass_priority":
@@ -170,6 +330,55 @@ class AIAgent:
             return None
         return top
 
+    def _pooled_root_scores(
+        self, state: MatchState, candidates: list[dict], player_id: int, search_depth: int, workers: int
+    ) -> list[tuple[float, dict]]:
+        """Search the root candidates on worker processes and merge the scores in candidate order.
+
+        Each candidate gets an equal share of the remaining nodes and the time
+        left on the clock, so the pool stays within this decision's budget.
+        """
+        budget = self._search_budget
+        max_nodes = think_ms = None
+        if budget is not None:
+            if budget.max_nodes is not None:
+                max_nodes = max(0, budget.max_nodes - budget.nodes) // len(candidates)
+            if budget.think_ms is not None:
+                think_ms = max(0.0, budget.think_ms - budget.elapsed_ms())
+        snapshot = serialize_match_snapshot(state)
+        config = {
+            "difficulty": self.difficulty,
+            "archetype": self.archetype,
+            "opponent_archetype": self.opponent_archetype,
+            "mcts_simulations": self.mcts_simulations,
+            "learned_eval": self.eval_model is not None,
+        }
+        tasks = [RootTask(snapshot, config, mv, player_id, search_depth, max_nodes, think_ms) for mv in candidates]
+        results = run_root_tasks(tasks, workers)
+        if budget is not None:
+            budget.spend(sum(nodes for _, nodes in results))
+        depth = min(len(scores) for scores, _ in results)
+        if depth:
+            return [(scores[depth - 1], mv) for (scores, _), mv in zip(results, candidates)]
+        return [(scores[0], mv) for (scores, _), mv in zip(results, candidates) if scores]
+
+    def search_root_candidate(self, state: MatchState, move: dict, player_id: int, search_depth: int) -> tuple[list[float], int]:
+        """Deepen one root move under a fresh budget; returns per-depth scores and nodes used."""
+        scope = (state.id, state.turn)
+        self.transpositions.begin_decision(scope)
+        self.mcts.begin_decision(scope)
+        self._search_budget = SearchBudget(self.think_ms, self.max_nodes)
+        try:
+            scores: list[float] = []
+            for depth in range(search_depth + 1):
+                score = self._strategic_line_score(state, move, player_id, depth=depth)
+                if self._search_exhausted():
+                    break
+                scores.append(score)
+            return scores, self._search_budget.nodes
+        finally:
+            self._search_budget = None
+
     def _strategic_search_depth(self, state: MatchState, player_id: int) -> int:
         """Choose a bounded tactical horizon without making every turn expensive."""
         if self.difficulty == "master_plus":
@@ -204,41 +413,102 @@ class AIAgent:
         return my_bf + opp_bf >= 10 or both_hands >= 10 or stack_size >= 2 or turn >= 10
 
     def _strategic_line_score(self, state: MatchState, move: dict, player_id: int, depth: int) -> float:
+        position = _position_hash(state)
+        key = None
+        if position is not None:
+            key = (position, depth, player_id, "line", move_key(move))
+            entry = self.transpositions.get(key)
+            if entry is not None:
+                return entry.score
+        score = self._search_line_score(state, move, player_id, depth)
+        if key is not None and not self._search_exhausted():
+            self.transpositions.put(key, score, move)
+        return score
+
+    def _search_line_score(self, state: MatchState, move: dict, player_id: int, depth: int) -> float:
+        if not self._search_node():
+            return -9999.0
         try:
-            sim = copy.deepcopy(state)
+            sim = self._fork_state(state)
             self.engine.take_action(sim, player_id, move)
             if sim.step == sim.step.COMBAT_DAMAGE:
                 self.engine.take_action(sim, sim.active_player, {"type": "combat_damage"})
         except Exception:
             return -9999.0
-        score = evaluate_board(sim, player_id)
-        score += self._strategic_features(sim, player_id)
-        score += self._stack_two_ply_value(sim, player_id)
+        score = self._strategic_node_value(sim, player_id)
         if depth <= 0 or sim.winner is not None:
             return score
-        pid = sim.priority_player
-        legal = sorted(self.engine.legal_moves(sim, pid), key=lambda mv: self._move_sort_key(mv))
-        if not legal:
+        chosen = self._strategic_best_reply(sim, player_id)
+        if chosen is None:
             return score
+        return 0.6 * score + 0.4 * self._strategic_line_score(sim, chosen, player_id, depth - 1)
+
+    def _strategic_node_value(self, state: MatchState, player_id: int, board: float | None = None) -> float:
+        position = _position_hash(state)
+        key = None
+        if position is not None:
+            key = (position, 0, player_id, "node")
+            entry = self.transpositions.get(key)
+            if entry is not None:
+                return entry.score
+        if board is None:
+            board = self._board_values([state], player_id)[0]
+        value = board + self._strategic_features(state, player_id)
+        value += self._stack_two_ply_value(state, player_id)
+        if key is not None and not self._search_exhausted():
+            self.transpositions.put(key, value)
+        return value
+
+    def _strategic_best_reply(self, state: MatchState, player_id: int) -> dict | None:
+        """Pick the beam reply the side with priority is assumed to play."""
+        position = _position_hash(state)
+        key = None
+        if position is not None:
+            key = (position, 1, player_id, "reply")
+            entry = self.transpositions.get(key)
+            if entry is not None:
+                return entry.best_move
+        pid = state.priority_player
+        legal = sorted(self.engine.legal_moves(state, pid), key=lambda mv: self._move_sort_key(mv))
         beam: list[tuple[float, dict]] = []
+        # With the learned evaluation, children are collected and scored in one batch.
+        children: list[tuple[MatchState, dict]] = []
         for cand in legal[:6]:
+            if not self._search_node():
+                break
             try:
-                nxt = copy.deepcopy(sim)
+                nxt = self._fork_state(state)
                 self.engine.take_action(nxt, pid, cand)
                 if nxt.step == nxt.step.COMBAT_DAMAGE:
                     self.engine.take_action(nxt, nxt.active_player, {"type": "combat_damage"})
-                val = evaluate_board(nxt, player_id) + self._strategic_features(nxt, player_id) + self._stack_two_ply_value(
-                    nxt, player_id
-                )
-                beam.append((val, cand))
+                if self.eval_model is None:
+                    beam.append((self._strategic_node_value(nxt, player_id), cand))
+                else:
+                    children.append((nxt, cand))
             except Exception:
                 continue
-        if not beam:
-            return score
-        beam.sort(key=lambda x: x[0], reverse=(pid == player_id))
-        # Opponent turn: assume best line against us; own turn: assume best for us.
-        chosen = beam[0][1] if pid == player_id else beam[-1][1]
-        return 0.6 * score + 0.4 * self._strategic_line_score(sim, chosen, player_id, depth - 1)
+        if children:
+            boards = self._board_values([nxt for nxt, _ in children], player_id)
+            for (nxt, cand), board in zip(children, boards):
+                try:
+                    beam.append((self._strategic_node_value(nxt, player_id, board), cand))
+                except Exception:
+                    continue
+        value, chosen = 0.0, None
+        if beam:
+            beam.sort(key=lambda x: x[0], reverse=(pid == player_id))
+            # Opponent turn: assume best line against us; own turn: assume best for us.
+            value, chosen = beam[0] if pid == player_id else beam[-1]
+        if key is not None and not self._search_exhausted():
+            self.transpositions.put(key, value, chosen)
+        return chosen
+
+    def _board_values(self, states: list[MatchState], player_id: int) -> list[float]:
+        if self.eval_model is None:
+            return [evaluate_board(state, player_id) for state in states]
+        from ai.linear_eval import evaluate_board_batch
+
+        return evaluate_board_batch(states, player_id, self.eval_model)
 
     def _stack_two_ply_value(self, state: MatchState, player_id: int) -> float:
         """Depth-limited stack planner for counter wars; only runs while stack is active."""
@@ -255,8 +525,10 @@ class AIAgent:
         maximizing = pid == player_id
         best = -9999.0 if maximizing else 9999.0
         for act in top_actions:
+            if not self._search_node():
+                break
             try:
-                sim = copy.deepcopy(state)
+                sim = self._fork_state(state)
                 self.engine.take_action(sim, pid, act)
             except Exception:
                 continue
@@ -272,8 +544,10 @@ class AIAgent:
                 else:
                     reply_vals: list[float] = []
                     for rep in replies:
+                        if not self._search_node():
+                            break
                         try:
-                            nxt = copy.deepcopy(sim)
+                            nxt = self._fork_state(sim)
                             self.engine.take_action(nxt, reply_pid, rep)
                             reply_vals.append(evaluate_board(nxt, player_id) + self._strategic_features(nxt, player_id))
                         except Exception:
@@ -790,6 +1064,7 @@ class AIAgent:
             "critical_reason": critical_reason,
         }
 
+    @decision_cached
     def _current_hand_profile(self, state: MatchState, player_id: int) -> dict[str, object]:
         hand = [state.cards[cid] for cid in getattr(state.players[player_id], "hand", []) if cid in state.cards]
         profile = self._opening_hand_profile(hand)
@@ -812,6 +1087,25 @@ class AIAgent:
         return (2, 5)
 
     def _rank_moves(self, state: MatchState, moves: list[dict], player_id: int) -> list[dict]:
+        """Order ``moves`` best first; rankings are kept by position for the rest of the turn.
+
+        A decision often ranks the same position more than once (planner beam,
+        then the fallback choice), and a later decision in the turn can arrive
+        at a position already ranked.
+        """
+        position = _position_hash(state)
+        key = None
+        if position is not None:
+            key = (position, 0, player_id, "rank", tuple(move_key(move) for move in moves))
+            entry = self.transpositions.get(key)
+            if entry is not None:
+                return list(entry.ranking)
+        ranked = self._score_and_order_moves(state, moves, player_id)
+        if key is not None and not self._search_exhausted():
+            self.transpositions.put(key, 0.0, ranking=ranked)
+        return list(ranked)
+
+    def _score_and_order_moves(self, state: MatchState, moves: list[dict], player_id: int) -> list[dict]:
         in_main = _step_key(getattr(state, "step", "")) in {"precombat_main", "postcombat_main"}
         own_main_sorcery_window = (
             in_main
@@ -837,11 +1131,13 @@ class AIAgent:
             and len(moves) <= 24
         )
 
+        root_eval = self._root_evaluation(state, player_id)
+        stack_items = getattr(state, "stack", []) or []
+        cast_moves = [m for m in moves if m.get("type") == "cast_spell"]
+
         def score(move: dict) -> float:
             mtype = move.get("type")
-            base = evaluate_board(state, player_id)
-            stack_items = getattr(state, "stack", []) or []
-            cast_moves = [m for m in moves if m.get("type") == "cast_spell"]
+            base = root_eval
             if mtype == "cast_spell":
                 name = move.get("card_name", "").lower()
                 base += self._cast_bias(state, move, player_id)
@@ -887,26 +1183,74 @@ class AIAgent:
                     # Avoid stalling with threats stranded in hand when we can safely deploy.
                     base -= 2.6
             base += self._matchup_move_adjustment(state, move, player_id)
-            if use_deep_search:
-                base += self._simulate_delta(state, move, player_id)
-            if self.difficulty == "master_plus" and use_deep_search:
-                base += self._rollout_delta(state, move, player_id)
             return base
 
-        ranked = sorted(moves, key=lambda mv: (score(mv), self._move_sort_key(mv)), reverse=True)
+        scores = [score(mv) for mv in moves]
+        if use_deep_search:
+            scores = self._deepen_move_scores(state, moves, player_id, scores)
+        order = sorted(
+            range(len(moves)), key=lambda index: (scores[index], self._move_sort_key(moves[index])), reverse=True
+        )
         normalized = []
-        for move in ranked:
+        for move in (moves[index] for index in order):
             if move.get("type") == "attack" and "attackers" not in move:
                 move = move.copy()
                 move["attackers"] = move.get("options", [])
             normalized.append(move)
         return normalized
 
+    def _deepen_move_scores(self, state: MatchState, moves: list[dict], player_id: int, scores: list[float]) -> list[float]:
+        """Add lookahead deltas one search layer at a time, keeping the last complete layer."""
+        deeper = self._add_search_layer(state, moves, player_id, scores, self._simulate_delta)
+        if deeper is None or self.difficulty != "master_plus":
+            return scores if deeper is None else deeper
+        if self.mcts_simulations > 0:
+            # UCT search is anytime: statistics gathered before the budget ran out still count.
+            return [value + delta for value, delta in zip(deeper, self._mcts_deltas(state, moves, player_id))]
+        rolled = self._add_search_layer(state, moves, player_id, deeper, self._rollout_delta)
+        return deeper if rolled is None else rolled
+
+    def _add_search_layer(self, state: MatchState, moves: list[dict], player_id: int, scores: list[float], delta) -> list[float] | None:
+        position = _position_hash(state)
+        deeper: list[float] = []
+        for move, value in zip(moves, scores):
+            key = None if position is None else (position, 1, player_id, delta.__name__, move_key(move))
+            entry = None if key is None else self.transpositions.get(key)
+            if entry is not None:
+                deeper.append(value + entry.score)
+                continue
+            change = delta(state, move, player_id)
+            if self._search_exhausted():
+                return None
+            if key is not None:
+                self.transpositions.put(key, change)
+            deeper.append(value + change)
+        return deeper
+
+    def _mcts_deltas(self, state: MatchState, moves: list[dict], player_id: int) -> list[float]:
+        stats = self.mcts.search(state, player_id, moves)
+        deltas = []
+        for move in moves:
+            visits, mean = stats.get(move_key(move), (0, 0.5))
+            # Same scale as the greedy rollouts: a sure win is worth +40.
+            deltas.append((mean - 0.5) * 80.0 if visits else 0.0)
+        return deltas
+
+    def _mcts_moves(self, state: MatchState, player_id: int) -> list[dict]:
+        legal = [
+            move
+            for move in self.engine.legal_moves(state, player_id)
+            if not str(move.get("type", "")).endswith("_restricted")
+        ]
+        return self._rollout_move_order(state, legal, player_id) if legal else []
+
     def _simulate_delta(self, state: MatchState, move: dict, player_id: int) -> float:
         # Two-ply lookahead: own action value minus opponent best reply value.
+        if not self._search_node():
+            return 0.0
         try:
             before = evaluate_board(state, player_id)
-            sim_state = copy.deepcopy(state)
+            sim_state = self._fork_state(state)
             self.engine.take_action(sim_state, player_id, move)
             self._approximate_resolution_for_creature_cast(sim_state, move, player_id)
             self._approximate_resolution_for_ramp_spell(sim_state, move, player_id)
@@ -929,8 +1273,10 @@ class AIAgent:
         worst = 0.0
         before = evaluate_board(sim_state, eval_for_player)
         for reply in opp_moves[:8]:
+            if not self._search_node():
+                break
             try:
-                branch = copy.deepcopy(sim_state)
+                branch = self._fork_state(sim_state)
                 self.engine.take_action(branch, opp_id, reply)
                 delta = before - evaluate_board(branch, eval_for_player)
                 if delta > worst:
@@ -944,9 +1290,9 @@ class AIAgent:
         if not attackers:
             return -1.0
         opp_id = 1 if player_id == 2 else 2
-        attack_power = sum(_effective_combat_stats(state, c)[0] for c in attackers if c in state.cards)
+        attack_power = sum(self._combat_stats(state, c)[0] for c in attackers if c in state.cards)
         opp_block_power = sum(
-            _effective_combat_stats(state, c)[0]
+            self._combat_stats(state, c)[0]
             for c in state.players[opp_id].battlefield
             if c in state.cards and "Creature" in state.cards[c].types and not state.cards[c].tapped
         )
@@ -982,6 +1328,7 @@ class AIAgent:
         risk_penalty += max(0.0, -float(self.matchup_profile.get("risk_tolerance", 0.0))) * 0.9
         return archetype_bias + attack_power * 0.8 - opp_block_power * 0.35 + race_pressure + unblocked_bonus + lethal_bonus - risk_penalty
 
+    @decision_cached
     def _pass_bias(self, state: MatchState, player_id: int) -> float:
         has_instant_like = False
         for cid in state.players[player_id].hand:
@@ -1027,6 +1374,7 @@ class AIAgent:
             return 1.4 + float(self.matchup_profile.get("holdup_bias", 0.0))
         return 0.3 - float(self.matchup_profile.get("proactive_bias", 0.0)) * 0.25
 
+    @decision_cached
     def _should_hold_up_interaction(self, state: MatchState, player_id: int) -> bool:
         if self.archetype not in {"Control", "Counter-heavy", "Tempo"}:
             return False
@@ -1059,22 +1407,7 @@ class AIAgent:
         mtype = move.get("type")
         role = self._board_role(state, player_id)
         turn = int(getattr(state, "turn", 1) or 1)
-        opp_id = 1 if player_id == 2 else 2
-        opp_board_creatures = sum(
-            1
-            for cid in state.players[opp_id].battlefield
-            if cid in state.cards and "Creature" in state.cards[cid].types
-        )
-        opp_board_power = sum(
-            max(0, _effective_combat_stats(state, cid)[0])
-            for cid in state.players[opp_id].battlefield
-            if cid in state.cards and "Creature" in state.cards[cid].types
-        )
-        my_board_creatures = sum(
-            1
-            for cid in state.players[player_id].battlefield
-            if cid in state.cards and "Creature" in state.cards[cid].types
-        )
+        opp_board_creatures, opp_board_power, my_board_creatures = self._matchup_board_counts(state, player_id)
         if mtype == "cast_spell":
             cid = move.get("card_id")
             card = state.cards.get(cid) if cid else None
@@ -1114,6 +1447,28 @@ class AIAgent:
             delta -= float(self.matchup_profile.get("proactive_bias", 0.0)) * 0.25
         return delta
 
+    @decision_cached
+    def _matchup_board_counts(self, state: MatchState, player_id: int) -> tuple[int, int, int]:
+        """Opponent creature count and power, and our creature count."""
+        opp_id = 1 if player_id == 2 else 2
+        opp_board_creatures = sum(
+            1
+            for cid in state.players[opp_id].battlefield
+            if cid in state.cards and "Creature" in state.cards[cid].types
+        )
+        opp_board_power = sum(
+            max(0, self._combat_stats(state, cid)[0])
+            for cid in state.players[opp_id].battlefield
+            if cid in state.cards and "Creature" in state.cards[cid].types
+        )
+        my_board_creatures = sum(
+            1
+            for cid in state.players[player_id].battlefield
+            if cid in state.cards and "Creature" in state.cards[cid].types
+        )
+        return opp_board_creatures, opp_board_power, my_board_creatures
+
+    @decision_cached
     def _has_urgent_interaction(self, state: MatchState, player_id: int) -> bool:
         if self.archetype not in {"Control", "Counter-heavy", "Tempo"}:
             return False
@@ -1137,6 +1492,7 @@ class AIAgent:
                 return True
         return False
 
+    @decision_cached
     def _has_castable_value_spell(self, state: MatchState, player_id: int) -> bool:
         for cid in state.players[player_id].hand:
             card = state.cards.get(cid)
@@ -1151,6 +1507,7 @@ class AIAgent:
                 return True
         return False
 
+    @decision_cached
     def _can_pay_card_cost(self, state: MatchState, player_id: int, card) -> bool:
         try:
             return bool(can_pay_with_pool_and_lands(
@@ -1165,7 +1522,7 @@ class AIAgent:
         attacker_ids = [x["id"] for x in (move.get("attackers") or [])]
         if not blocker_ids or not attacker_ids:
             return -0.8
-        threatened = sum(_effective_combat_stats(state, cid)[0] for cid in attacker_ids if cid in state.cards)
+        threatened = sum(self._combat_stats(state, cid)[0] for cid in attacker_ids if cid in state.cards)
         life = state.players[player_id].life
         lethal_pressure = 4.0 if threatened >= life else 0.0
         profitable = 0.0
@@ -1173,13 +1530,13 @@ class AIAgent:
             atk = state.cards.get(aid)
             if not atk:
                 continue
-            atk_pow, atk_tgh = _effective_combat_stats(state, aid)
+            atk_pow, atk_tgh = self._combat_stats(state, aid)
             best = 0.0
             for bid in blocker_ids:
                 blk = state.cards.get(bid)
                 if not blk:
                     continue
-                blk_pow, blk_tgh = _effective_combat_stats(state, bid)
+                blk_pow, blk_tgh = self._combat_stats(state, bid)
                 score = 0.0
                 if blk_pow >= atk_tgh:
                     score += 1.6
@@ -2022,7 +2379,6 @@ class AIAgent:
             if best_land:
                 targets["target_card_id"] = best_land["id"]
                 targets["target_card_name"] = best_land.get("name") or ""
-                targets["target_card_name"] = best.get("name") or best.get("label") or ""
 
         graveyard_creature_targets = hints.get("graveyard_creature_targets") or []
         if graveyard_creature_targets and not targets.get("target_card_id") and not (targets.get("target_card_ids") or []):
@@ -2192,7 +2548,7 @@ class AIAgent:
             getattr(state, "priority_player", 1),
         )
         incoming_total = sum(
-            _effective_combat_stats(state, a["id"])[0]
+            self._combat_stats(state, a["id"])[0]
             for a in attackers
             if a.get("id") in state.cards
         )
@@ -2202,7 +2558,7 @@ class AIAgent:
         prevented = 0
         sorted_attackers = sorted(
             [a for a in attackers if a.get("id") in state.cards],
-            key=lambda a: _effective_combat_stats(state, a["id"])[0],
+            key=lambda a: self._combat_stats(state, a["id"])[0],
             reverse=True,
         )
         for a in sorted_attackers:
@@ -2210,7 +2566,7 @@ class AIAgent:
             atk = state.cards.get(aid)
             if not atk:
                 continue
-            atk_pow, atk_tgh = _effective_combat_stats(state, aid)
+            atk_pow, atk_tgh = self._combat_stats(state, aid)
             atk_has_trample = "trample" in set(effective_keywords(state, aid))
             atk_has_deathtouch = "deathtouch" in set(effective_keywords(state, aid))
             required_blockers = 2 if self._requires_two_or_more_blockers(state, atk) else 1
@@ -2221,7 +2577,7 @@ class AIAgent:
                 blk = state.cards.get(bid)
                 if not blk:
                     continue
-                blk_pow, blk_tgh = _effective_combat_stats(state, bid)
+                blk_pow, blk_tgh = self._combat_stats(state, bid)
                 score = 0.0
                 # Primary value: prevent face damage.
                 score += (atk_pow or 0) * 1.15
@@ -2303,12 +2659,23 @@ class AIAgent:
         attackers: list[dict],
         blockers: list[dict],
     ) -> dict[str, str | list[str]] | None:
-        """Evaluate small-board blocker assignments by resolving cloned combat."""
+        """Pick blockers by resolving each candidate combat analytically.
+
+        Damage is worked out on effective stats by ``ai.combat_eval`` and the
+        assignment space is searched branch-and-bound with interchangeable
+        blockers grouped, so larger boards stay tractable. Scoring follows
+        ``evaluate_board`` on the post-combat position.
+        """
         if self.difficulty not in {"master", "master_plus"}:
             return None
         attacker_ids = [item["id"] for item in attackers if item.get("id") in state.cards]
         blocker_ids = [item["id"] for item in blockers if item.get("id") in state.cards]
-        if not attacker_ids or not blocker_ids or len(attacker_ids) > 4 or len(blocker_ids) > 5:
+        if (
+            not attacker_ids
+            or not blocker_ids
+            or len(attacker_ids) > _BLOCK_SEARCH_MAX_ATTACKERS
+            or len(blocker_ids) > _BLOCK_SEARCH_MAX_BLOCKERS
+        ):
             return None
         defender = next(
             (
@@ -2320,104 +2687,95 @@ class AIAgent:
         )
         if defender not in getattr(state, "players", {}):
             defender = state.cards[blocker_ids[0]].controller
-        choices: dict[str, list[str | None]] = {}
-        for bid in blocker_ids:
-            blocker = state.cards[bid]
-            legal_targets = [
-                aid
-                for aid in attacker_ids
-                if combat._can_block_attacker(state, state.cards[aid], blocker)
-            ]
-            choices[bid] = [None, *legal_targets]
-
-        assignments: list[dict[str, str]] = []
-
-        def visit(index: int, current: dict[str, str]) -> None:
-            if index >= len(blocker_ids):
-                counts: dict[str, int] = {}
-                for aid in current.values():
-                    counts[aid] = counts.get(aid, 0) + 1
-                if any(
-                    self._requires_two_or_more_blockers(state, state.cards[aid]) and counts.get(aid, 0) < 2
-                    for aid in attacker_ids
-                ):
-                    return
-                assignments.append(dict(current))
-                return
-            bid = blocker_ids[index]
-            for aid in choices[bid]:
-                if aid is None:
-                    visit(index + 1, current)
-                else:
-                    current[bid] = aid
-                    visit(index + 1, current)
-                    current.pop(bid, None)
-
-        visit(0, {})
-        if not assignments or len(assignments) > 4096:
-            return None
-        best: tuple[float, tuple[tuple[str, str], ...], dict[str, str | list[str]]] | None = None
-        initial_life = state.players[defender].life
-        opponent = 1 if defender == 2 else 2
-        incoming_power = sum(
-            max(0, _effective_combat_stats(state, aid)[0])
+        attacking = [combat_eval.combatant(state, aid, self._combat_stats(state, aid)) for aid in attacker_ids]
+        defending = [
+            combat_eval.combatant(state, bid, self._combat_stats(state, bid), attacker_ids)
+            for bid in blocker_ids
+        ]
+        targets = {
+            aid: (getattr(state, "attack_targets", {}) or {}).get(aid, f"player:{defender}")
             for aid in attacker_ids
-        )
-        for assignment in assignments:
-            if initial_life > incoming_power and assignment:
-                chump_only = True
-                for aid in set(assignment.values()):
-                    attacker = state.cards[aid]
-                    assigned_blockers = [
-                        state.cards[bid]
-                        for bid, target in assignment.items()
-                        if target == aid and bid in state.cards
-                    ]
-                    blocking_power = sum(
-                        max(0, _effective_combat_stats(state, blocker.id)[0])
-                        for blocker in assigned_blockers
-                    )
-                    if blocking_power >= max(0, _effective_combat_stats(state, attacker.id)[1]):
-                        chump_only = False
-                        break
-                if chump_only:
+        }
+        plan = self._block_plan(state, attacking, defending, defender, targets)
+        if plan is None:
+            return None
+        return {aid: list(group) if len(group) > 1 else group[0] for aid, group in plan.blocks.items()}
+
+    def _block_plan(
+        self,
+        state: MatchState,
+        attacking: list,
+        defending: list,
+        defender: int,
+        targets: dict[str, str],
+        node_limit: int = 5000,
+        cache: dict | None = None,
+        life: int | None = None,
+        max_group: int = 2,
+    ):
+        """Best blocks for ``defender``, scored as the post-combat ``evaluate_board``.
+
+        Life carries an extra 4-per-point weight, chump-only blocks are
+        skipped while the incoming damage is not lethal, and losing the game
+        costs 1000. ``life`` overrides the defender's current life total for
+        hypothetical combats.
+        """
+        initial_life = state.players[defender].life if life is None else life
+        incoming_power = sum(max(0, attacker.power) for attacker in attacking)
+        safe_life = initial_life > incoming_power
+        defender_key = f"player:{defender}"
+
+        def value(attacker, group, outcome) -> float:
+            hits_defender = targets[attacker.id] == defender_key
+            score = combat_eval.board_delta(attacker, group, outcome, defender, defender if hits_defender else None)
+            return score + (outcome.defender_life_gain - (outcome.through if hits_defender else 0)) * 4.0
+
+        def finish(plan) -> float | None:
+            blocked = [(attacker, group) for attacker, group, _ in plan if group]
+            if safe_life and blocked and all(
+                sum(max(0, blocker.power) for blocker in group) < max(0, attacker.toughness)
+                for attacker, group in blocked
+            ):
+                # Only chump blocks while the incoming damage is not lethal.
+                return None
+            adjustment = 0.0
+            life = initial_life
+            blockers_lost = attackers_lost = 0
+            walker_damage: dict[str, int] = {}
+            for attacker, group, outcome in plan:
+                life += outcome.defender_life_gain
+                target = targets[attacker.id]
+                if target == defender_key:
+                    life -= outcome.through
+                elif target.startswith("planeswalker:") and outcome.through > 0:
+                    walker_damage[target] = walker_damage.get(target, 0) + outcome.through
+                attackers_lost += int(attacker.id in outcome.dead)
+                blockers_lost += sum(1 for blocker in group if blocker.id in outcome.dead)
+            for target, amount in walker_damage.items():
+                walker = state.cards.get(target.split(":", 1)[1])
+                if walker is None or walker.controller != defender:
                     continue
-            try:
-                sim = copy.deepcopy(state)
-                self.engine.take_action(sim, defender, {"type": "block", "blocks": assignment})
-                self.engine.take_action(sim, sim.active_player, {"type": "combat_damage"})
-            except Exception:
-                continue
-            score = evaluate_board(sim, defender)
-            score += (sim.players[defender].life - initial_life) * 4.0
-            before_blockers = set(state.players[defender].battlefield)
-            after_blockers = set(sim.players[defender].battlefield)
-            before_attackers = set(state.players[opponent].battlefield)
-            after_attackers = set(sim.players[opponent].battlefield)
-            blockers_lost = len(before_blockers - after_blockers)
-            attackers_lost = len(before_attackers - after_attackers)
+                loyalty = max(0, int(getattr(walker, "loyalty", 0) or 0))
+                if amount >= loyalty:
+                    blockers_lost += 1
+                    adjustment -= _noncreature_value(walker) * 0.95 + 1.6 * 0.7 - 0.056
+                else:
+                    adjustment -= amount * 0.35 * 0.95
             # Preserve creatures when the incoming combat is not lethal and
-            # the proposed assignment only chumps. This is a general combat
-            # value rule, not an archetype/card exception; lethal prevention
-            # and profitable trades remain preferred.
-            if initial_life > incoming_power and blockers_lost > attackers_lost:
+            # the assignment only chumps. This is a general combat value
+            # rule, not an archetype/card exception; lethal prevention and
+            # profitable trades remain preferred.
+            if safe_life and blockers_lost > attackers_lost:
                 if attackers_lost == 0:
-                    continue
-                score -= (blockers_lost - attackers_lost) * (12.0 + incoming_power)
-            if sim.winner == defender:
-                score += 1000.0
-            elif sim.winner is not None:
-                score -= 1000.0
-            normalized: dict[str, str | list[str]] = {}
-            for aid in attacker_ids:
-                assigned = sorted(bid for bid, target in assignment.items() if target == aid)
-                if assigned:
-                    normalized[aid] = assigned if len(assigned) > 1 else assigned[0]
-            key = tuple(sorted(assignment.items()))
-            candidate = (score, key, normalized)
-            if best is None or candidate[:2] > best[:2]:
-                best = candidate
-        return best[2] if best is not None else None
+                    return None
+                adjustment -= (blockers_lost - attackers_lost) * (12.0 + incoming_power)
+            if life <= 0:
+                adjustment -= 1000.0
+            return adjustment
+
+        return combat_eval.search_blocks(
+            attacking, defending, value, finish, max_group=max_group, node_limit=node_limit, cache=cache,
+        )
 
     def _requires_two_or_more_blockers(self, state, attacker) -> bool:
         attacker_id = getattr(attacker, "id", None)
@@ -2517,75 +2875,164 @@ class AIAgent:
 
         # If nothing qualifies but we have lethal on board, send all.
         if not chosen:
-            total_power = sum(_effective_combat_stats(state, c)[0] for c in candidates if c in state.cards)
+            total_power = sum(self._combat_stats(state, c)[0] for c in candidates if c in state.cards)
             if total_power >= opp_life:
                 return list(candidates)
         return chosen
 
     def _search_attack_assignments(self, state: MatchState, candidates: list[str], player_id: int) -> list[str] | None:
-        """Search small-board attack subsets through the defender's best legal blocks."""
-        if self.difficulty not in {"master", "master_plus"}:
+        """Plan attacks through the defender's best blocks and the crackback that follows.
+
+        Every attack is resolved analytically against the opponent's best
+        blocks, then the opponent's all-out swing into the creatures left
+        home is estimated the same way. Interchangeable attackers are
+        counted rather than enumerated, attackers that can only lose (no
+        power) or only gain (unblockable with vigilance) are fixed up front,
+        and wide boards hill-climb over attacker counts instead of
+        enumerating every subset.
+        """
+        if self.difficulty not in {"master", "master_plus"} or not isinstance(state, MatchState):
             return None
         if int(getattr(state, "turn", 1) or 1) < 5:
             return None
         candidate_ids = [cid for cid in candidates if cid in state.cards and "Creature" in state.cards[cid].types]
-        if not candidate_ids or len(candidate_ids) > 3:
-            return None
         opponent = 1 if player_id == 2 else 2
-        available_blockers = [
-            cid
-            for cid in state.players[opponent].battlefield
-            if cid in state.cards and "Creature" in state.cards[cid].types and not state.cards[cid].tapped
-        ]
-        # Block search already has its own combinatorial bound. Keep attack
-        # search below that bound as well so full matchup matrices stay usable.
-        if len(available_blockers) > 2:
-            return None
-        subsets: list[tuple[str, ...]] = [()]
-        for size in range(1, len(candidate_ids) + 1):
-            subsets.extend(combinations(candidate_ids, size))
-        if len(subsets) > 128:
+
+        def creatures(pid: int) -> list[str]:
+            return [
+                cid
+                for cid in state.players[pid].battlefield
+                if cid in state.cards and "Creature" in state.cards[cid].types
+            ]
+
+        blocker_ids = [cid for cid in creatures(opponent) if not state.cards[cid].tapped and not card_cant_block(state, cid)]
+        # Everything the opponent controls untaps before their next attack.
+        raider_ids = [cid for cid in creatures(opponent) if "defender" not in set(effective_keywords(state, cid))]
+        guard_ids = [cid for cid in creatures(player_id) if not state.cards[cid].tapped and not card_cant_block(state, cid)]
+        if not candidate_ids or any(
+            len(ids) > _ATTACK_SEARCH_MAX_CREATURES for ids in (candidate_ids, blocker_ids, raider_ids, guard_ids)
+        ):
             return None
 
-        best: tuple[float, tuple[str, ...], list[str]] | None = None
-        for subset in subsets:
-            sim = copy.deepcopy(state)
-            actual_attackers: list[str] = []
-            try:
-                self.engine.take_action(sim, player_id, {"type": "attack", "attackers": list(subset)})
-                actual_attackers = list(getattr(sim, "attackers", []) or [])
-                if actual_attackers:
-                    self.engine.next_step(sim)
-                    blocker_ids = [
-                        cid
-                        for cid in sim.players[opponent].battlefield
-                        if cid in sim.cards
-                        and "Creature" in sim.cards[cid].types
-                        and not sim.cards[cid].tapped
-                    ]
-                    if blocker_ids:
-                        attacker_options = [{"id": cid, "name": sim.cards[cid].name} for cid in actual_attackers]
-                        blocker_options = [{"id": cid, "name": sim.cards[cid].name} for cid in blocker_ids]
-                        blocks = self._search_block_assignments(sim, attacker_options, blocker_options)
-                        if blocks:
-                            self.engine.take_action(sim, opponent, {"type": "block", "blocks": blocks})
-                    self.engine.next_step(sim)
-                    self.engine.take_action(sim, sim.active_player, {"type": "combat_damage"})
-            except Exception:
-                continue
+        attack_pool = {cid: combat_eval.combatant(state, cid, self._combat_stats(state, cid)) for cid in candidate_ids}
+        defending = [
+            combat_eval.combatant(state, bid, self._combat_stats(state, bid), candidate_ids)
+            for bid in blocker_ids
+        ]
+        raiders = [combat_eval.combatant(state, cid, self._combat_stats(state, cid)) for cid in raider_ids]
+        guards = {
+            cid: combat_eval.combatant(state, cid, self._combat_stats(state, cid), raider_ids)
+            for cid in guard_ids
+        }
+        vigilant = {cid for cid in candidate_ids if "vigilance" in set(effective_keywords(state, cid))}
+        my_life = state.players[player_id].life
+        opp_life = state.players[opponent].life
+        response_cache: dict = {}
+        crackback_cache: dict = {}
+
+        def resolved(plan, attackers: list, blockers: list) -> list:
+            by_id = {blocker.id: blocker for blocker in blockers}
+            out = []
+            for attacker in attackers:
+                group = tuple(by_id[bid] for bid in plan.blocks.get(attacker.id, ())) if plan is not None else ()
+                outcome = plan.outcomes[attacker.id] if plan is not None else combat_eval.resolve_block(attacker, ())
+                out.append((attacker, group, outcome))
+            return out
 
-            score = evaluate_board(sim, player_id)
-            score += (sim.players[opponent].life - state.players[opponent].life) * -2.0
-            score += (sim.players[player_id].life - state.players[player_id].life) * 1.5
-            if sim.winner == player_id:
-                score += 1000.0
-            elif sim.winner is not None:
-                score -= 1000.0
-            score += sum(max(0, _effective_combat_stats(sim, cid)[0]) for cid in actual_attackers) * 0.05
-            candidate = (score, tuple(subset), actual_attackers)
-            if best is None or candidate[:2] > best[:2]:
-                best = candidate
-        return best[2] if best is not None else None
+        def crackback(dead: set[str], home: list, life: int) -> float:
+            swing = [raider for raider in raiders if raider.id not in dead]
+            if not swing:
+                return 0.0
+            targets = {raider.id: f"player:{player_id}" for raider in swing}
+            plan = self._block_plan(
+                state, swing, home, player_id, targets,
+                node_limit=_CRACKBACK_SEARCH_NODES, cache=crackback_cache, life=life, max_group=1,
+            )
+            score = 0.0
+            for raider, group, outcome in resolved(plan, swing, home):
+                score += combat_eval.board_delta(raider, group, outcome, player_id, player_id)
+                life += outcome.defender_life_gain - outcome.through
+            # The swing is an estimate of what the opponent could do, not a line they must take.
+            return score * 0.5 - (250.0 if life <= 0 else 0.0)
+
+        def score_subset(subset: tuple[str, ...]) -> float:
+            attack = [attack_pool[cid] for cid in subset]
+            score = 0.0
+            dead: set[str] = set()
+            my_gain = opp_change = 0
+            if attack:
+                targets = {cid: f"player:{opponent}" for cid in subset}
+                plan = self._block_plan(
+                    state, attack, defending, opponent, targets,
+                    node_limit=_ATTACK_RESPONSE_SEARCH_NODES, cache=response_cache,
+                )
+                for attacker, group, outcome in resolved(plan, attack, defending):
+                    score += combat_eval.board_delta(attacker, group, outcome, player_id, opponent)
+                    if attacker.id not in outcome.dead and attacker.id not in vigilant:
+                        # Tapping moves the creature's board value from untapped to tapped.
+                        score -= 0.35 * 0.95
+                    dead |= outcome.dead
+                    my_gain += outcome.attacker_life_gain
+                    opp_change += outcome.defender_life_gain - outcome.through
+                score += opp_change * -2.0 + my_gain * 1.5
+                score += sum(max(0, attacker.power) for attacker in attack) * 0.05
+                if opp_life + opp_change <= 0:
+                    return score + 1000.0
+            home = [guard for cid, guard in guards.items() if cid not in dead and (cid not in subset or cid in vigilant)]
+            return score + crackback(dead, home, my_life + my_gain)
+
+        forced: list[str] = []
+        classes: dict[tuple, list[str]] = {}
+        for cid in candidate_ids:
+            attacker = attack_pool[cid]
+            if attacker.power <= 0:
+                continue
+            if cid in vigilant and not any(cid in blocker.can_block for blocker in defending):
+                forced.append(cid)
+                continue
+            key = (
+                attacker.signature,
+                tuple((cid in b.can_block, cid in b.protected_from, cid in b.harmless_to) for b in defending),
+                cid in vigilant,
+                guards[cid].signature if cid in guards else None,
+            )
+            classes.setdefault(key, []).append(cid)
+        members = list(classes.values())
+        scores: dict[tuple[int, ...], float] = {}
+
+        def subset_for(counts: tuple[int, ...]) -> tuple[str, ...]:
+            chosen = set(forced)
+            for group, count in zip(members, counts):
+                chosen.update(group[:count])
+            return tuple(cid for cid in candidate_ids if cid in chosen)
+
+        def evaluate(counts: tuple[int, ...]) -> float:
+            if counts not in scores:
+                scores[counts] = score_subset(subset_for(counts))
+            return scores[counts]
+
+        space = 1
+        for group in members:
+            space *= len(group) + 1
+        if space <= _ATTACK_SEARCH_EXHAUSTIVE:
+            for counts in product(*(range(len(group) + 1) for group in members)):
+                evaluate(counts)
+        else:
+            for start in (tuple(len(group) for group in members), tuple(0 for _ in members)):
+                current = start
+                while True:
+                    neighbours = [
+                        current[:slot] + (current[slot] + step,) + current[slot + 1 :]
+                        for slot in range(len(members))
+                        for step in (-1, 1)
+                        if 0 <= current[slot] + step <= len(members[slot])
+                    ]
+                    best_next = max(neighbours, key=lambda counts: (evaluate(counts), counts), default=None)
+                    if best_next is None or evaluate(best_next) <= evaluate(current):
+                        break
+                    current = best_next
+        best = max(scores, key=lambda counts: (scores[counts], counts))
+        return list(subset_for(best))
 
     def _creature_threat_score(self, state: MatchState, creature_id: str | None, player_id: int) -> float:
         if not creature_id or creature_id not in state.cards:
@@ -2781,8 +3228,10 @@ class AIAgent:
 
     def _rollout_delta(self, state: MatchState, move: dict, player_id: int) -> float:
         # Lightweight rollout approximation for deeper tactical planning.
+        if not self._search_node():
+            return 0.0
         try:
-            sim = copy.deepcopy(state)
+            sim = self._fork_state(state)
             self.engine.take_action(sim, player_id, move)
         except Exception:
             return 0.0
@@ -2790,13 +3239,11 @@ class AIAgent:
             return 100.0
         if sim.winner is not None and sim.winner != player_id:
             return -100.0
-        total = 0.0
-        samples = 3
-        plies = 6
-        for _ in range(samples):
-            branch = copy.deepcopy(sim)
-            total += self._rollout_playout(branch, player_id, plies)
-        return total / samples
+        # The rollout policy is deterministic and forks carry the RNG state, so
+        # repeated playouts from ``sim`` would all replay this same line.
+        if not self._search_node():
+            return 0.0
+        return self._rollout_playout(sim, player_id, 6)
 
     def _approximate_resolution_for_activated_action(self, state: MatchState, move: dict, player_id: int) -> None:
         """Resolve simulated abilities only when the opponent has no response."""
@@ -2817,7 +3264,7 @@ class AIAgent:
             if state.winner is not None:
                 break
             pid = state.priority_player
-            legal = self.engine.legal_moves(state, pid)
+            legal = self.engine.legal_moves(state, pid, rollout=True)
             if not legal:
                 break
             chosen = self._pick_rollout_move(state, legal, pid)
@@ -2837,6 +3284,9 @@ class AIAgent:
         return evaluate_board(state, eval_for_player) * 0.05
 
     def _pick_rollout_move(self, state: MatchState, legal: list[dict], player_id: int) -> dict:
+        return self._rollout_move_order(state, legal, player_id)[0]
+
+    def _rollout_move_order(self, state: MatchState, legal: list[dict], player_id: int) -> list[dict]:
         # Fast rollout policy (no nested simulations).
         has_cast = any(m.get("type") == "cast_spell" for m in legal)
 
@@ -2863,9 +3313,7 @@ class AIAgent:
                 base -= 0.2
             return base
 
-        ranked = sorted(legal, key=lambda mv: (quick_score(mv), self._move_sort_key(mv)), reverse=True)
-        top = ranked[: min(3, len(ranked))]
-        return top[0]
+        return sorted(legal, key=lambda mv: (quick_score(mv), self._move_sort_key(mv)), reverse=True)
 
     def _best_land_move(self, state: MatchState, land_moves: list[dict], player_id: int) -> dict:
         demand = self._color_demand(state, player_id)
@@ -2923,6 +3371,7 @@ class AIAgent:
                 return False
         return True
 
+    @decision_cached
     def _should_force_proactive_control_line(self, state: MatchState, player_id: int) -> bool:
         """Push control decks to convert resources instead of over-passing in developed boards."""
         if self.archetype not in {"Control", "Counter-heavy"}:
@@ -2948,6 +3397,7 @@ class AIAgent:
         opp = (self.opponent_archetype or "").strip().lower()
         return own in {"control", "counter-heavy"} and opp in {"burn", "aggro", "tempo"}
 
+    @decision_cached
     def _should_force_inevitability_plan(self, state: MatchState, player_id: int) -> bool:
         if getattr(state, "active_player", player_id) != player_id:
             return False
@@ -3334,6 +3784,7 @@ class AIAgent:
             return power >= 4 or cmc >= 5
         return False
 
+    @decision_cached
     def _can_deploy_major_threat(self, state: MatchState, player_id: int) -> bool:
         if _step_key(getattr(state, "step", "")) not in {"precombat_main", "postcombat_main"}:
             return False
@@ -3363,6 +3814,7 @@ class AIAgent:
                     return True
         return False
 
+    @decision_cached
     def _color_demand(self, state: MatchState, player_id: int) -> dict[str, int]:
         demand = {c: 0 for c in ["W", "U", "B", "R", "G"]}
         for cid in state.players[player_id].hand:
@@ -3390,17 +3842,18 @@ class AIAgent:
                     sources[sym] += 1
         return sources
 
+    @decision_cached
     def _board_role(self, state: MatchState, player_id: int) -> str:
         opp_id = 1 if player_id == 2 else 2
         my_life = int(getattr(state.players[player_id], "life", 20) or 20)
         opp_life = int(getattr(state.players[opp_id], "life", 20) or 20)
         my_power = sum(
-            max(0, _effective_combat_stats(state, cid)[0])
+            max(0, self._combat_stats(state, cid)[0])
             for cid in state.players[player_id].battlefield
             if cid in state.cards and "Creature" in getattr(state.cards[cid], "types", []) and not getattr(state.cards[cid], "tapped", False)
         )
         opp_power = sum(
-            max(0, _effective_combat_stats(state, cid)[0])
+            max(0, self._combat_stats(state, cid)[0])
             for cid in state.players[opp_id].battlefield
             if cid in state.cards and "Creature" in getattr(state.cards[cid], "types", []) and not getattr(state.cards[cid], "tapped", False)
         )
@@ -3429,6 +3882,7 @@ class AIAgent:
             return "defend"
         return "normal"
 
+    @decision_cached
     def _current_color_sources(self, state: MatchState, player_id: int) -> dict[str, int]:
         sources = {c: 0 for c in ["W", "U", "B", "R", "G"]}
         for cid in state.players[player_id].battlefield:
@@ -3524,6 +3978,7 @@ class AIAgent:
                 best_tiebreak = tiebreak
         return best_id
 
+    @decision_cached
     def _best_stack_threat_score(self, state: MatchState, player_id: int) -> float:
         items = getattr(state, "stack", []) or []
         if not items:
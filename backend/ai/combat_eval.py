@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+
+from ai.heuristics import _creature_value
+from game_state.state import MatchState
+from rules_engine import combat
+from rules_engine.combat import DMG_MARK_KEY
+from rules_engine.continuous import effective_keywords, effective_power, effective_toughness
+
+
+@dataclass(frozen=True)
+class Combatant:
+    """Everything combat resolution reads from one creature, frozen at declare-blockers.
+
+    Blockers carry the attacker ids they may block and the protection
+    relations with those attackers, so two blockers that compare equal once
+    their ``id`` is blanked are interchangeable in any assignment.
+    """
+
+    id: str
+    controller: int
+    owner: int
+    power: int
+    toughness: int
+    damage: int = 0
+    first_strike: bool = False
+    double_strike: bool = False
+    deathtouch: bool = False
+    trample: bool = False
+    lifelink: bool = False
+    indestructible: bool = False
+    bushido: int = 0
+    rampage: int = 0
+    flanking: bool = False
+    min_blockers: int = 1
+    value: float = 0.0
+    can_block: frozenset[str] = frozenset()
+    # Attackers whose damage to this blocker is prevented by protection.
+    protected_from: frozenset[str] = frozenset()
+    # Attackers protected from this blocker's damage.
+    harmless_to: frozenset[str] = frozenset()
+
+    @property
+    def signature(self) -> Combatant:
+        return replace(self, id="")
+
+
+@dataclass(frozen=True)
+class CombatOutcome:
+    """Result of one attacker's combat with its blockers."""
+
+    dead: frozenset[str]
+    # Damage dealt to the attack target (player or planeswalker) past blockers.
+    through: int
+    attacker_life_gain: int
+    defender_life_gain: int
+    # (card id, power, toughness) changes from Bushido, Rampage and Flanking.
+    boosts: tuple[tuple[str, int, int], ...] = ()
+
+
+def combatant(
+    state: MatchState,
+    card_id: str,
+    stats: tuple[int, int] | None = None,
+    attackers: list[str] | tuple[str, ...] = (),
+) -> Combatant:
+    """Snapshot ``card_id``; pass ``attackers`` to describe it as a potential blocker."""
+    card = state.cards[card_id]
+    keywords = set(effective_keywords(state, card_id))
+    power, toughness = stats if stats is not None else (effective_power(state, card_id), effective_toughness(state, card_id))
+    can_block: set[str] = set()
+    protected_from: set[str] = set()
+    harmless_to: set[str] = set()
+    for aid in attackers:
+        if not combat._can_block_attacker(state, state.cards[aid], card):
+            continue
+        can_block.add(aid)
+        if combat._damage_prevented_by_protection(state, aid, card_id):
+            protected_from.add(aid)
+        if combat._damage_prevented_by_protection(state, card_id, aid):
+            harmless_to.add(aid)
+    return Combatant(
+        id=card_id,
+        controller=card.controller,
+        owner=getattr(card, "owner", card.controller),
+        power=int(power),
+        toughness=int(toughness),
+        damage=int(card.counters.get(DMG_MARK_KEY, 0) or 0),
+        first_strike="first strike" in keywords,
+        double_strike="double strike" in keywords,
+        deathtouch="deathtouch" in keywords,
+        trample="trample" in keywords,
+        lifelink="lifelink" in keywords,
+        indestructible="indestructible" in keywords,
+        bushido=combat._combat_keyword_value(card, "bushido"),
+        rampage=combat._combat_keyword_value(card, "rampage"),
+        flanking=combat._has_combat_keyword(card, "flanking"),
+        min_blockers=combat._minimum_blockers_required(state, card_id),
+        value=_creature_value(state, card_id),
+        can_block=frozenset(can_block),
+        protected_from=frozenset(protected_from),
+        harmless_to=frozenset(harmless_to),
+    )
+
+
+def resolve_block(attacker: Combatant, blockers: tuple[Combatant, ...] | list[Combatant]) -> CombatOutcome:
+    """Resolve one attacker against its blockers without touching a match state.
+
+    Mirrors ``rules_engine.combat``: block abilities apply first, damage is
+    assigned to blockers in order (lethal first, one point with deathtouch,
+    the rest tramples over), the first-strike step runs before the regular
+    one, and a step is skipped for the blockers as well when the attacker
+    does not deal damage in it. An attacker whose blockers all died in the
+    first-strike step deals its regular damage as if unblocked, as the
+    engine does. Prevention shields are not modelled.
+    """
+    power = {attacker.id: attacker.power}
+    toughness = {attacker.id: attacker.toughness}
+    for blocker in blockers:
+        power[blocker.id] = blocker.power
+        toughness[blocker.id] = blocker.toughness
+    boosts: list[tuple[str, int, int]] = []
+    if blockers:
+        boost = attacker.bushido + attacker.rampage * (len(blockers) - 1)
+        if boost:
+            boosts.append((attacker.id, boost, boost))
+        for blocker in blockers:
+            change = blocker.bushido - (1 if attacker.flanking and not blocker.flanking else 0)
+            if change:
+                boosts.append((blocker.id, change, change))
+        for cid, dp, dt in boosts:
+            power[cid] += dp
+            toughness[cid] += dt
+    damage = {attacker.id: attacker.damage, **{blocker.id: blocker.damage for blocker in blockers}}
+    deathtouched: set[str] = set()
+    alive = {attacker.id, *(blocker.id for blocker in blockers)}
+    indestructible = {attacker.id} if attacker.indestructible else set()
+    indestructible.update(blocker.id for blocker in blockers if blocker.indestructible)
+    through = attacker_gain = defender_gain = 0
+
+    for first_strike_step in (True, False):
+        if attacker.id in alive and _deals_damage_in_step(attacker, first_strike_step):
+            blocks = [blocker for blocker in blockers if blocker.id in alive]
+            if not blocks:
+                dealt = max(0, power[attacker.id])
+                through += dealt
+                attacker_gain += dealt if attacker.lifelink else 0
+            else:
+                remaining = power[attacker.id]
+                for blocker in blocks:
+                    if remaining <= 0:
+                        break
+                    if attacker.id in blocker.protected_from:
+                        continue
+                    lethal = 1 if attacker.deathtouch else max(1, toughness[blocker.id] - damage[blocker.id])
+                    dealt = min(remaining, lethal)
+                    if dealt > 0:
+                        damage[blocker.id] += dealt
+                        if attacker.deathtouch:
+                            deathtouched.add(blocker.id)
+                        attacker_gain += dealt if attacker.lifelink else 0
+                    remaining -= dealt
+                if attacker.trample and remaining > 0:
+                    through += remaining
+                    attacker_gain += remaining if attacker.lifelink else 0
+                taken = 0
+                lethal_touch = False
+                for blocker in blocks:
+                    if not _deals_damage_in_step(blocker, first_strike_step) or attacker.id in blocker.harmless_to:
+                        continue
+                    dealt = power[blocker.id]
+                    taken += dealt
+                    if dealt > 0 and blocker.deathtouch:
+                        lethal_touch = True
+                    if dealt > 0 and blocker.lifelink:
+                        defender_gain += dealt
+                if taken > 0:
+                    damage[attacker.id] += taken
+                    if lethal_touch:
+                        deathtouched.add(attacker.id)
+        for cid in list(alive):
+            if cid in indestructible:
+                continue
+            if damage[cid] >= toughness[cid] or cid in deathtouched:
+                alive.discard(cid)
+    # State-based actions still remove indestructible creatures at zero toughness.
+    alive = {cid for cid in alive if toughness[cid] > 0}
+    dead = frozenset({attacker.id, *(blocker.id for blocker in blockers)} - alive)
+    return CombatOutcome(dead, through, attacker_gain, defender_gain, tuple(boosts))
+
+
+def _deals_damage_in_step(card: Combatant, first_strike_step: bool) -> bool:
+    if first_strike_step:
+        return card.first_strike or card.double_strike
+    return card.double_strike or not card.first_strike
+
+
+def board_delta(
+    attacker: Combatant,
+    blockers: tuple[Combatant, ...],
+    outcome: CombatOutcome,
+    player_id: int,
+    target_player: int | None,
+) -> float:
+    """Change in ``evaluate_board`` for ``player_id`` caused by one resolved block.
+
+    ``target_player`` is the player the attacker's unblocked damage hits, or
+    None when it attacks a planeswalker.
+    """
+    defender = 1 if attacker.controller == 2 else 2
+    life = {attacker.controller: outcome.attacker_life_gain, defender: outcome.defender_life_gain}
+    if target_player is not None:
+        life[target_player] = life.get(target_player, 0) - outcome.through
+    opponent = 1 if player_id == 2 else 2
+    delta = (life.get(player_id, 0) - life.get(opponent, 0)) * 1.6
+    cards = {attacker.id: attacker, **{blocker.id: blocker for blocker in blockers}}
+    # Walk the combatants in order rather than the dead set, so the float sum
+    # (and tie-breaks between equal plans) does not depend on string hashing.
+    for cid, card in cards.items():
+        if cid not in outcome.dead:
+            continue
+        delta -= (card.value if card.controller == player_id else -card.value) * 0.95
+        # Dead cards go to their owner's graveyard, which counts toward inevitability.
+        delta += 0.056 if card.owner == player_id else -0.056
+    for cid, power, toughness in outcome.boosts:
+        if cid in outcome.dead:
+            continue
+        card = cards[cid]
+        gained = (max(0, card.power + power) - max(0, card.power)) * 1.35
+        gained += (max(0, card.toughness + toughness) - max(0, card.toughness)) * 0.55
+        delta += (gained if card.controller == player_id else -gained) * 0.95
+    return delta
+
+
+# One planned block: the attacker, its blockers in damage order, and the result.
+PlannedBlock = tuple[Combatant, tuple[Combatant, ...], CombatOutcome]
+
+
+@dataclass
+class BlockPlan:
+    """Best assignment found by ``search_blocks``."""
+
+    blocks: dict[str, tuple[str, ...]]
+    score: float
+    nodes: int
+    complete: bool
+    outcomes: dict[str, CombatOutcome] = field(default_factory=dict)
+
+
+def search_blocks(
+    attackers: list[Combatant],
+    blockers: list[Combatant],
+    value: Callable[[Combatant, tuple[Combatant, ...], CombatOutcome], float],
+    finish: Callable[[list[PlannedBlock]], float | None],
+    max_group: int = 2,
+    node_limit: int = 5000,
+    cache: dict | None = None,
+) -> BlockPlan | None:
+    """Branch-and-bound search for the best blocker assignment.
+
+    ``value`` scores one attacker's combat and must be additive across
+    attackers; ``finish`` scores a complete plan's non-additive terms and
+    returns None to reject it. ``finish`` must never be positive: the bound
+    is the sum of each remaining attacker's best block, so pruning on it is
+    exact. Interchangeable blockers are grouped and only their counts are
+    searched. At most ``max_group`` creatures block one attacker (more if
+    it needs more), and the search stops with the best plan so far after
+    ``node_limit`` nodes. Pass the same ``cache`` to repeated searches that
+    share ``value`` to resolve each attacker-and-blockers combat only once.
+    """
+    classes: dict[Combatant, list[Combatant]] = {}
+    for blocker in blockers:
+        classes.setdefault(blocker.signature, []).append(blocker)
+    members = list(classes.values())
+    if cache is None:
+        options = [_block_options(attacker, members, max_group, value, cache) for attacker in attackers]
+    else:
+        blocker_key = (max_group, tuple(blocker.id for blocker in blockers))
+        options = []
+        for attacker in attackers:
+            key = (attacker.id, blocker_key)
+            if key not in cache:
+                cache[key] = _block_options(attacker, members, max_group, value, cache)
+            options.append(cache[key])
+    # Decide the attackers with the most at stake first so the bound tightens early.
+    order = sorted(
+        range(len(attackers)),
+        key=lambda index: -(options[index][0][3] - min(option[3] for option in options[index])),
+    )
+    bounds = [0.0] * (len(order) + 1)
+    for depth in range(len(order) - 1, -1, -1):
+        bounds[depth] = bounds[depth + 1] + options[order[depth]][0][3]
+
+    best_score = float("-inf")
+    best_choice: list[tuple[int, tuple[int, ...]]] | None = None
+    nodes = 0
+    complete = True
+    chosen: list[tuple[int, tuple]] = []
+    remaining = [len(group) for group in members]
+
+    def visit(depth: int, acc: float) -> None:
+        nonlocal best_score, best_choice, nodes, complete
+        nodes += 1
+        if nodes > node_limit:
+            complete = False
+            return
+        if depth == len(order):
+            adjustment = finish([(attackers[index], option[1], option[2]) for index, option in chosen])
+            if adjustment is not None and acc + adjustment > best_score:
+                best_score = acc + adjustment
+                best_choice = [(index, option[0]) for index, option in chosen]
+            return
+        index = order[depth]
+        for option in options[index]:
+            score, used = option[3], option[4]
+            if acc + score + bounds[depth + 1] <= best_score:
+                # Options are sorted best first, so no later one can do better.
+                break
+            if any(count > remaining[slot] for slot, count in used):
+                continue
+            for slot, count in used:
+                remaining[slot] -= count
+            chosen.append((index, option))
+            visit(depth + 1, acc + score)
+            chosen.pop()
+            for slot, count in used:
+                remaining[slot] += count
+            if not complete:
+                return
+
+    visit(0, 0.0)
+    if best_choice is None:
+        return None
+    # Identical blockers resolve identically, so concrete ones are handed out
+    # only for the winning plan, in attacker order.
+    used = [0] * len(members)
+    blocks: dict[str, tuple[str, ...]] = {}
+    outcomes: dict[str, CombatOutcome] = {}
+    for index, counts in sorted(best_choice):
+        group: list[Combatant] = []
+        for slot, count in enumerate(counts):
+            group.extend(members[slot][used[slot] : used[slot] + count])
+            used[slot] += count
+        attacker = attackers[index]
+        outcomes[attacker.id] = resolve_block(attacker, tuple(group))
+        if group:
+            blocks[attacker.id] = tuple(blocker.id for blocker in group)
+    return BlockPlan(blocks=blocks, score=best_score, nodes=nodes, complete=complete, outcomes=outcomes)
+
+
+def _block_options(
+    attacker: Combatant,
+    members: list[list[Combatant]],
+    max_group: int,
+    value: Callable[[Combatant, tuple[Combatant, ...], CombatOutcome], float],
+    cache: dict | None,
+) -> list[tuple]:
+    """Every legal block of ``attacker`` as blocker-class counts, best value first.
+
+    Each option is ``(counts, blockers, outcome, value, nonzero counts)``.
+    """
+    limit = max(max_group, attacker.min_blockers)
+    slots = [slot for slot, group in enumerate(members) if attacker.id in group[0].can_block]
+    options = []
+    for used in _bounded_counts(slots, [len(group) for group in members], limit):
+        size = sum(count for _, count in used)
+        if size and size < attacker.min_blockers:
+            continue
+        group = tuple(blocker for slot, count in used for blocker in members[slot][:count])
+        key = (attacker.id, *(blocker.id for blocker in group))
+        resolved = cache.get(key) if cache is not None else None
+        if resolved is None:
+            outcome = resolve_block(attacker, group)
+            resolved = (outcome, value(attacker, group, outcome))
+            if cache is not None:
+                cache[key] = resolved
+        counts = [0] * len(members)
+        for slot, count in used:
+            counts[slot] = count
+        options.append((tuple(counts), group, resolved[0], resolved[1], used))
+    options.sort(key=lambda option: -option[3])
+    return options
+
+
+def _bounded_counts(slots: list[int], sizes: list[int], limit: int) -> Iterator[tuple[tuple[int, int], ...]]:
+    """Nonzero ``(slot, count)`` choices over ``slots`` using at most ``limit`` creatures in total."""
+    if not slots:
+        yield ()
+        return
+    slot, rest = slots[0], slots[1:]
+    for count in range(min(sizes[slot], limit) + 1):
+        for tail in _bounded_counts(rest, sizes, limit - count):
+            yield ((slot, count), *tail) if count else tail
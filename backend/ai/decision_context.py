@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from functools import wraps
+
+
+class DecisionContext:
+    """Facts about the root state of one decision, each derived at most once.
+
+    Holds the memoized results of ``decision_cached`` scoring helpers (root
+    evaluation, board role, hand profile, color sources, castability, ...)
+    and the effective combat stats read while scoring moves. Only calls on
+    ``state`` itself are served from here; search branches compute directly.
+    """
+
+    __slots__ = ("state", "memo", "combat_stats")
+
+    def __init__(self, state) -> None:
+        self.state = state
+        self.memo: dict[tuple, object] = {}
+        self.combat_stats: dict[str, tuple[int, int]] = {}
+
+
+def decision_cached(method):
+    """Memoize an ``(self, state, player_id, *cards)`` agent helper for the current decision.
+
+    Cached values are shared between callers, so they must be treated as
+    read-only.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def cached(self, state, player_id, *args):
+        context = self._decision_context
+        if context is None or context.state is not state:
+            return method(self, state, player_id, *args)
+        key = (name, player_id, *(getattr(arg, "id", arg) for arg in args))
+        memo = context.memo
+        if key not in memo:
+            memo[key] = method(self, state, player_id, *args)
+        return memo[key]
+
+    return cached
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import time
+
+from rules_engine.engine import RulesEngine
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+HISTOGRAM_BUCKETS_MS = (1.0, 5.0, 20.0, 100.0, 500.0)
+_COUNTERS = ("forks", "take_action", "legal_moves")
+
+
+class SearchWork:
+    """Running tallies of simulation work done by one agent.
+
+    Forks are counted where the agent and its MCTS branch a state; engine
+    calls by the agent's ``CountingRulesEngine``. Profiles read the
+    difference across a stage, so the tallies only ever grow.
+    """
+
+    __slots__ = _COUNTERS
+
+    def __init__(self) -> None:
+        self.forks = 0
+        self.take_action = 0
+        self.legal_moves = 0
+
+    def snapshot(self) -> tuple[int, int, int]:
+        return (self.forks, self.take_action, self.legal_moves)
+
+
+class CountingRulesEngine(RulesEngine):
+    """Rules engine that tallies the actions and move generations it serves in ``work``."""
+
+    def __init__(self) -> None:
+        self.work = SearchWork()
+
+    def take_action(self, state, player_id: int, action: dict) -> None:
+        self.work.take_action += 1
+        return super().take_action(state, player_id, action)
+
+    def legal_moves(self, state, player_id: int, rollout: bool = False) -> list[dict]:
+        self.work.legal_moves += 1
+        return super().legal_moves(state, player_id, rollout=rollout)
+
+
+class DecisionProfile:
+    """Wall time and the growth of ``work`` per stage of one ``choose_action`` call."""
+
+    __slots__ = ("stages", "started", "work")
+
+    def __init__(self, work: SearchWork) -> None:
+        self.stages: dict[str, dict] = {}
+        self.started = time.perf_counter()
+        self.work = work
+
+    def run(self, stage: str, probe, *args):
+        before = self.work.snapshot()
+        started = time.perf_counter()
+        try:
+            return probe(*args)
+        finally:
+            row = self.stages.setdefault(stage, {"ms": 0.0, **dict.fromkeys(_COUNTERS, 0)})
+            row["ms"] += (time.perf_counter() - started) * 1000.0
+            for name, old, new in zip(_COUNTERS, before, self.work.snapshot()):
+                row[name] += new - old
+
+    def summary(self) -> dict:
+        """Trace-ready stage breakdown in the order the stages ran."""
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000.0, 2),
+            "stages": {name: {**row, "ms": round(row["ms"], 2)} for name, row in self.stages.items()},
+        }
+
+
+class ProfileHistograms:
+    """Per-archetype, per-stage latency histograms aggregated from decision profiles."""
+
+    def __init__(self) -> None:
+        self._rows: dict[str, dict[str, dict]] = {}
+
+    def add(self, archetype: str, profile: dict) -> None:
+        if not profile:
+            return
+        stages = self._rows.setdefault(str(archetype), {})
+        self._record(stages, "decision", {"ms": profile.get("total_ms", 0.0)})
+        for name, row in (profile.get("stages") or {}).items():
+            self._record(stages, name, row)
+
+    def to_dict(self) -> dict:
+        out: dict[str, dict] = {}
+        for archetype, stages in sorted(self._rows.items()):
+            out[archetype] = {}
+            for name, row in sorted(stages.items(), key=lambda item: -item[1]["total_ms"]):
+                out[archetype][name] = {
+                    **row,
+                    "total_ms": round(row["total_ms"], 1),
+                    "mean_ms": round(row["total_ms"] / row["calls"], 3),
+                    "max_ms": round(row["max_ms"], 2),
+                }
+        return out
+
+    @staticmethod
+    def _record(stages: dict[str, dict], name: str, row: dict) -> None:
+        ms = float(row.get("ms", 0.0) or 0.0)
+        agg = stages.get(name)
+        if agg is None:
+            agg = stages[name] = {
+                "calls": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                **dict.fromkeys(_COUNTERS, 0),
+                "histogram_ms": {_bucket_label(index): 0 for index in range(len(HISTOGRAM_BUCKETS_MS) + 1)},
+            }
+        agg["calls"] += 1
+        agg["total_ms"] += ms
+        agg["max_ms"] = max(agg["max_ms"], ms)
+        for counter in _COUNTERS:
+            agg[counter] += int(row.get(counter, 0) or 0)
+        index = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if ms < bound), len(HISTOGRAM_BUCKETS_MS))
+        agg["histogram_ms"][_bucket_label(index)] += 1
+
+
+def _bucket_label(index: int) -> str:
+    if index < len(HISTOGRAM_BUCKETS_MS):
+        return f"<{HISTOGRAM_BUCKETS_MS[index]:g}"
+    return f">={HISTOGRAM_BUCKETS_MS[-1]:g}"
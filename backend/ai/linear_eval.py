@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from game_state.state import MatchState
+
+WEIGHTS_PATH = Path(__file__).resolve().parent / "data" / "linear_eval.json"
+FORMAT_VERSION = 2
+# Log-odds are reported in evaluate_board units: MCTS reads evaluate_board / 12
+# as a logit, so the two evaluators can stand in for each other.
+LOGIT_SCALE = 12.0
+
+_EVASION = frozenset({"flying", "menace", "trample", "shadow", "horsemanship"})
+_SIDE_FEATURES = (
+    "life",
+    "hand",
+    "creatures",
+    "power",
+    "toughness",
+    "untapped_creatures",
+    "evasive_power",
+    "lands",
+    "untapped_lands",
+    "planeswalkers",
+    "loyalty",
+    "other_permanents",
+)
+FEATURE_NAMES: tuple[str, ...] = (
+    "turn",
+    "active",
+    *(f"{side}_{name}" for side in ("self", "opp") for name in _SIDE_FEATURES),
+)
+
+
+@dataclass(frozen=True)
+class LinearEvalModel:
+    """Logistic win model over ``FEATURE_NAMES``, fitted on standardized features."""
+
+    weights: np.ndarray
+    bias: float
+    mean: np.ndarray
+    scale: np.ndarray
+    samples: int = 0
+
+    def logits(self, features: np.ndarray) -> np.ndarray:
+        return ((features - self.mean) / self.scale) @ self.weights + self.bias
+
+
+def state_features(state: MatchState, player_id: int) -> list[float]:
+    """Fixed-width feature row for ``player_id``, matching ``example_features``."""
+    opp_id = 1 if player_id == 2 else 2
+    return [
+        float(state.turn),
+        float(state.active_player == player_id),
+        *_player_features(state, player_id),
+        *_player_features(state, opp_id),
+    ]
+
+
+def example_features(row: dict) -> list[float] | None:
+    """Feature row for a ``scripts/extract_training_examples.py`` example, or None without life totals."""
+    life = row.get("life") or {}
+    if life.get("self") is None or life.get("opp") is None:
+        return None
+    return [
+        float(row.get("turn") or 0),
+        float(row.get("active_player") == row.get("pid")),
+        *_side_features(
+            life["self"],
+            row.get("hand_size", 0),
+            (_snapshot_surface(item) for item in row.get("battlefield") or []),
+        ),
+        *_side_features(
+            life["opp"],
+            row.get("opp_hand_size", 0),
+            (_snapshot_surface(item) for item in row.get("opp_battlefield") or []),
+        ),
+    ]
+
+
+def evaluate_board_batch(states: list[MatchState], player_id: int, model: LinearEvalModel) -> list[float]:
+    """Score sibling states for ``player_id`` in one vectorized pass, in evaluate_board units."""
+    if not states:
+        return []
+    features = np.array([state_features(state, player_id) for state in states], dtype=float)
+    return (model.logits(features) * LOGIT_SCALE).tolist()
+
+
+def fit_linear_eval(features: np.ndarray, labels: np.ndarray, l2: float = 1.0, iterations: int = 25) -> LinearEvalModel:
+    """Fit L2-regularized logistic regression (win = 1) with Newton steps."""
+    features = np.asarray(features, dtype=float)
+    labels = np.asarray(labels, dtype=float)
+    mean = features.mean(axis=0)
+    scale = features.std(axis=0)
+    scale[scale < 1e-9] = 1.0
+    x = np.hstack([(features - mean) / scale, np.ones((len(features), 1))])
+    penalty = np.full(x.shape[1], float(l2))
+    penalty[-1] = 0.0
+    theta = np.zeros(x.shape[1])
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-np.clip(x @ theta, -30.0, 30.0)))
+        gradient = x.T @ (p - labels) + penalty * theta
+        hessian = (x.T * (p * (1.0 - p))) @ x + np.diag(penalty) + np.eye(x.shape[1]) * 1e-9
+        step = np.linalg.solve(hessian, gradient)
+        theta -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return LinearEvalModel(weights=theta[:-1], bias=float(theta[-1]), mean=mean, scale=scale, samples=len(features))
+
+
+def load_linear_eval(path: Path = WEIGHTS_PATH) -> LinearEvalModel | None:
+    """Load fitted weights; None when missing, unreadable or fitted on other features."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != FORMAT_VERSION:
+        return None
+    if tuple(payload.get("feature_names") or ()) != FEATURE_NAMES:
+        return None
+    return LinearEvalModel(
+        weights=np.array(payload["weights"], dtype=float),
+        bias=float(payload["bias"]),
+        mean=np.array(payload["mean"], dtype=float),
+        scale=np.array(payload["scale"], dtype=float),
+        samples=int(payload.get("samples", 0) or 0),
+    )
+
+
+def save_linear_eval(model: LinearEvalModel, path: Path = WEIGHTS_PATH, **metadata: Any) -> dict[str, Any]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": FORMAT_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "samples": model.samples,
+        "feature_names": list(FEATURE_NAMES),
+        "weights": [round(float(w), 6) for w in model.weights],
+        "bias": round(model.bias, 6),
+        "mean": [round(float(m), 6) for m in model.mean],
+        "scale": [round(float(s), 6) for s in model.scale],
+        **metadata,
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return payload
+
+
+def _player_features(state: MatchState, player_id: int) -> list[float]:
+    player = state.players[player_id]
+    return _side_features(
+        player.life,
+        len(player.hand),
+        (_card_surface(state.cards[cid]) for cid in player.battlefield if cid in state.cards),
+    )
+
+
+def _card_surface(card) -> tuple:
+    return (
+        card.types or [],
+        card.tapped,
+        card.power,
+        card.toughness,
+        card.keywords or [],
+        card.loyalty,
+    )
+
+
+def _snapshot_surface(item: dict) -> tuple:
+    return (
+        item.get("types") or [],
+        bool(item.get("tapped")),
+        item.get("power"),
+        item.get("toughness"),
+        item.get("keywords") or [],
+        item.get("loyalty"),
+    )
+
+
+def _side_features(life, hand, permanents: Iterable[tuple]) -> list[float]:
+    counts = dict.fromkeys(_SIDE_FEATURES[2:], 0.0)
+    for types, tapped, power, toughness, keywords, loyalty in permanents:
+        if "Creature" in types:
+            power = max(0, _number(power))
+            counts["creatures"] += 1
+            counts["power"] += power
+            counts["toughness"] += max(0, _number(toughness))
+            counts["untapped_creatures"] += not tapped
+            if _EVASION.intersection(str(k).lower() for k in keywords):
+                counts["evasive_power"] += power
+        elif "Land" in types:
+            counts["lands"] += 1
+            counts["untapped_lands"] += not tapped
+        elif "Planeswalker" in types:
+            counts["planeswalkers"] += 1
+            counts["loyalty"] += max(0, _number(loyalty))
+        else:
+            counts["other_permanents"] += 1
+    return [float(_number(life)), float(hand or 0), *counts.values()]
+
+
+def _number(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
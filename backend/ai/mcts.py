@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Hashable
+
+from ai.decision_profile import SearchWork
+from ai.heuristics import evaluate_board
+from ai.transposition import move_key
+from game_state.state import MatchState
+from game_state.state_hash import state_hash
+
+# (state, player_id) -> candidate actions for that player, best first.
+MoveGenerator = Callable[[MatchState, int], list[dict]]
+# (states, player_id) -> board scores for that player, in evaluate_board units.
+LeafEvaluator = Callable[[list[MatchState], int], list[float]]
+
+
+def _evaluate_each(states: list[MatchState], player_id: int) -> list[float]:
+    return [evaluate_board(state, player_id) for state in states]
+
+
+class MCTSNode:
+    """One searched position; values are from the searching player's view."""
+
+    __slots__ = ("mover", "untried", "children", "visits", "value_sum", "pending")
+
+    def __init__(self, mover: int | None) -> None:
+        self.mover = mover
+        self.untried: list[dict] | None = None
+        self.children: dict[str, tuple[dict, MCTSNode]] = {}
+        self.visits = 0
+        self.value_sum = 0.0
+        # Playouts of the current wave that passed through here but are not
+        # scored yet; they count as neutral visits so the wave spreads out.
+        self.pending = 0
+
+    @property
+    def mean(self) -> float:
+        seen = self.visits + self.pending
+        return (self.value_sum + 0.5 * self.pending) / seen if seen else 0.5
+
+
+class MCTSSearch:
+    """UCT search over forked match states.
+
+    Leaves are scored with ``evaluate`` (``evaluate_board`` by default)
+    squashed into [0, 1] instead of random playouts, and expansion follows
+    the caller's move ordering capped at ``width`` children. Playouts run in
+    waves of ``batch`` so a batch evaluator scores a wave's leaves in one
+    call; a batch of 1 is plain sequential UCT. Searched positions are kept
+    by position hash for the rest of the turn, so a later decision that
+    reaches a known position continues from its statistics rather than
+    starting over.
+
+    Experimental: ``AIAgent`` only searches with it when given
+    ``mcts_simulations``.
+    """
+
+    def __init__(
+        self,
+        engine,
+        expand: MoveGenerator,
+        simulations: int = 48,
+        max_depth: int = 4,
+        width: int = 6,
+        exploration: float = 1.2,
+        eval_scale: float = 12.0,
+        spend: Callable[[], bool] | None = None,
+        capacity: int = 20000,
+        work: SearchWork | None = None,
+        evaluate: LeafEvaluator | None = None,
+        batch: int = 1,
+    ) -> None:
+        self.engine = engine
+        self.expand = expand
+        self.simulations = simulations
+        self.max_depth = max_depth
+        self.width = width
+        self.exploration = exploration
+        self.eval_scale = eval_scale
+        self.spend = spend
+        self.capacity = capacity
+        self.work = work or SearchWork()
+        self.evaluate = evaluate or _evaluate_each
+        self.batch = max(1, int(batch))
+        self._nodes: dict[tuple[int, int], MCTSNode] = {}
+        self._scope: Hashable | None = None
+        self.reused_visits = 0
+
+    def begin_decision(self, scope: Hashable) -> None:
+        """Drop the stored tree once the match or turn changes."""
+        if scope != self._scope:
+            self._nodes.clear()
+            self._scope = scope
+
+    def search(self, state: MatchState, player_id: int, root_moves: list[dict]) -> dict[str, tuple[int, float]]:
+        """Search ``root_moves`` for ``player_id``; return ``{move key: (visits, mean value)}``."""
+        if not isinstance(state, MatchState) or len(root_moves) < 2:
+            # With a single candidate there is nothing to rank.
+            return {}
+        root = self._root(state, player_id, root_moves)
+        allowed = {move_key(move) for move in root_moves}
+        self.reused_visits = sum(child.visits for key, (_, child) in root.children.items() if key in allowed)
+        # Small decisions settle quickly; spend at most an eighth of the budget per candidate.
+        simulations = max(0, min(self.simulations, max(2, self.simulations // 8) * len(root_moves)))
+        spent = False
+        while simulations > 0 and not spent:
+            wave: list[tuple[MatchState, list[MCTSNode]]] = []
+            for _ in range(min(self.batch, simulations)):
+                simulations -= 1
+                spent, leaf = self._descend(state, player_id, root, allowed)
+                if leaf is not None:
+                    for visited in leaf[1]:
+                        visited.pending += 1
+                    wave.append(leaf)
+                if spent:
+                    break
+            self._backup(wave, player_id)
+        return {key: (child.visits, child.mean) for key, (_, child) in root.children.items() if key in allowed}
+
+    def _root(self, state: MatchState, player_id: int, root_moves: list[dict]) -> MCTSNode:
+        key = (player_id, state_hash(state))
+        root = self._nodes.get(key)
+        if root is None or root.mover != player_id:
+            root = MCTSNode(player_id)
+            self._remember(key, root)
+        known = set(root.children)
+        if root.untried is not None:
+            known.update(move_key(move) for move in root.untried)
+        root.untried = list(root.untried or []) + [move for move in root_moves if move_key(move) not in known]
+        return root
+
+    def _remember(self, key: tuple[int, int], node: MCTSNode) -> None:
+        if len(self._nodes) >= self.capacity:
+            self._nodes.clear()
+        self._nodes[key] = node
+
+    def _descend(
+        self, state: MatchState, player_id: int, root: MCTSNode, allowed: set[str]
+    ) -> tuple[bool, tuple[MatchState, list[MCTSNode]] | None]:
+        """Walk one playout to a leaf; returns (budget spent, (leaf state, path) or None if dropped)."""
+        self.work.forks += 1
+        sim = state.fork()
+        node = root
+        path = [root]
+        for _ in range(self.max_depth):
+            if sim.winner is not None:
+                break
+            if node.untried is None:
+                node.untried = self.expand(sim, node.mover)[: self.width]
+            pending = [move for move in node.untried if node is not root or move_key(move) in allowed]
+            if pending:
+                move = pending[0]
+                node.untried.remove(move)
+                if self.spend is not None and not self.spend():
+                    return True, None
+                if not self._apply(sim, node.mover, move):
+                    # Illegal in simulation; the branch is dropped unscored.
+                    return False, None
+                child = self._child(sim, player_id, path)
+                node.children[move_key(move)] = (move, child)
+                path.append(child)
+                break
+            children = [
+                (key, move, child)
+                for key, (move, child) in node.children.items()
+                if node is not root or key in allowed
+            ]
+            if not children:
+                break
+            _, move, child = max(children, key=lambda item: self._uct(node, item[2], player_id))
+            if self.spend is not None and not self.spend():
+                return True, None
+            if not self._apply(sim, node.mover, move):
+                return False, None
+            node = child
+            path.append(child)
+        return False, (sim, path)
+
+    def _backup(self, wave: list[tuple[MatchState, list[MCTSNode]]], player_id: int) -> None:
+        for (_, path), value in zip(wave, self._leaf_values([sim for sim, _ in wave], player_id)):
+            for visited in path:
+                visited.pending -= 1
+                visited.visits += 1
+                visited.value_sum += value
+
+    def _child(self, sim: MatchState, player_id: int, path: list[MCTSNode]) -> MCTSNode:
+        """Node for the position just reached: the stored one if known, else a new stored node.
+
+        The tree and the position table always share the node, so statistics
+        gathered through either stay in one place. A position already on the
+        current path gets a private node so one playout is not counted twice.
+        """
+        mover = None if sim.winner is not None else sim.priority_player
+        key = (player_id, state_hash(sim))
+        stored = self._nodes.get(key)
+        if stored is not None and stored.mover == mover:
+            if all(stored is not visited for visited in path):
+                return stored
+            return MCTSNode(mover)
+        child = MCTSNode(mover)
+        self._remember(key, child)
+        return child
+
+    def _uct(self, parent: MCTSNode, child: MCTSNode, player_id: int) -> float:
+        seen = child.visits + child.pending
+        if not seen:
+            return math.inf
+        exploit = child.mean if parent.mover == player_id else 1.0 - child.mean
+        return exploit + self.exploration * math.sqrt(math.log(max(1, parent.visits + parent.pending)) / seen)
+
+    def _apply(self, sim: MatchState, mover: int | None, move: dict) -> bool:
+        try:
+            self.engine.take_action(sim, mover, move)
+            if sim.step == sim.step.COMBAT_DAMAGE:
+                self.engine.take_action(sim, sim.active_player, {"type": "combat_damage"})
+        except Exception:
+            return False
+        return True
+
+    def _leaf_values(self, sims: list[MatchState], player_id: int) -> list[float]:
+        open_leaves = [sim for sim in sims if sim.winner is None]
+        scores = iter(self.evaluate(open_leaves, player_id) if open_leaves else ())
+        values = []
+        for sim in sims:
+            if sim.winner is not None:
+                values.append(1.0 if sim.winner == player_id else 0.0)
+                continue
+            score = next(scores) / self.eval_scale
+            values.append(1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, score)))))
+        return values
+
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from game_state.serializers import deserialize_match_snapshot
+
+# Persistent pools keyed by worker count. Workers are spawned rather than
+# forked so an API process with live threads can use them safely.
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+
+
+@dataclass(frozen=True)
+class RootTask:
+    """One root candidate to search in a worker, with everything it needs."""
+
+    snapshot: dict
+    agent_config: dict
+    move: dict
+    player_id: int
+    depth: int
+    max_nodes: int | None
+    think_ms: float | None = None
+
+
+def search_pool(workers: int) -> ProcessPoolExecutor:
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        _POOLS[workers] = pool
+    return pool
+
+
+def shutdown_search_pools() -> None:
+    for pool in _POOLS.values():
+        pool.shutdown(cancel_futures=True)
+    _POOLS.clear()
+
+
+atexit.register(shutdown_search_pools)
+
+
+def run_root_tasks(tasks: list[RootTask], workers: int) -> list[tuple[list[float], int]]:
+    """Score root candidates, in task order, on ``workers`` processes.
+
+    Each task is searched from its own snapshot with a fresh agent and
+    budget, so node-limited results do not depend on how tasks land on
+    workers; one worker runs the same path inline.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [score_root_task(task) for task in tasks]
+    return list(search_pool(workers).map(score_root_task, tasks))
+
+
+def score_root_task(task: RootTask) -> tuple[list[float], int]:
+    """Return the candidate's line score at each completed depth and the nodes spent."""
+    from ai.agent import AIAgent
+
+    state = deserialize_match_snapshot(task.snapshot)
+    agent = AIAgent(**task.agent_config, think_ms=task.think_ms, max_nodes=task.max_nodes, search_workers=0)
+    return agent.search_root_candidate(state, task.move, task.player_id, task.depth)
+
+
+def _warm_worker() -> None:
+    # Pay imports and the log-prior load once per worker, not per task.
+    from ai.agent import AIAgent
+
+    AIAgent(difficulty="master")
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+
+# Node allowance per difficulty. A node is one forked branch the search
+# plays a move on. Defaults sit well above what ordinary boards need, so they
+# only cut searches that would otherwise stall a match run. Node limits are
+# deterministic, so seeded games replay exactly.
+DEFAULT_MAX_NODES: dict[str, int] = {
+    "master": 400,
+    "master_plus": 1500,
+}
+_FALLBACK_MAX_NODES = 200
+# Wall-clock caps interactive play opts into via AIAgent(think_ms=...). They
+# make the chosen move depend on machine speed and load, so agents are
+# node-limited only unless a caller asks for one.
+INTERACTIVE_THINK_MS: dict[str, float] = {
+    "master": 750.0,
+    "master_plus": 1500.0,
+}
+_FALLBACK_THINK_MS = 250.0
+
+
+def default_max_nodes(difficulty: str) -> int:
+    return DEFAULT_MAX_NODES.get(str(difficulty or "").lower(), _FALLBACK_MAX_NODES)
+
+
+def interactive_think_ms(difficulty: str) -> float:
+    return INTERACTIVE_THINK_MS.get(str(difficulty or "").lower(), _FALLBACK_THINK_MS)
+
+
+class SearchBudget:
+    """Wall-clock and node allowance for one AI decision.
+
+    Once either limit is hit the budget stays exhausted, so callers can stop
+    deepening and keep the best result they already have.
+    """
+
+    __slots__ = ("think_ms", "max_nodes", "nodes", "started", "exhausted")
+
+    def __init__(self, think_ms: float | None = None, max_nodes: int | None = None) -> None:
+        self.think_ms = think_ms
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.started = time.perf_counter()
+        self.exhausted = False
+
+    def spend(self, nodes: int = 1) -> bool:
+        """Charge ``nodes`` simulated nodes; return False once the budget is spent."""
+        if self.exhausted:
+            return False
+        self.nodes += nodes
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.exhausted = True
+        elif self.think_ms is not None and self.elapsed_ms() > self.think_ms:
+            self.exhausted = True
+        return not self.exhausted
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def stats(self) -> dict:
+        return {"nodes": self.nodes, "elapsed_ms": round(self.elapsed_ms(), 1), "exhausted": self.exhausted}
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+
+def move_key(move: dict) -> str:
+    """Canonical, hashable form of an action dict."""
+    return json.dumps(move, sort_keys=True, default=str)
+
+
+@dataclass
+class TranspositionEntry:
+    score: float
+    best_move: dict | None = None
+    ranking: list[dict] | None = None
+
+
+class TranspositionTable:
+    """Bounded LRU cache of searched positions for one agent.
+
+    Keys are ``(position hash, depth, ...)`` tuples built by the caller; an
+    entry holds the evaluated score and, where the search chose one, the
+    best move or a full move ranking. The table is scoped to one turn of one match so consecutive
+    decisions in a turn share it and nothing leaks across games.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self.capacity = max(1, int(capacity))
+        self._entries: OrderedDict[Hashable, TranspositionEntry] = OrderedDict()
+        self._scope: Hashable | None = None
+        self.hits = 0
+        self.lookups = 0
+        self.decision_hits = 0
+        self.decision_lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def begin_decision(self, scope: Hashable) -> None:
+        """Start one decision's counters, dropping the table if the scope moved on."""
+        if scope != self._scope:
+            self._entries.clear()
+            self._scope = scope
+        self.decision_hits = 0
+        self.decision_lookups = 0
+
+    def get(self, key: Hashable) -> TranspositionEntry | None:
+        self.lookups += 1
+        self.decision_lookups += 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.decision_hits += 1
+        return entry
+
+    def put(self, key: Hashable, score: float, best_move: dict | None = None, ranking: list[dict] | None = None) -> None:
+        self._entries[key] = TranspositionEntry(score, best_move, ranking)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def decision_stats(self) -> dict:
+        """Hit counts for the most recent decision, for AI traces."""
+        lookups = self.decision_lookups
+        return {
+            "hits": self.decision_hits,
+            "lookups": lookups,
+            "hit_rate": round(self.decision_hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+        }
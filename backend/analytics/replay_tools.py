@@ -7,12 +7,11 @@ UUID_RE = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f
 
 
 def normalize_log_line(line: str) -> str:
+    """Mask random UUIDs; only needed for logs recorded before seeded object ids."""
     return UUID_RE.sub("<id>", line)
 
 
 def first_log_divergence(a_lines: list[str], b_lines: list[str]) -> dict:
-    a_lines = [normalize_log_line(line) for line in a_lines]
-    b_lines = [normalize_log_line(line) for line in b_lines]
     shared = min(len(a_lines), len(b_lines))
     idx = 0
     while idx < shared and a_lines[idx] == b_lines[idx]:
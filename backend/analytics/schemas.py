@@ -9,6 +9,7 @@ class BatchSimulationRequest(BaseModel):
     matches: int = Field(default=100, ge=1, le=500)
     difficulty: str = "master"
     max_ticks: int = Field(default=6000, ge=500, le=50000)
+    workers: int = Field(default=1, ge=1, le=64)
 
 
 class AIDiagnosticsRequest(BaseModel):
@@ -3,16 +3,20 @@ from __future__ import annotations
 import json
 import hashlib
 import random
+from dataclasses import dataclass
 from itertools import combinations
 from collections import Counter
 
 from ai.agent import AIAgent
 from ai.deck_analysis import guess_archetype
+from ai.parallel_search import search_pool
 from analytics.replay_tools import classify_first_divergence, first_log_divergence
 from rules_engine.mana import mana_value, parse_mana_cost
 from persistence.repository import Repository
 from rules_engine.engine import RulesEngine
 from game_state.state import MatchFactory
+from game_state.state_hash import state_hash
+from game_state.telemetry import MatchTelemetry
 
 
 class AnalyticsService:
@@ -28,7 +32,14 @@ class AnalyticsService:
         difficulty: str = "master",
         max_ticks: int = 6000,
         progress_callback=None,
+        workers: int = 1,
     ) -> dict:
+        """Play ``matches`` seeded games between the decks and summarize them.
+
+        With ``workers`` > 1 the games are sharded across a process pool; each
+        game depends only on its own seed, so the report (and its replay
+        fingerprint) matches the serial run.
+        """
         stats = Counter()
         turn_counts = []
         play_win = 0
@@ -43,39 +54,22 @@ class AnalyticsService:
         second_game_log: list[str] = []
         game_results: list[dict[str, object]] = []
 
-        for i in range(matches):
-            seed = self._batch_seed(deck_a, deck_b, i, difficulty)
-            deck_a_on_play = i % 2 == 0
-            if deck_a_on_play:
-                state = MatchFactory.from_decks(deck_a, deck_b, player_a_name="Deck A", player_b_name="Deck B", seed=seed)
-            else:
-                state = MatchFactory.from_decks(deck_b, deck_a, player_a_name="Deck B", player_b_name="Deck A", seed=seed)
-            opener_quality_a.append(self._opening_hand_quality(state, 1))
-            opener_quality_b.append(self._opening_hand_quality(state, 2))
-            a_agent = AIAgent(difficulty=difficulty, archetype=guess_archetype(deck_a))
-            b_agent = AIAgent(difficulty=difficulty, archetype=guess_archetype(deck_b))
-            ticks = 0
-            while state.winner is None and ticks < max_ticks:
-                if state.pregame_pending:
-                    pid = 1 if 1 not in state.kept_hands else 2
-                else:
-                    pid = state.priority_player
-                legal = self.engine.legal_moves(state, pid)
-                if deck_a_on_play:
-                    agent = a_agent if pid == 1 else b_agent
-                else:
-                    agent = b_agent if pid == 1 else a_agent
-                decision = agent.choose_action(state, legal, pid)
-                # Safety: if AI returns an action not in legal moves, treat as pass
-                legal_types = {m["type"] for m in legal}
-                if decision.action.get("type") not in legal_types:
-                    decision.action = {"type": "pass_priority"}
-                self.engine.take_action(state, pid, decision.action)
-                if state.step == state.step.COMBAT_DAMAGE:
-                    self.engine.take_action(state, state.active_player, {"type": "combat_damage"})
-                ticks += 1
-
-            winner = state.winner
+        tasks = [
+            BatchGameTask(deck_a, deck_b, i, self._batch_seed(deck_a, deck_b, i, difficulty), difficulty, max_ticks)
+            for i in range(matches)
+        ]
+        if workers > 1 and matches > 1:
+            # Pool.map yields in task order, so results merge by game_index.
+            games = search_pool(workers).map(play_batch_game, tasks)
+        else:
+            games = (play_batch_game(task, self.engine) for task in tasks)
+
+        for game in games:
+            i = game.game_index
+            winner = game.winner
+            deck_a_on_play = game.deck_a_on_play
+            opener_quality_a.append(game.opener_quality_a)
+            opener_quality_b.append(game.opener_quality_b)
             if winner in (1, 2):
                 deck_a_won = (winner == 1 and deck_a_on_play) or (winner == 2 and not deck_a_on_play)
                 if deck_a_won:
@@ -88,23 +82,24 @@ class AnalyticsService:
                         play_win += 1
             else:
                 stats["timeouts"] += 1
-            self._scan_log_for_anomalies(state.log, anomaly_counts, top_errors, oracle_fallback_cards)
+            self._merge_telemetry(game.telemetry, anomaly_counts, top_errors, oracle_fallback_cards)
             if i == 0:
-                first_game_log = list(state.log)
+                first_game_log = game.log
             elif i == 1:
-                second_game_log = list(state.log)
+                second_game_log = game.log
             game_results.append(
                 {
                     "game_index": i,
-                    "seed": seed,
+                    "seed": game.seed,
                     "winner": winner,
-                    "turns": state.turn,
+                    "turns": game.turns,
                     "timeout": winner is None,
                     "deck_a_on_play": deck_a_on_play,
+                    "state_hash": f"{game.state_hash:016x}",
                 }
             )
-            replay_fingerprint_parts.append(f"{i}:{winner or 0}:{state.turn}")
-            turn_counts.append(state.turn)
+            replay_fingerprint_parts.append(f"{i}:{winner or 0}:{game.turns}:{game.state_hash:016x}")
+            turn_counts.append(game.turns)
             if progress_callback is not None:
                 try:
                     progress_callback(i + 1, matches)
@@ -240,8 +235,8 @@ class AnalyticsService:
 
             for game_idx in range(matches_per_pair):
                 state = MatchFactory.from_decks(left["mainboard"], right["mainboard"], player_a_name=left["name"], player_b_name=right["name"])
-                a_agent = AIAgent(difficulty=difficulty, archetype=guess_archetype(left["mainboard"]))
-                b_agent = AIAgent(difficulty=difficulty, archetype=guess_archetype(right["mainboard"]))
+                a_agent = AIAgent(difficulty=difficulty, archetype=guess_archetype(left["mainboard"]), think_ms=None)
+                b_agent = AIAgent(difficulty=difficulty, archetype=guess_archetype(right["mainboard"]), think_ms=None)
                 ticks = 0
                 while state.winner is None and ticks < max_ticks:
                     pid = 1 if state.pregame_pending and 1 not in state.kept_hands else (2 if state.pregame_pending else state.priority_player)
@@ -266,7 +261,7 @@ class AnalyticsService:
                 elif state.winner == 1 and game_idx % 2 == 0:
                     pair_first_player_wins += 1
 
-                self._scan_log_for_anomalies(state.log, pair_counts, top_errors, oracle_fallback_cards)
+                self._merge_telemetry(state.telemetry, pair_counts, top_errors, oracle_fallback_cards)
                 if game_idx == 0:
                     first_game_log = list(state.log)
                 elif game_idx == 1:
@@ -407,7 +402,8 @@ class AnalyticsService:
                 break
         return summaries
 
-    def _opening_hand_quality(self, state, player_id: int) -> float:
+    @staticmethod
+    def _opening_hand_quality(state, player_id: int) -> float:
         hand = [state.cards[cid] for cid in state.players[player_id].hand]
         lands = sum(1 for c in hand if "Land" in c.types)
         cheap_spells = 0
@@ -428,9 +424,11 @@ class AnalyticsService:
             expanded.extend([item] * int(item["quantity"]))
         if not expanded:
             return 0.0
+        # Seeded by the list itself so a batch report depends only on its inputs.
+        rng = random.Random(json.dumps(deck, sort_keys=True))
         sample_scores = []
         for _ in range(20):
-            hand = random.sample(expanded, k=min(7, len(expanded)))
+            hand = rng.sample(expanded, k=min(7, len(expanded)))
             cmcs = []
             for item in hand:
                 cost = parse_mana_cost(item.get("mana_cost", ""))
@@ -457,61 +455,88 @@ class AnalyticsService:
         )
         return int(hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16], 16)
 
-    def _scan_log_for_anomalies(
-        self,
-        log: list[str],
-        out: Counter,
-        top_errors: Counter,
-        oracle_fallback_cards: Counter | None = None,
-    ) -> None:
-        error_lines: list[str] = []
-        consecutive_passes = 0
-        x_error_streak = 0
-        for line in log:
-            low = line.lower()
-            if "passes priority" in low:
-                consecutive_passes += 1
-                if consecutive_passes >= 4:
-                    out["stall_pass_streaks"] += 1
-                    consecutive_passes = 0
-            else:
-                consecutive_passes = 0
-            if "x value is required" in low or "x value must be non-negative" in low:
-                x_error_streak += 1
-                if x_error_streak >= 2:
-                    out["x_spell_error_loops"] += 1
-                    x_error_streak = 0
-            else:
-                x_error_streak = 0
-            if "invalid targets for" in low:
-                out["invalid_targets"] += 1
-                error_lines.append(line.strip())
-            if "oracle effect not inferred for " in low:
-                out["oracle_fallbacks"] += 1
-                card_name = line.split("Oracle effect not inferred for ", 1)[-1].split(" (controller=", 1)[0].strip()
-                if oracle_fallback_cards is not None and card_name:
-                    oracle_fallback_cards[card_name] += 1
-                error_lines.append(line.strip())
-            if "cannot satisfy chosen costs for" in low or "cannot pay mana cost for" in low:
-                out["cost_failures"] += 1
-                error_lines.append(line.strip())
-            if "failed additional costs for" in low:
-                out["additional_cost_failures"] += 1
-                error_lines.append(line.strip())
-            if "missed land-play window" in low or "land in hand but no land play available" in low:
-                out["missed_land_windows"] += 1
-                error_lines.append(line.strip())
-            if "pass_priority" in low and "main" in low:
-                out["main_phase_pass_loops"] += 1
-        for e in error_lines:
-            top_errors[e] += 1
-        # Detect repeated consecutive error bursts, which usually indicate AI stall loops.
-        streak = 1
-        for i in range(1, len(error_lines)):
-            if error_lines[i] == error_lines[i - 1]:
-                streak += 1
-                if streak >= 3:
-                    out["repeated_error_bursts"] += 1
-                    streak = 1
-            else:
-                streak = 1
+    @staticmethod
+    def _merge_telemetry(telemetry, out: Counter, top_errors: Counter, oracle_fallback_cards: Counter | None = None) -> None:
+        """Fold one match's engine-side anomaly counters into the batch totals."""
+        out.update(telemetry.counts)
+        top_errors.update(telemetry.errors)
+        if oracle_fallback_cards is not None:
+            oracle_fallback_cards.update(telemetry.oracle_fallback_cards)
+
+
+@dataclass(frozen=True)
+class BatchGameTask:
+    """One seeded ``run_batch`` game, picklable for pool workers."""
+
+    deck_a: list[dict]
+    deck_b: list[dict]
+    game_index: int
+    seed: int
+    difficulty: str
+    max_ticks: int
+
+
+@dataclass(frozen=True)
+class BatchGameResult:
+    """Per-game outcome merged into the batch report; logs only for the first two games."""
+
+    game_index: int
+    seed: int
+    deck_a_on_play: bool
+    winner: int | None
+    turns: int
+    state_hash: int
+    opener_quality_a: float
+    opener_quality_b: float
+    telemetry: MatchTelemetry
+    log: list[str]
+
+
+def play_batch_game(task: BatchGameTask, engine: RulesEngine | None = None) -> BatchGameResult:
+    """Play one batch game to a winner or ``max_ticks`` decisions."""
+    engine = engine or RulesEngine()
+    deck_a, deck_b, i = task.deck_a, task.deck_b, task.game_index
+    deck_a_on_play = i % 2 == 0
+    if deck_a_on_play:
+        state = MatchFactory.from_decks(deck_a, deck_b, player_a_name="Deck A", player_b_name="Deck B", seed=task.seed)
+    else:
+        state = MatchFactory.from_decks(deck_b, deck_a, player_a_name="Deck B", player_b_name="Deck A", seed=task.seed)
+    opener_quality_a = AnalyticsService._opening_hand_quality(state, 1)
+    opener_quality_b = AnalyticsService._opening_hand_quality(state, 2)
+    # Node budgets only: a clock would make results depend on machine load
+    # and on how games are sharded across workers.
+    a_agent = AIAgent(difficulty=task.difficulty, archetype=guess_archetype(deck_a), think_ms=None)
+    b_agent = AIAgent(difficulty=task.difficulty, archetype=guess_archetype(deck_b), think_ms=None)
+    ticks = 0
+    while state.winner is None and ticks < task.max_ticks:
+        if state.pregame_pending:
+            pid = 1 if 1 not in state.kept_hands else 2
+        else:
+            pid = state.priority_player
+        legal = engine.legal_moves(state, pid)
+        if deck_a_on_play:
+            agent = a_agent if pid == 1 else b_agent
+        else:
+            agent = b_agent if pid == 1 else a_agent
+        decision = agent.choose_action(state, legal, pid)
+        # Safety: if AI returns an action not in legal moves, treat as pass
+        legal_types = {m["type"] for m in legal}
+        if decision.action.get("type") not in legal_types:
+            decision.action = {"type": "pass_priority"}
+        engine.take_action(state, pid, decision.action)
+        if state.step == state.step.COMBAT_DAMAGE:
+            engine.take_action(state, state.active_player, {"type": "combat_damage"})
+        ticks += 1
+
+    return BatchGameResult(
+        game_index=i,
+        seed=task.seed,
+        deck_a_on_play=deck_a_on_play,
+        winner=state.winner,
+        turns=state.turn,
+        state_hash=state_hash(state),
+        opener_quality_a=opener_quality_a,
+        opener_quality_b=opener_quality_b,
+        telemetry=state.telemetry,
+        log=list(state.log) if i < 2 else [],
+    )
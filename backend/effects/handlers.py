@@ -808,8 +808,7 @@ def _place_searched_card(
 
 
 def create_token(state: MatchState, controller: int, payload: dict) -> None:
-    from game_state.state import CardInstance
-    import uuid
+    from game_state.state import CardInstance, allocate_object_id
 
     name = payload.get("name", "Token")
     p = int(payload.get("power", 1))
@@ -821,7 +820,7 @@ def create_token(state: MatchState, controller: int, payload: dict) -> None:
     sac_next_end = bool(payload.get("sacrifice_next_end_step", False))
     token_image_uri = payload.get("image_uri") or resolve_token_image_uri(name, p, t)
     for _ in range(amount):
-        cid = str(uuid.uuid4())
+        cid = allocate_object_id(state, "token")
         token = CardInstance(
             id=cid,
             name=name,
@@ -1014,7 +1013,7 @@ def add_counters(state: MatchState, controller: int, payload: dict) -> None:
             card.toughness = 0
             card.tapped = False
             if "haste" not in {str(x).lower() for x in card.keywords}:
-                card.keywords.append("haste")
+                card.keywords = [*card.keywords, "haste"]
             state.log.append(f"{card.name} becomes a 0/0 Elemental creature with haste.")
         # PT delta from counters is computed dynamically by effective_power/toughness
 
@@ -1158,7 +1157,7 @@ def grant_keyword(state: MatchState, controller: int, payload: dict) -> None:
     if target in state.cards and keyword:
         card = state.cards[target]
         if keyword not in card.keywords:
-            card.keywords.append(keyword)
+            card.keywords = [*card.keywords, keyword]
 
 
 def prevent_damage(state: MatchState, controller: int, payload: dict) -> None:
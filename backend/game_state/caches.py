@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def set_private_cache(obj, name: str, value: T) -> T:
+    """Attach derived data to a match, card or player and return it.
+
+    Cache names start with an underscore so ``MatchState.fork`` leaves them
+    behind for the branch to rebuild. The value is stored in the instance
+    dict, bypassing ``__setattr__``, so writes to cards and players never
+    bump layer versions or the position hash.
+    """
+    obj.__dict__[name] = value
+    return value
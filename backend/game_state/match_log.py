@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+class LogEvent:
+    """One typed log entry; its human-readable line is rendered on first read."""
+
+    __slots__ = ("kind", "template", "fields", "_text")
+
+    def __init__(self, kind: str, template: str, fields: dict[str, Any]) -> None:
+        self.kind = kind
+        self.template = template
+        self.fields = fields
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.template.format(**self.fields)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"LogEvent({self.kind!r}, {self.text!r})"
+
+
+class MatchLog:
+    """Append-only match history of plain lines and typed ``LogEvent`` entries.
+
+    Reads (iteration, indexing, slicing) see rendered ``str`` lines, so code
+    written against ``list[str]`` keeps working. A disabled log drops every
+    write, which is what search branches use. ``limit`` bounds the number of
+    retained entries; ``dropped`` counts the oldest entries discarded.
+    """
+
+    def __init__(self, entries: Iterable[str | LogEvent] = (), enabled: bool = True, limit: int | None = None) -> None:
+        self._entries: list[str | LogEvent] = list(entries)
+        self.enabled = enabled
+        self.limit = limit
+        self.dropped = 0
+        self._trim()
+
+    def append(self, line: str) -> None:
+        if self.enabled:
+            self._entries.append(line)
+            self._trim()
+
+    def record(self, kind: str, template: str, fields: dict[str, Any]) -> None:
+        if self.enabled:
+            self._entries.append(LogEvent(kind, template, fields))
+            self._trim()
+
+    def extend(self, lines: Iterable[str | LogEvent]) -> None:
+        if self.enabled:
+            self._entries.extend(lines)
+            self._trim()
+
+    def entries(self) -> list[str | LogEvent]:
+        """Return the raw entries, keeping typed events unrendered."""
+        return list(self._entries)
+
+    def events(self, kind: str | None = None) -> Iterator[LogEvent]:
+        for entry in self._entries:
+            if isinstance(entry, LogEvent) and (kind is None or entry.kind == kind):
+                yield entry
+
+    def copy(self) -> MatchLog:
+        clone = MatchLog(self._entries, enabled=self.enabled, limit=self.limit)
+        clone.dropped = self.dropped
+        return clone
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _trim(self) -> None:
+        if self.limit is not None and len(self._entries) > self.limit:
+            excess = len(self._entries) - self.limit
+            del self._entries[:excess]
+            self.dropped += excess
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        for entry in self._entries:
+            yield entry if isinstance(entry, str) else entry.text
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [entry if isinstance(entry, str) else entry.text for entry in self._entries[index]]
+        entry = self._entries[index]
+        return entry if isinstance(entry, str) else entry.text
+
+    def __delitem__(self, index) -> None:
+        del self._entries[index]
+
+    def __contains__(self, line: object) -> bool:
+        return any(text == line for text in self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (MatchLog, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __add__(self, other: Iterable[str]) -> list[str]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[str]) -> list[str]:
+        return [*other, *self]
+
+    def __repr__(self) -> str:
+        return f"MatchLog({list(self)!r})"
+
+
+def log_enabled(state: Any) -> bool:
+    """Return whether writes to ``state.log`` are kept, so costly lines can be skipped."""
+    return getattr(state.log, "enabled", True)
+
+
+def log_event(state: Any, kind: str, template: str, **fields: Any) -> None:
+    """Record a typed event on ``state.log``; plain list logs get the rendered line."""
+    log = state.log
+    if isinstance(log, MatchLog):
+        log.record(kind, template, fields)
+    else:
+        log.append(template.format(**fields))
@@ -2,7 +2,18 @@ from __future__ import annotations
 
 import random
 
-from game_state.state import CardInstance, MatchState, PlayerState, StackItem, Step, TURN_STEPS, Zone
+from game_state.match_log import MatchLog
+from game_state.state import (
+    CardDefinition,
+    CardInstance,
+    MatchState,
+    PlayerState,
+    StackItem,
+    Step,
+    TURN_STEPS,
+    Zone,
+    intern_card_definition,
+)
 
 
 def _tupleize(value):
@@ -11,8 +22,59 @@ def _tupleize(value):
     return value
 
 
+def _definition_refs(state: MatchState) -> dict[int, tuple[str, CardDefinition]]:
+    """Number each distinct card definition in card order for the snapshot."""
+    refs: dict[int, tuple[str, CardDefinition]] = {}
+    for card in state.cards.values():
+        if id(card.definition) not in refs:
+            refs[id(card.definition)] = (f"d{len(refs) + 1}", card.definition)
+    return refs
+
+
+def _serialize_definition(definition: CardDefinition) -> dict:
+    return {
+        "name": definition.name,
+        "mana_cost": definition.mana_cost,
+        "oracle_text": definition.oracle_text,
+        "type_line": definition.type_line,
+        "image_uri": definition.image_uri,
+        "card_faces": list(definition.card_faces),
+        "keywords": list(definition.keywords),
+    }
+
+
+def _serialize_card(card: CardInstance, definition_ref: str) -> dict:
+    out = {
+        "id": card.id,
+        "name": card.name,
+        "owner": card.owner,
+        "controller": card.controller,
+        "zone": card.zone.value,
+        "types": list(card.types),
+        "power": card.power,
+        "toughness": card.toughness,
+        "loyalty": card.loyalty,
+        "tapped": card.tapped,
+        "summoning_sick": card.summoning_sick,
+        "entered_turn": card.entered_turn,
+        "counters": dict(card.counters),
+        "attached_to": card.attached_to,
+        "static_order": card.static_order,
+        "effect_timestamp": card.effect_timestamp,
+        "instance_order": card.instance_order,
+        "selected_face_index": card.selected_face_index,
+        "chosen_creature_type": card.chosen_creature_type,
+        "definition": definition_ref,
+    }
+    # Only card data that differs from the shared definition is stored per card.
+    for key, value in card.overrides().items():
+        out[key] = list(value) if key in {"card_faces", "keywords"} else value
+    return out
+
+
 def serialize_match_snapshot(state: MatchState) -> dict:
     """Serialize all mutable rules state needed to resume a match."""
+    definition_refs = _definition_refs(state)
     return {
         "id": state.id,
         "turn": state.turn,
@@ -40,6 +102,7 @@ def serialize_match_snapshot(state: MatchState) -> dict:
         "log": list(state.log),
         "next_static_order": state.next_static_order,
         "next_effect_timestamp": state.next_effect_timestamp,
+        "next_object_id": state.next_object_id,
         "day_night": state.day_night,
         "spells_cast_this_turn": {str(key): value for key, value in state.spells_cast_this_turn.items()},
         "spells_cast_last_turn": state.spells_cast_last_turn,
@@ -77,34 +140,11 @@ def serialize_match_snapshot(state: MatchState) -> dict:
             }
             for pid, player in state.players.items()
         },
+        "card_definitions": {
+            ref: _serialize_definition(definition) for ref, definition in definition_refs.values()
+        },
         "cards": {
-            cid: {
-                "id": card.id,
-                "name": card.name,
-                "owner": card.owner,
-                "controller": card.controller,
-                "zone": card.zone.value,
-                "types": list(card.types),
-                "mana_cost": card.mana_cost,
-                "power": card.power,
-                "toughness": card.toughness,
-                "loyalty": card.loyalty,
-                "tapped": card.tapped,
-                "summoning_sick": card.summoning_sick,
-                "entered_turn": card.entered_turn,
-                "counters": dict(card.counters),
-                "keywords": list(card.keywords),
-                "oracle_text": card.oracle_text,
-                "type_line": card.type_line,
-                "image_uri": card.image_uri,
-                "attached_to": card.attached_to,
-                "static_order": card.static_order,
-                "effect_timestamp": card.effect_timestamp,
-                "instance_order": card.instance_order,
-                "card_faces": list(card.card_faces),
-                "selected_face_index": card.selected_face_index,
-                "chosen_creature_type": card.chosen_creature_type,
-            }
+            cid: _serialize_card(card, definition_refs[id(card.definition)][0])
             for cid, card in state.cards.items()
         },
         "stack": [
@@ -137,8 +177,15 @@ def deserialize_match_snapshot(payload: dict) -> MatchState:
             setattr(player, key, int(raw.get(key, getattr(player, key))))
         players[player.id] = player
 
+    definitions = {
+        str(ref): intern_card_definition(**raw) for ref, raw in payload.get("card_definitions", {}).items()
+    }
     cards = {}
     for cid, raw in payload["cards"].items():
+        if raw.get("definition") in definitions:
+            cards[cid] = _deserialize_card(raw, definitions[raw["definition"]])
+            continue
+        # Snapshots written before card definitions carry all card data inline.
         cards[cid] = CardInstance(
             id=str(raw["id"]), name=str(raw["name"]), owner=int(raw["owner"]),
             controller=int(raw["controller"]), zone=Zone(raw["zone"]),
@@ -184,9 +231,10 @@ def deserialize_match_snapshot(payload: dict) -> MatchState:
         int(key): {Step(value) for value in values}
         for key, values in payload.get("priority_stops", {}).items()
     }
-    state.log = list(payload.get("log", []))
+    state.log = MatchLog(payload.get("log", []))
     state.next_static_order = int(payload.get("next_static_order", 1))
     state.next_effect_timestamp = int(payload.get("next_effect_timestamp", state.next_static_order))
+    state.next_object_id = int(payload.get("next_object_id", 1))
     state.day_night = str(payload.get("day_night", "none") or "none")
     state.spells_cast_this_turn = {
         int(key): int(value) for key, value in payload.get("spells_cast_this_turn", {"1": 0, "2": 0}).items()
@@ -209,6 +257,29 @@ def deserialize_match_snapshot(payload: dict) -> MatchState:
     return state
 
 
+def _deserialize_card(raw: dict, definition: CardDefinition) -> CardInstance:
+    overrides = {
+        key: list(raw[key]) if key in {"card_faces", "keywords"} else raw[key]
+        for key in ("mana_cost", "oracle_text", "type_line", "image_uri", "card_faces", "keywords")
+        if key in raw
+    }
+    return CardInstance(
+        id=str(raw["id"]), name=str(raw["name"]), owner=int(raw["owner"]),
+        controller=int(raw["controller"]), zone=Zone(raw["zone"]),
+        types=list(raw.get("types", [])),
+        power=raw.get("power"), toughness=raw.get("toughness"), loyalty=raw.get("loyalty"),
+        tapped=bool(raw.get("tapped", False)), summoning_sick=bool(raw.get("summoning_sick", True)),
+        entered_turn=int(raw.get("entered_turn", 0)), counters=dict(raw.get("counters", {})),
+        attached_to=raw.get("attached_to"), static_order=int(raw.get("static_order", 0)),
+        effect_timestamp=int(raw.get("effect_timestamp", raw.get("static_order", 0))),
+        instance_order=int(raw.get("instance_order", 0)),
+        selected_face_index=raw.get("selected_face_index"),
+        chosen_creature_type=raw.get("chosen_creature_type"),
+        definition=definition,
+        **overrides,
+    )
+
+
 def serialize_match(state: MatchState) -> dict:
     step_order = [x.value for x in TURN_STEPS]
 
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import random
 import re
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
+
+from game_state.caches import set_private_cache
+from game_state.match_log import MatchLog
+from game_state.state_hash import HASHED_CARD_FIELDS
+from game_state.telemetry import MatchTelemetry
+from game_state.zone_list import ZoneList
 
 
 class Zone(str, Enum):
@@ -47,35 +56,248 @@ TURN_STEPS: list[Step] = [
 ]
 
 
-@dataclass
+# Card fields read by the continuous-effect layers. Writing any of them bumps
+# the card's match layer version so memoized effective P/T and keywords are
+# recomputed.
+_LAYER_FIELDS = frozenset(
+    {
+        "zone",
+        "controller",
+        "types",
+        "type_line",
+        "oracle_text",
+        "power",
+        "toughness",
+        "keywords",
+        "static_order",
+        "effect_timestamp",
+        "entered_turn",
+        "selected_face_index",
+        "chosen_creature_type",
+    }
+)
+
+
+class LayerVersion:
+    """Per-match counters bumped by writes to that match's own cards.
+
+    ``layer`` moves on any continuous-effect input; ``oracle`` only on Oracle
+    text changes, which is all the per-event trigger index cares about. Cards
+    point at their match's counters once ``layer_version`` has seen them.
+    """
+
+    __slots__ = ("layer", "oracle", "card_count")
+
+    def __init__(self) -> None:
+        self.layer = 0
+        self.oracle = 0
+        self.card_count = 0
+
+
+def layer_version(state) -> LayerVersion:
+    """Return the layer version of ``state``, attaching cards added since the last call."""
+    version = state.__dict__.get("_layer_version")
+    if version is None or version.card_count > len(state.cards):
+        version = LayerVersion()
+        set_private_cache(state, "_layer_version", version)
+    if version.card_count < len(state.cards):
+        # Cards are only ever added (tokens), so new ones are at the end.
+        for card in list(islice(state.cards.values(), version.card_count, None)):
+            set_private_cache(card, "_layer_version", version)
+        version.card_count = len(state.cards)
+        version.layer += 1
+        version.oracle += 1
+    return version
+
+
+@dataclass(frozen=True, slots=True)
+class CardDefinition:
+    """Printed card data shared by every instance built from the same entry.
+
+    Definitions are interned, so a deck's four copies of a card (and every
+    forked branch) point at one object. Treat the contents as read-only.
+    """
+
+    name: str
+    mana_cost: str = ""
+    oracle_text: str = ""
+    type_line: str = ""
+    image_uri: str | None = None
+    card_faces: tuple[dict, ...] = ()
+    keywords: tuple[str, ...] = ()
+
+    def __copy__(self) -> CardDefinition:
+        return self
+
+    def __deepcopy__(self, memo) -> CardDefinition:
+        return self
+
+
+_DEFINITIONS: dict[tuple, CardDefinition] = {}
+
+
+def intern_card_definition(
+    name: str,
+    mana_cost: str = "",
+    oracle_text: str = "",
+    type_line: str = "",
+    image_uri: str | None = None,
+    card_faces=(),
+    keywords=(),
+) -> CardDefinition:
+    faces = tuple(card_faces or ())
+    kws = tuple(keywords or ())
+    key = (name, mana_cost, oracle_text, type_line, image_uri, repr(faces), kws)
+    definition = _DEFINITIONS.get(key)
+    if definition is None:
+        definition = CardDefinition(name, mana_cost, oracle_text, type_line, image_uri, faces, kws)
+        _DEFINITIONS[key] = definition
+    return definition
+
+
+# Card data read from the shared definition. Instances keep these as plain
+# attributes pointing at the definition's objects, so reads stay ordinary
+# attribute lookups; a transform or face selection simply rebinds them.
+_DEFINITION_FIELDS = ("mana_cost", "oracle_text", "type_line", "image_uri", "card_faces", "keywords")
+_UNSET = object()
+
+
+@dataclass(init=False)
 class CardInstance:
     id: str
     name: str
     owner: int
     controller: int
     zone: Zone
-    types: list[str] = field(default_factory=list)
-    mana_cost: str = ""
-    power: int | None = None
-    toughness: int | None = None
-    loyalty: int | None = None
-    tapped: bool = False
-    summoning_sick: bool = True
-    entered_turn: int = 0
-    counters: dict[str, int] = field(default_factory=dict)
-    keywords: list[str] = field(default_factory=list)
-    oracle_text: str = ""
-    type_line: str = ""
-    image_uri: str | None = None
-    attached_to: str | None = None
-    static_order: int = 0
+    types: list[str]
+    mana_cost: str
+    power: int | None
+    toughness: int | None
+    loyalty: int | None
+    tapped: bool
+    summoning_sick: bool
+    entered_turn: int
+    counters: dict[str, int]
+    keywords: tuple[str, ...] | list[str]
+    oracle_text: str
+    type_line: str
+    image_uri: str | None
+    attached_to: str | None
+    static_order: int
     # Monotonic timestamp for continuous/replacement effects. static_order is
     # retained as a compatibility alias for older snapshots and tests.
-    effect_timestamp: int = 0
-    instance_order: int = 0
-    card_faces: list[dict] = field(default_factory=list)
-    selected_face_index: int | None = None
-    chosen_creature_type: str | None = None
+    effect_timestamp: int
+    instance_order: int
+    card_faces: tuple[dict, ...] | list[dict]
+    selected_face_index: int | None
+    chosen_creature_type: str | None
+    definition: CardDefinition
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        owner: int,
+        controller: int,
+        zone: Zone,
+        types: list[str] | None = None,
+        mana_cost=_UNSET,
+        power: int | None = None,
+        toughness: int | None = None,
+        loyalty: int | None = None,
+        tapped: bool = False,
+        summoning_sick: bool = True,
+        entered_turn: int = 0,
+        counters: dict[str, int] | None = None,
+        keywords=_UNSET,
+        oracle_text=_UNSET,
+        type_line=_UNSET,
+        image_uri=_UNSET,
+        attached_to: str | None = None,
+        static_order: int = 0,
+        effect_timestamp: int = 0,
+        instance_order: int = 0,
+        card_faces=_UNSET,
+        selected_face_index: int | None = None,
+        chosen_creature_type: str | None = None,
+        *,
+        definition: CardDefinition | None = None,
+    ) -> None:
+        data = {
+            "mana_cost": mana_cost,
+            "oracle_text": oracle_text,
+            "type_line": type_line,
+            "image_uri": image_uri,
+            "card_faces": card_faces,
+            "keywords": keywords,
+        }
+        if definition is None:
+            definition = intern_card_definition(
+                name, **{key: value for key, value in data.items() if value is not _UNSET}
+            )
+            data = {}
+        self.definition = definition
+        for key in _DEFINITION_FIELDS:
+            value = data.get(key, _UNSET)
+            setattr(self, key, getattr(definition, key) if value is _UNSET else value)
+        self.id = id
+        self.name = name
+        self.owner = owner
+        self.controller = controller
+        self.zone = zone
+        self.types = types if types is not None else []
+        self.power = power
+        self.toughness = toughness
+        self.loyalty = loyalty
+        self.tapped = tapped
+        self.summoning_sick = summoning_sick
+        self.entered_turn = entered_turn
+        self.counters = counters if counters is not None else {}
+        self.attached_to = attached_to
+        self.static_order = static_order
+        self.effect_timestamp = effect_timestamp
+        self.instance_order = instance_order
+        self.selected_face_index = selected_face_index
+        self.chosen_creature_type = chosen_creature_type
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in _LAYER_FIELDS:
+            version = self.__dict__.get("_layer_version")
+            if version is not None:
+                version.layer += 1
+                if name == "oracle_text":
+                    version.oracle += 1
+        if name in HASHED_CARD_FIELDS:
+            tracker = self.__dict__.get("_state_hash")
+            if tracker is not None:
+                tracker.card_changed(self.id, name, self.__dict__.get(name), value)
+        object.__setattr__(self, name, value)
+
+    def overrides(self) -> dict:
+        """Return card data fields that differ from the shared definition."""
+        definition = self.definition
+        out = {}
+        for key in _DEFINITION_FIELDS:
+            value = getattr(self, key)
+            default = getattr(definition, key)
+            if value is default:
+                continue
+            if key in {"card_faces", "keywords"} and tuple(value) == default:
+                continue
+            if value != default:
+                out[key] = value
+        return out
+
+    def clone(self) -> CardInstance:
+        """Copy per-instance state; the definition and card data stay shared."""
+        clone = object.__new__(CardInstance)
+        clone.__dict__.update(self.__dict__)
+        # The branch tracks its own position hash and layer version.
+        clone.__dict__.pop("_state_hash", None)
+        clone.__dict__.pop("_layer_version", None)
+        clone.types = list(self.types)
+        clone.counters = dict(self.counters)
+        return clone
 
 
 @dataclass
@@ -88,17 +310,31 @@ class StackItem:
     payload: dict
     targets: list[str] = field(default_factory=list)
 
+    def clone(self) -> StackItem:
+        return StackItem(
+            id=self.id,
+            source_card_id=self.source_card_id,
+            controller=self.controller,
+            label=self.label,
+            effect_key=self.effect_key,
+            payload=copy.deepcopy(self.payload),
+            targets=list(self.targets),
+        )
+
+
+_ZONE_FIELDS = frozenset({"library", "hand", "battlefield", "graveyard", "exile"})
+
 
 @dataclass
 class PlayerState:
     id: int
     name: str
     life: int = 20
-    library: list[str] = field(default_factory=list)
-    hand: list[str] = field(default_factory=list)
-    battlefield: list[str] = field(default_factory=list)
-    graveyard: list[str] = field(default_factory=list)
-    exile: list[str] = field(default_factory=list)
+    library: list[str] = field(default_factory=ZoneList)
+    hand: list[str] = field(default_factory=ZoneList)
+    battlefield: list[str] = field(default_factory=ZoneList)
+    graveyard: list[str] = field(default_factory=ZoneList)
+    exile: list[str] = field(default_factory=ZoneList)
     exile_play_until: dict[str, int] = field(default_factory=dict)
     mana_pool: dict[str, int] = field(default_factory=lambda: {"W": 0, "U": 0, "B": 0, "R": 0, "G": 0, "C": 0})
     prevent_damage_shield: int = 0
@@ -107,6 +343,24 @@ class PlayerState:
     last_land_play_turn: int = 0
     land_plays_recorded_on_turn: int = 0
 
+    def __setattr__(self, name: str, value) -> None:
+        # Zones assigned as plain lists (rebuilt libraries, snapshots) get indexed.
+        if name in _ZONE_FIELDS and type(value) is list:
+            value = ZoneList(value)
+        object.__setattr__(self, name, value)
+
+    def clone(self) -> PlayerState:
+        clone = object.__new__(PlayerState)
+        clone.__dict__.update(self.__dict__)
+        clone.library = ZoneList(self.library)
+        clone.hand = ZoneList(self.hand)
+        clone.battlefield = ZoneList(self.battlefield)
+        clone.graveyard = ZoneList(self.graveyard)
+        clone.exile = ZoneList(self.exile)
+        clone.exile_play_until = dict(self.exile_play_until)
+        clone.mana_pool = dict(self.mana_pool)
+        return clone
+
 
 @dataclass
 class MatchState:
@@ -139,9 +393,13 @@ class MatchState:
             2: {Step.UPKEEP, Step.BEGIN_COMBAT, Step.DECLARE_BLOCKERS, Step.END_STEP},
         }
     )
-    log: list[str] = field(default_factory=list)
+    log: MatchLog = field(default_factory=MatchLog)
+    # Engine-side anomaly counters. Not part of snapshots; branches get a
+    # disabled instance so simulated failures are not counted.
+    telemetry: MatchTelemetry = field(default_factory=MatchTelemetry)
     next_static_order: int = 1
     next_effect_timestamp: int = 1
+    next_object_id: int = 1
     # Day/night is a game-wide state. Keep the previous turn's spell count so
     # the upkeep transition is deterministic and survives snapshot restore.
     day_night: str = "none"
@@ -163,6 +421,48 @@ class MatchState:
     trigger_order_choice_players: set[int] = field(default_factory=set)
     pending_trigger_order: dict | None = None
 
+    def fork(self, with_log: bool = False) -> MatchState:
+        """Return an independent branch of this state for lookahead.
+
+        Only structures the rules engine mutates are copied: zone lists, card
+        instance state, the stack and the small per-turn bookkeeping fields.
+        Card data such as Oracle text and faces is shared with the parent. The
+        branch gets a disabled log unless ``with_log`` is set, since
+        simulations never read history.
+        """
+        branch = object.__new__(MatchState)
+        for name, value in self.__dict__.items():
+            if name.startswith("_"):
+                # Private attributes are derived caches; the branch rebuilds them.
+                continue
+            if name in _FORK_SHARED_FIELDS or not isinstance(value, (list, dict, set)):
+                branch.__dict__[name] = value
+            else:
+                branch.__dict__[name] = copy.deepcopy(value)
+        branch.players = {pid: player.clone() for pid, player in self.players.items()}
+        branch.cards = {cid: card.clone() for cid, card in self.cards.items()}
+        tracker = self.__dict__.get("_state_hash")
+        if tracker is not None and tracker.card_count == len(self.cards):
+            # The position hash is the one cache worth carrying over: the
+            # search hashes every branch, and the cards are identical here.
+            tracker = tracker.copy()
+            set_private_cache(branch, "_state_hash", tracker)
+            for card in branch.cards.values():
+                set_private_cache(card, "_state_hash", tracker)
+        branch.stack = [item.clone() if isinstance(item, StackItem) else copy.copy(item) for item in self.stack]
+        if isinstance(self.rng, random.Random):
+            branch.rng = random.Random()
+            branch.rng.setstate(self.rng.getstate())
+        if with_log:
+            branch.log = self.log.copy() if isinstance(self.log, MatchLog) else MatchLog(self.log)
+        else:
+            branch.log = MatchLog(enabled=False)
+        branch.telemetry = MatchTelemetry(enabled=False)
+        return branch
+
+
+_FORK_SHARED_FIELDS = frozenset({"players", "cards", "stack", "rng", "log", "telemetry"})
+
 
 class MatchFactory:
     @staticmethod
@@ -179,12 +479,23 @@ class MatchFactory:
         rng = random.Random(seed) if seed is not None else random
         for owner, deck, player in [(1, deck_a, p1), (2, deck_b, p2)]:
             expanded = []
+            definitions: dict[int, CardDefinition] = {}
             for item in deck:
+                definitions[id(item)] = intern_card_definition(
+                    item["card_name"],
+                    mana_cost=item.get("mana_cost", ""),
+                    oracle_text=item.get("oracle_text", "") or "",
+                    type_line=item.get("type_line", ""),
+                    image_uri=item.get("image_uri"),
+                    card_faces=item.get("card_faces") or (),
+                    keywords=_infer_keywords(item.get("oracle_text", "") or ""),
+                )
                 for _ in range(item["quantity"]):
                     expanded.append(item)
             rng.shuffle(expanded)
             for copy_index, raw_item in enumerate(expanded, start=1):
                 card_name = raw_item["card_name"]
+                definition = definitions[id(raw_item)]
                 cid = f"p{owner}-{copy_index:03d}"
                 type_line = raw_item.get("type_line", "")
                 # Scryfall combines double-faced type lines with `//`. Until
@@ -203,23 +514,19 @@ class MatchFactory:
                     controller=owner,
                     zone=Zone.LIBRARY,
                     types=types,
-                    mana_cost=raw_item.get("mana_cost", ""),
                     power=_infer_power(card_name, raw_item.get("power"), types),
                     toughness=_infer_toughness(card_name, raw_item.get("toughness"), types),
                     loyalty=_infer_loyalty(card_name, raw_item.get("loyalty"), types),
                     summoning_sick="Creature" in types,
-                    keywords=_infer_keywords(raw_item.get("oracle_text", "") or ""),
-                    oracle_text=raw_item.get("oracle_text", "") or "",
-                    type_line=type_line,
-                    image_uri=raw_item.get("image_uri"),
-                    card_faces=list(raw_item.get("card_faces") or []),
                     selected_face_index=raw_item.get("selected_face_index"),
                     instance_order=copy_index,
+                    definition=definition,
                 )
                 cards[cid] = card
                 player.library.append(cid)
 
-        match = MatchState(id=str(uuid.uuid4()), players={1: p1, 2: p2}, cards=cards, stack=[])
+        match_id = _seeded_match_id(seed) if seed is not None else str(uuid.uuid4())
+        match = MatchState(id=match_id, players={1: p1, 2: p2}, cards=cards, stack=[])
         match.rng = rng if seed is not None else random.Random()
         for pid in [1, 2]:
             for _ in range(7):
@@ -244,6 +551,17 @@ def draw_card(state: MatchState, player_id: int, count: int = 1) -> None:
         emit_event(state, "draw_card", {"player_id": player_id, "card_id": cid})
 
 
+def allocate_object_id(state: MatchState, prefix: str) -> str:
+    """Return the next match-local object id, e.g. ``stack-0003``."""
+    number = int(getattr(state, "next_object_id", 1) or 1)
+    state.next_object_id = number + 1
+    return f"{prefix}-{number:04d}"
+
+
+def _seeded_match_id(seed: int) -> str:
+    return "match-" + hashlib.sha256(f"match:{seed}".encode("utf-8")).hexdigest()[:16]
+
+
 def assign_static_order_on_battlefield_entry(state: MatchState, card_id: str) -> None:
     card = state.cards.get(card_id)
     if not card:
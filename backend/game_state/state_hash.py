@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from itertools import islice
+from typing import Any
+
+from game_state.caches import set_private_cache
+
+# Card fields folded into the position hash. Writes to these on a tracked card
+# update the hash in place (see CardInstance.__setattr__).
+HASHED_CARD_FIELDS = frozenset(
+    {
+        "name",
+        "zone",
+        "controller",
+        "types",
+        "mana_cost",
+        "oracle_text",
+        "type_line",
+        "keywords",
+        "tapped",
+        "summoning_sick",
+        "entered_turn",
+        "attached_to",
+        "power",
+        "toughness",
+        "loyalty",
+        "static_order",
+        "effect_timestamp",
+        "selected_face_index",
+        "chosen_creature_type",
+    }
+)
+
+
+def zobrist_key(*parts: Any) -> int:
+    """Return a stable 64-bit key for one position feature."""
+    # Cache on the text that is hashed: equal values with different reprs
+    # (a str Enum and its value, False and 0) must not share an entry.
+    return _digest(repr(parts))
+
+
+@lru_cache(maxsize=1 << 16)
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class StateHash:
+    """Running XOR of card features for one match, kept current by card writes."""
+
+    __slots__ = ("cards_value", "card_count")
+
+    def __init__(self) -> None:
+        self.cards_value = 0
+        self.card_count = 0
+
+    def card_changed(self, card_id: str, name: str, old: Any, new: Any) -> None:
+        if old is not new:
+            self.cards_value ^= zobrist_key(card_id, name, _canonical(old)) ^ zobrist_key(card_id, name, _canonical(new))
+
+    def copy(self) -> StateHash:
+        clone = StateHash()
+        clone.cards_value = self.cards_value
+        clone.card_count = self.card_count
+        return clone
+
+    def track(self, card) -> None:
+        set_private_cache(card, "_state_hash", self)
+        self.cards_value ^= _card_features(card)
+        self.card_count += 1
+
+
+def state_hash(state, verify: bool = False) -> int:
+    """Return the 64-bit position hash of ``state``.
+
+    Card characteristics (``HASHED_CARD_FIELDS``) are maintained
+    incrementally; turn structure, priority, combat assignments, pregame and
+    pending choices, per-turn and per-player bookkeeping, the stack and
+    counters on battlefield and exiled cards are cheap and folded in here.
+    Library order is not part of the position. ``verify`` recomputes the hash
+    from scratch and raises ``AssertionError`` on a mismatch.
+    """
+    tracker = state.__dict__.get("_state_hash")
+    if tracker is None or tracker.card_count > len(state.cards):
+        tracker = StateHash()
+        set_private_cache(state, "_state_hash", tracker)
+    if tracker.card_count < len(state.cards):
+        # Cards are only ever added (tokens), so new ones are at the end.
+        for card in list(islice(state.cards.values(), tracker.card_count, None)):
+            tracker.track(card)
+    value = tracker.cards_value ^ _position_features(state)
+    if verify:
+        expected = compute_state_hash(state)
+        if value != expected:
+            raise AssertionError(f"Incremental state hash {value:016x} != recomputed {expected:016x}")
+    return value
+
+
+def compute_state_hash(state) -> int:
+    """Recompute the position hash from scratch, without touching the tracker."""
+    value = 0
+    for card in state.cards.values():
+        value ^= _card_features(card)
+    return value ^ _position_features(state)
+
+
+def _card_features(card) -> int:
+    value = 0
+    for name in HASHED_CARD_FIELDS:
+        value ^= zobrist_key(card.id, name, _canonical(card.__dict__.get(name)))
+    return value
+
+
+_OCCASIONAL_STATE_FIELDS = (
+    "replacement_choice_players",
+    "trigger_order_choice_players",
+    "pending_replacement_choice",
+    "pending_trigger_order",
+    "pending_entry_counters",
+    "trigger_once_seen_this_turn",
+    "temporary_control_changes",
+    "turn_cant_gain_life",
+    "turn_damage_cant_be_prevented",
+    "spells_cast_last_turn",
+)
+
+
+def _position_features(state) -> int:
+    value = (
+        zobrist_key("turn", state.turn)
+        ^ zobrist_key("step", state.step)
+        ^ zobrist_key("active", state.active_player)
+        ^ zobrist_key("priority", state.priority_player)
+        ^ zobrist_key("passed", tuple(sorted(state.passed_priority)))
+        ^ zobrist_key("winner", state.winner)
+        ^ zobrist_key("pregame", state.pregame_pending)
+        ^ zobrist_key("day_night", state.day_night)
+        ^ zobrist_key("spells_cast", tuple(sorted(state.spells_cast_this_turn.items())))
+        ^ zobrist_key("loyalty_used", tuple(sorted(state.loyalty_activated_this_turn)))
+        ^ zobrist_key("choice_pending", state.replacement_choice_required, state.trigger_order_choice_required)
+    )
+    if state.pregame_pending:
+        value ^= zobrist_key("mulligans", _canonical(state.kept_hands), _canonical(state.mulligan_count))
+    # Usually empty or zero, so only folded in (and canonicalized) when set.
+    for name in _OCCASIONAL_STATE_FIELDS:
+        field = getattr(state, name)
+        if field:
+            value ^= zobrist_key(name, _canonical(field))
+    if state.attackers_declared or state.attackers or state.blocks:
+        value ^= zobrist_key(
+            "combat",
+            state.attackers_declared,
+            state.blockers_declared,
+            tuple(state.attackers),
+            tuple(sorted(state.attack_targets.items())),
+            tuple(sorted((attacker, tuple(blockers)) for attacker, blockers in state.blocks.items())),
+        )
+    for pid, player in state.players.items():
+        pool = tuple(sorted((color, amount) for color, amount in player.mana_pool.items() if amount))
+        value ^= zobrist_key(
+            "player",
+            pid,
+            player.life,
+            player.lands_played_this_turn,
+            player.max_land_plays_this_turn,
+            player.last_land_play_turn,
+            player.land_plays_recorded_on_turn,
+            player.prevent_damage_shield,
+            pool,
+        )
+        if player.exile_play_until:
+            value ^= zobrist_key("exile_play_until", pid, _canonical(player.exile_play_until))
+        for zone in (player.battlefield, player.exile):
+            for cid in zone:
+                card = state.cards.get(cid)
+                if card is None:
+                    continue
+                for counter, amount in card.counters.items():
+                    if amount:
+                        value ^= zobrist_key(cid, "counter", counter, amount)
+    for index, item in enumerate(state.stack):
+        value ^= zobrist_key(
+            "stack",
+            index,
+            item.source_card_id,
+            item.controller,
+            item.effect_key,
+            item.label,
+            tuple(item.targets or ()),
+            _canonical(item.payload),
+        )
+    return value
+
+
+def _canonical(value: Any) -> Any:
+    """Hashable, order-independent form of a field value for ``zobrist_key``."""
+    if isinstance(value, dict):
+        return tuple(sorted(((_canonical(k), _canonical(v)) for k, v in value.items()), key=repr))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_canonical(v) for v in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    return value
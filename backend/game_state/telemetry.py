@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+
+class MatchTelemetry:
+    """Anomaly counters the rules engine increments where a failure happens.
+
+    Counter names match the ``anomalies`` block of batch reports, so runs can
+    read them directly instead of scanning the log afterwards. Streak-based
+    counters (stalls, X-value loops, repeated errors) are tracked online:
+    a stall is four priority passes in a row at the same turn, step and
+    stack depth.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.counts: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.oracle_fallback_cards: Counter = Counter()
+        self._pass_point: tuple | None = None
+        self._pass_streak = 0
+        self._x_error_streak = 0
+        self._last_error: str | None = None
+        self._error_streak = 1
+
+    def record_pass(self, point: tuple) -> None:
+        if not self.enabled:
+            return
+        self._x_error_streak = 0
+        if point != self._pass_point:
+            self._pass_point = point
+            self._pass_streak = 0
+        self._pass_streak += 1
+        if self._pass_streak >= 4:
+            self.counts["stall_pass_streaks"] += 1
+            self._pass_streak = 0
+
+    def record_action(self) -> None:
+        """Note a non-pass action, which breaks a priority-pass streak."""
+        if not self.enabled:
+            return
+        self._pass_point = None
+        self._pass_streak = 0
+
+    def record_anomaly(self, counter: str, error: str, x_value_error: bool = False, card_name: str | None = None) -> None:
+        if not self.enabled:
+            return
+        self.counts[counter] += 1
+        if counter == "oracle_fallbacks" and card_name:
+            self.oracle_fallback_cards[card_name] += 1
+        if x_value_error:
+            self._x_error_streak += 1
+            if self._x_error_streak >= 2:
+                self.counts["x_spell_error_loops"] += 1
+                self._x_error_streak = 0
+        else:
+            self._x_error_streak = 0
+        error = error.strip()
+        self.errors[error] += 1
+        if error == self._last_error:
+            self._error_streak += 1
+            if self._error_streak >= 3:
+                self.counts["repeated_error_bursts"] += 1
+                self._error_streak = 1
+        else:
+            self._last_error = error
+            self._error_streak = 1
+
+    def copy(self) -> MatchTelemetry:
+        clone = MatchTelemetry(enabled=self.enabled)
+        clone.__dict__.update(self.__dict__)
+        clone.counts = Counter(self.counts)
+        clone.errors = Counter(self.errors)
+        clone.oracle_fallback_cards = Counter(self.oracle_fallback_cards)
+        return clone
+
+
+def record_anomaly(state: Any, counter: str, error: str, x_value_error: bool = False, card_name: str | None = None) -> None:
+    """Increment ``counter`` on the state's telemetry, if it has one."""
+    telemetry = getattr(state, "telemetry", None)
+    if telemetry is not None:
+        telemetry.record_anomaly(counter, error, x_value_error=x_value_error, card_name=card_name)
+
+
+def note_priority_pass(state: Any) -> None:
+    telemetry = getattr(state, "telemetry", None)
+    if telemetry is not None:
+        telemetry.record_pass((state.turn, state.step, len(state.stack)))
+
+
+def note_action(state: Any) -> None:
+    telemetry = getattr(state, "telemetry", None)
+    if telemetry is not None:
+        telemetry.record_action()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+class ZoneList(list):
+    """Ordered card-id zone with indexed membership and position lookup.
+
+    Behaves like the plain ``list[str]`` zones it replaces (order, slicing,
+    equality, JSON), but keeps a lazily built ``id -> position`` index so
+    ``in``, ``index`` and ``remove`` skip the linear equality scan. Appends
+    and pops from the top keep the index current; any other mutation drops
+    it until the next lookup.
+
+    A zone can carry one ``watcher`` (see ``watch``) that is told about ids
+    entering and leaving; mutations that reorder the zone ``reset`` it
+    instead. Copies are never watched.
+    """
+
+    __slots__ = ("_positions", "_watcher")
+
+    def __init__(self, iterable: Iterable[str] = ()) -> None:
+        super().__init__(iterable)
+        self._positions: dict[str, int] | None = None
+        self._watcher = None
+
+    def watch(self, watcher) -> None:
+        """Report changes to ``watcher.entered(id)``, ``.left(id)`` and ``.reset()``."""
+        self._watcher = watcher
+
+    @property
+    def watcher(self):
+        return self._watcher
+
+    def __reduce__(self):
+        return (ZoneList, (list(self),))
+
+    def _index(self) -> dict[str, int]:
+        positions = self._positions
+        if positions is None:
+            # Reversed so the first occurrence of a duplicate id wins.
+            positions = dict(zip(reversed(self), range(len(self) - 1, -1, -1)))
+            self._positions = positions
+        return positions
+
+    def __contains__(self, card_id: object) -> bool:
+        return card_id in self._index()
+
+    def index(self, card_id, *args) -> int:
+        if args:
+            return super().index(card_id, *args)
+        position = self._index().get(card_id)
+        if position is None:
+            raise ValueError(f"{card_id!r} is not in zone")
+        return position
+
+    def remove(self, card_id) -> None:
+        super().__delitem__(self.index(card_id))
+        self._positions = None
+        if self._watcher is not None:
+            self._watcher.left(card_id)
+
+    def append(self, card_id) -> None:
+        super().append(card_id)
+        if self._positions is not None:
+            self._positions.setdefault(card_id, len(self) - 1)
+        if self._watcher is not None:
+            self._watcher.entered(card_id)
+
+    def extend(self, card_ids: Iterable[str]) -> None:
+        start = len(self)
+        super().extend(card_ids)
+        if self._positions is not None:
+            for position in range(start, len(self)):
+                self._positions.setdefault(self[position], position)
+        if self._watcher is not None:
+            for position in range(start, len(self)):
+                self._watcher.entered(self[position])
+
+    def __iadd__(self, card_ids: Iterable[str]) -> ZoneList:
+        self.extend(card_ids)
+        return self
+
+    def pop(self, position: int = -1):
+        card_id = super().pop(position)
+        positions = self._positions
+        if positions is not None:
+            if position == -1 and positions.get(card_id) == len(self):
+                del positions[card_id]
+            else:
+                self._positions = None
+        if self._watcher is not None:
+            self._watcher.left(card_id)
+        return card_id
+
+    def insert(self, position: int, card_id) -> None:
+        super().insert(position, card_id)
+        self._positions = None
+        self._reset_watcher()
+
+    def clear(self) -> None:
+        super().clear()
+        self._positions = None
+        self._reset_watcher()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._positions = None
+        self._reset_watcher()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._positions = None
+        self._reset_watcher()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._positions = None
+        self._reset_watcher()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._positions = None
+        self._reset_watcher()
+
+    def __imul__(self, count: int) -> ZoneList:
+        super().__imul__(count)
+        self._positions = None
+        self._reset_watcher()
+        return self
+
+    def copy(self) -> ZoneList:
+        return ZoneList(self)
+
+    def _reset_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.reset()
@@ -20,6 +20,7 @@ from sqlmodel import Session
 from ai.agent import AIAgent
 from ai.deck_analysis import analyze_deck, guess_archetype
 from ai.log_priors import build_priors_from_logs, load_log_priors, save_log_priors
+from ai.search_budget import interactive_think_ms
 from analytics.schemas import AIDiagnosticsRequest, BatchSimulationRequest
 from analytics.replay_tools import classify_first_divergence, first_log_divergence
 from analytics.service import AnalyticsService
@@ -34,6 +35,7 @@ from decks.sideboard import SideboardError, apply_sideboard_swaps
 from decks.service import DeckService
 from data_ingest.service import TournamentIngestService
 from game_state.serializers import deserialize_match_snapshot, serialize_match, serialize_match_snapshot
+from game_state.match_log import MatchLog
 from game_state.state import MatchFactory, Step
 from persistence.db import engine, get_session, init_db
 from persistence.repository import Repository
@@ -85,6 +87,8 @@ ACTIVE_MATCHES: dict[str, MatchController] = {}
 SIM_JOBS: dict[str, dict] = {}
 SIM_JOBS_LOCK = threading.Lock()
 DIAGNOSTICS_ROOT = Path(__file__).resolve().parent / "diagnostics"
+# Live matches are re-serialized on every action, so keep only recent history.
+ACTIVE_MATCH_LOG_LIMIT = 5000
 
 
 class DeckImportRequest(BaseModel):
@@ -204,15 +208,21 @@ def _persist_active_match(repo: Repository | object, match: MatchController) ->
         Repository(session).save_active_match(match.state.id, state_json, controller_json)
 
 
+def _interactive_agent(difficulty: str, archetype: str) -> AIAgent:
+    """AI opponent for a live match: node budget plus a wall-clock cap so turns stay responsive."""
+    return AIAgent(difficulty=difficulty, archetype=archetype, think_ms=interactive_think_ms(difficulty))
+
+
 def _restore_active_matches(repo: Repository) -> None:
     for row in repo.list_active_matches():
         try:
             state = deserialize_match_snapshot(json.loads(row.state_json))
+            state.log.limit = ACTIVE_MATCH_LOG_LIMIT
             config = json.loads(row.controller_json)
             ai = {
-                int(pid): AIAgent(
-                    difficulty=str(config.get("difficulties", {}).get(str(pid), "master")),
-                    archetype=str(config.get("archetypes", {}).get(str(pid), "Midrange")),
+                int(pid): _interactive_agent(
+                    str(config.get("difficulties", {}).get(str(pid), "master")),
+                    str(config.get("archetypes", {}).get(str(pid), "Midrange")),
                 )
                 for pid in (1, 2)
             }
@@ -494,6 +504,10 @@ def start_match(payload: StartMatchRequest, repo: Repository = Depends(get_repo)
     deck_a = _hydrate_deck_cards(repo, payload.deck_a)
     deck_b = _hydrate_deck_cards(repo, payload.deck_b)
     state = MatchFactory.from_decks(deck_a, deck_b, seed=payload.seed)
+    if state.id in ACTIVE_MATCHES:
+        # Seeded ids repeat by design; keep concurrent replays of one seed apart.
+        state.id = f"{state.id}-{uuid.uuid4().hex[:8]}"
+    state.log.limit = ACTIVE_MATCH_LOG_LIMIT
     state.best_of = payload.best_of
     state.replacement_choice_required = (
         payload.controller_a == "human" or payload.controller_b == "human"
@@ -505,8 +519,8 @@ def start_match(payload: StartMatchRequest, repo: Repository = Depends(get_repo)
     state.trigger_order_choice_required = state.replacement_choice_required
     state.trigger_order_choice_players = set(state.replacement_choice_players)
     rules = RulesEngine()
-    a_ai = AIAgent(difficulty=payload.ai_difficulty, archetype=guess_archetype(payload.deck_a))
-    b_ai = AIAgent(difficulty=payload.ai_difficulty, archetype=guess_archetype(payload.deck_b))
+    a_ai = _interactive_agent(payload.ai_difficulty, guess_archetype(payload.deck_a))
+    b_ai = _interactive_agent(payload.ai_difficulty, guess_archetype(payload.deck_b))
     controller = MatchController(
         state=state,
         rules=rules,
@@ -541,13 +555,14 @@ def get_match_replay(match_id: str) -> dict:
         raise HTTPException(status_code=404, detail="Match not found")
     entries: list[dict] = []
     current_turn = 1
+    offset = getattr(match.state.log, "dropped", 0)
     for idx, line in enumerate(match.state.log):
         if line.startswith("Turn ") and line.endswith("."):
             try:
                 current_turn = int(line.split()[1].strip("."))
             except Exception:
                 pass
-        entries.append({"index": idx, "turn": current_turn, "line": line})
+        entries.append({"index": offset + idx, "turn": current_turn, "line": line})
     log_hash = hashlib.sha256("\n".join(entries_entry["line"] for entries_entry in entries).encode("utf-8")).hexdigest()
     return {
         "match_id": match_id,
@@ -728,6 +743,7 @@ def simulate_batch(payload: BatchSimulationRequest, repo: Repository = Depends(g
         payload.matches,
         payload.difficulty,
         max_ticks=payload.max_ticks,
+        workers=payload.workers,
     )
 
 
@@ -771,6 +787,7 @@ def simulate_batch_start(payload: BatchSimulationRequest, repo: Repository = Dep
                     payload.difficulty,
                     max_ticks=payload.max_ticks,
                     progress_callback=_progress,
+                    workers=payload.workers,
                 )
             with SIM_JOBS_LOCK:
                 if job_id in SIM_JOBS:
@@ -1041,7 +1058,7 @@ def compare_diagnostic_runs(left: str, right: str) -> dict:
 
 @app.get("/diagnostics/compare/replay")
 def compare_diagnostic_replay(left: str, right: str, left_game: int = 0, right_game: int = 0) -> dict:
-    """Return the first normalized line divergence for two bounded persisted games."""
+    """Return the first line divergence for two bounded persisted games."""
     left_item = _read_diagnostic_game(left, int(left_game))
     right_item = _read_diagnostic_game(right, int(right_game))
     drift = first_log_divergence(left_item["log"], right_item["log"])
@@ -1238,7 +1255,9 @@ def _start_next_game_state(match: MatchController) -> None:
     new_state.active_player = 1 if match.game_number % 2 == 1 else 2
     new_state.priority_player = new_state.active_player
     transition = f"--- Starting game {match.game_number + 1} ---"
-    new_state.log = prior_log_tail + [transition] + new_state.log
+    new_state.log = MatchLog(
+        [*prior_log_tail, transition, *new_state.log.entries()], limit=ACTIVE_MATCH_LOG_LIMIT
+    )
     match.state = new_state
     match.game_number += 1
     match.current_game_recorded = False
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+PT_STATIC_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+get\s+([+-]\d+)\/([+-]\d+)"
+)
+PT_SET_RE = re.compile(
+    r"\b(?:base power and toughness\s+(\d+)\/(\d+)|(?:are|become|becomes|is)\s+(\d+)\/(\d+)|set(?:s)?(?:\s+their)?\s+base power and toughness\s+(\d+)\/(\d+))\b"
+)
+PT_SET_SCOPE_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+"
+    r"(?:base power and toughness\s+(\d+)\/(\d+)|(?:are|become|becomes|is)\s+(\d+)\/(\d+)|"
+    r"set(?:s)?(?:\s+their)?\s+base power and toughness\s+(\d+)\/(\d+))\b"
+)
+SELF_SCALE_GRAVE_RE = re.compile(
+    r"\bgets\s+([+-]\d+)\/([+-]\d+)\s+for each\s+([a-z\s]+?)\s+card[s]?\s+in\s+(your|all)\s+graveyard[s]?\b"
+)
+SELF_SCALE_BF_RE = re.compile(
+    r"\bgets\s+([+-]\d+)\/([+-]\d+)\s+for each\s+(other\s+)?([a-z\s]+?)\s+you control\b"
+)
+CARD_TYPE_COUNT_RE = re.compile(r"number of card types among cards in all graveyards", re.IGNORECASE)
+KW_STATIC_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+(?:have|has)\s+([^.]*)"
+)
+PT_AND_KW_STATIC_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+get\s+[+-]\d+\/[+-]\d+\s+and\s+(?:have|has)\s+([^.]*)"
+)
+KW_REMOVE_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+(?:lose|loses)\s+([^.]*)"
+)
+KW_CANT_HAVE_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+can't have\s+([^.]*)"
+)
+PT_AND_KW_REMOVE_RE = re.compile(
+    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
+    r"(you control|your opponents control)\s+get\s+[+-]\d+\/[+-]\d+\s+and\s+(?:lose|loses)\s+([^.]*)"
+)
+KNOWN_KEYWORDS = [
+    "trample",
+    "first strike",
+    "double strike",
+    "haste",
+    "flash",
+    "lifelink",
+    "deathtouch",
+    "flying",
+    "reach",
+    "menace",
+    "vigilance",
+    "defender",
+    "indestructible",
+    "hexproof",
+    "shroud",
+    "shadow",
+    "fear",
+    "intimidate",
+    "islandwalk",
+    "swampwalk",
+    "mountainwalk",
+    "forestwalk",
+    "plainswalk",
+    "nonbasic landwalk",
+    "snow landwalk",
+    "desertwalk",
+    "wasteswalk",
+    "legendary landwalk",
+]
+SPELL_TAX_RE = re.compile(
+    r"(?P<scope>your opponents'|your|all)?\s*"
+    r"(?P<kind>noncreature|creature|artifact|enchantment|instant or sorcery|)\s*"
+    r"spells? cost \{(?P<amount>\d+)\} more to cast"
+)
+PLAYER_DAMAGE_PREVENTION_RE = re.compile(
+    r"if a source would deal damage to (?:you|you or (?:a|an|target) (?:permanent|creature) you control|(?:a|an|target) (?:permanent|creature) you control), prevent 1 of that damage"
+)
+PERMANENT_DAMAGE_PREVENTION_RE = re.compile(
+    r"if a source would deal damage to (?:you or (?:a|an|target) (?:permanent|creature) you control|(?:a|an|target) (?:permanent|creature) you control|(?:a|an|target) permanent you control|(?:a|an|target) creature you control), prevent 1 of that damage"
+)
+DIE_EXILE_RE = re.compile(
+    r"if a (?:non-token|nontoken|another )?(?:creature|permanent|artifact|enchantment|artifact or enchantment) you control would die, exile it instead"
+    r"|if an? artifact or enchantment you control would die, exile it instead"
+)
+
+# Cheap phrase gates per emitted event. A card whose Oracle text contains none
+# of an event's phrases can never match that event's trigger matcher, so the
+# trigger scan skips it. The gates are deliberately broader than the matchers.
+_TRIGGER_EVENT_PHRASES: dict[str, tuple[str, ...]] = {
+    "draw_card": ("whenever you draw a card", "whenever an opponent draws a card"),
+    "life_gain": ("whenever you gain life",),
+    "creature_dies": ("die",),
+    "permanent_dies": ("die",),
+    "leaves_battlefield": ("leave",),
+    "day_night_changed": ("becomes day", "becomes night"),
+    "enters_battlefield": ("enters", "landfall"),
+    "sacrifice": ("sacrifice",),
+    "discard": ("discard",),
+    "cycle": ("cycle",),
+    "combat_damage_dealt": ("combat damage",),
+    "attack_declared": ("attack",),
+    "block_declared": ("block",),
+    "spell_cast": (
+        "whenever you cast",
+        "prowess",
+        "magecraft",
+        "gets +1/+1 until end of turn",
+    ),
+    "spell_copy": (
+        "whenever you cast",
+        "prowess",
+        "magecraft",
+        "gets +1/+1 until end of turn",
+    ),
+    "begin_step": ("at the beginning",),
+}
+
+
+@dataclass(frozen=True)
+class CardAbilities:
+    """Parsed static abilities for one Oracle text, shared by every card that prints it."""
+
+    text: str
+    pt_modifiers: tuple[tuple[str, bool, str, int, int], ...]
+    pt_setters: tuple[tuple[str, bool, str, int, int], ...]
+    keyword_grants: tuple[tuple[str, bool, str, tuple[str, ...]], ...]
+    keyword_removals: tuple[tuple[str, bool, str, frozenset[str]], ...]
+    keyword_cant_removals: tuple[tuple[str, bool, str, frozenset[str]], ...]
+    graveyard_scaling: tuple[tuple[int, int, str, str], ...]
+    battlefield_scaling: tuple[tuple[int, int, bool, str], ...]
+    counts_graveyard_card_types: bool
+    once_each_turn: bool
+    one_or_more: bool
+    trigger_events: frozenset[str]
+    replacement_kinds: frozenset[str]
+    spell_taxes: tuple[tuple[str, str, int], ...]
+
+
+_CACHE: dict[str, CardAbilities] = {}
+
+
+def card_abilities(card) -> CardAbilities:
+    """Return the compiled abilities for a card's current Oracle text."""
+    return compile_card_abilities(getattr(card, "oracle_text", "") or "")
+
+
+def compile_card_abilities(oracle_text: str) -> CardAbilities:
+    cached = _CACHE.get(oracle_text)
+    if cached is not None:
+        return cached
+    text = oracle_text.lower()
+    abilities = CardAbilities(
+        text=text,
+        pt_modifiers=tuple(_parse_pt_modifiers(text)),
+        pt_setters=tuple(_parse_pt_setters(text)),
+        keyword_grants=tuple(_parse_keyword_grants(text)),
+        keyword_removals=tuple(_parse_keyword_removals(text)),
+        keyword_cant_removals=tuple(_parse_keyword_cant_removals(text)),
+        graveyard_scaling=tuple(
+            (int(m.group(1)), int(m.group(2)), (m.group(3) or "").strip(), (m.group(4) or "your").strip())
+            for m in SELF_SCALE_GRAVE_RE.finditer(text)
+        ),
+        battlefield_scaling=tuple(
+            (int(m.group(1)), int(m.group(2)), bool((m.group(3) or "").strip()), (m.group(4) or "").strip())
+            for m in SELF_SCALE_BF_RE.finditer(text)
+        ),
+        counts_graveyard_card_types=bool(CARD_TYPE_COUNT_RE.search(text)),
+        once_each_turn="only once each turn" in text or "this ability triggers only once each turn" in text,
+        one_or_more="one or more" in text,
+        trigger_events=frozenset(
+            event for event, phrases in _TRIGGER_EVENT_PHRASES.items() if any(phrase in text for phrase in phrases)
+        ),
+        replacement_kinds=_parse_replacement_kinds(text),
+        spell_taxes=tuple(
+            ((m.group("scope") or "").strip(), (m.group("kind") or "").strip(), int(m.group("amount")))
+            for m in SPELL_TAX_RE.finditer(text)
+        ),
+    )
+    _CACHE[oracle_text] = abilities
+    return abilities
+
+
+def known_trigger_events() -> frozenset[str]:
+    """Events whose trigger scan can be narrowed with ``trigger_events``."""
+    return frozenset(_TRIGGER_EVENT_PHRASES)
+
+
+def _parse_pt_modifiers(text: str):
+    for match in PT_STATIC_RE.finditer(text):
+        yield (match.group(3).strip(), bool(match.group(1)), match.group(2).strip(), int(match.group(4)), int(match.group(5)))
+
+
+def _parse_pt_setters(text: str):
+    scoped_matches = False
+    for match in PT_SET_SCOPE_RE.finditer(text):
+        scoped_matches = True
+        p_set, t_set = extract_pt_set_groups(match)
+        if p_set is not None and t_set is not None:
+            yield (match.group(3).strip(), bool(match.group(1)), match.group(2).strip(), p_set, t_set)
+    if not scoped_matches:
+        for match in PT_SET_RE.finditer(text):
+            p_set, t_set = extract_pt_set_groups(match)
+            if p_set is not None and t_set is not None:
+                yield ("you control", False, "creatures", p_set, t_set)
+
+
+def _parse_keyword_grants(text: str):
+    for pattern in (PT_AND_KW_STATIC_RE, KW_STATIC_RE):
+        for match in pattern.finditer(text):
+            granted_text = match.group(4).strip()
+            granted = tuple(kw for kw in KNOWN_KEYWORDS if kw in granted_text)
+            if granted:
+                yield (match.group(3).strip(), bool(match.group(1)), match.group(2).strip(), granted)
+
+
+def _parse_keyword_removals(text: str):
+    for pattern in (PT_AND_KW_REMOVE_RE, KW_REMOVE_RE):
+        for match in pattern.finditer(text):
+            scope = match.group(3).strip()
+            other_only = bool(match.group(1))
+            subject = match.group(2).strip()
+            removed_text = match.group(4).strip()
+            if "all abilities" in removed_text:
+                yield (scope, other_only, subject, frozenset({"all abilities"}))
+                continue
+            removed = frozenset(kw for kw in KNOWN_KEYWORDS if kw in removed_text)
+            if removed:
+                yield (scope, other_only, subject, removed)
+
+
+def _parse_keyword_cant_removals(text: str):
+    for match in KW_CANT_HAVE_RE.finditer(text):
+        removed_text = match.group(4).strip()
+        removed = frozenset(kw for kw in KNOWN_KEYWORDS if kw in removed_text)
+        if removed:
+            yield (match.group(3).strip(), bool(match.group(1)), match.group(2).strip(), removed)
+
+
+def _parse_replacement_kinds(text: str) -> frozenset[str]:
+    kinds: set[str] = set()
+    if PLAYER_DAMAGE_PREVENTION_RE.search(text):
+        kinds.add("prevent_player_damage")
+    if PERMANENT_DAMAGE_PREVENTION_RE.search(text):
+        kinds.add("prevent_permanent_damage")
+    if DIE_EXILE_RE.search(text) or ("would die, exile it instead" in text):
+        kinds.add("die_exile")
+    if "be prevented" in text:
+        kinds.add("damage_cant_be_prevented")
+    if "would deal noncombat damage to" in text:
+        kinds.add("noncombat_damage_to_counters")
+    if "if you would gain life, draw that many cards instead" in text:
+        kinds.add("life_gain_to_draw")
+    if "if you would draw a card, gain 1 life instead" in text:
+        kinds.add("draw_to_life_gain")
+    if "gain life" in text and ("can't" in text or "cannot" in text):
+        kinds.add("cant_gain_life")
+    if "lose life" in text and ("can't" in text or "cannot" in text):
+        kinds.add("cant_lose_life")
+    return frozenset(kinds)
+
+
+def extract_pt_set_groups(match: re.Match) -> tuple[int | None, int | None]:
+    if match.re is PT_SET_SCOPE_RE:
+        pairs = ((4, 5), (6, 7), (8, 9))
+    else:
+        pairs = ((1, 2), (3, 4), (5, 6))
+    for p_idx, t_idx in pairs:
+        p = match.group(p_idx)
+        t = match.group(t_idx)
+        if p is not None and t is not None:
+            return int(p), int(t)
+    return None, None
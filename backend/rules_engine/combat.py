@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 
+from game_state.match_log import log_enabled, log_event
 from game_state.state import MatchState, Zone
 from rules_engine.colors import card_color_names
 from rules_engine.continuous import effective_power, effective_toughness, has_keyword
@@ -19,6 +20,8 @@ from rules_engine.restrictions import (
 
 DMG_MARK_KEY = "__damage_marked"
 DEATHTOUCH_MARK_KEY = "__deathtouch_damaged"
+_DIES_LINE = "{card} dies in combat."
+_PREVENTED_LINE = "{target} prevents {amount} damage."
 
 
 def declare_attackers(state: MatchState, attacker_ids: list[str], attack_targets: dict[str, str] | None = None) -> None:
@@ -70,17 +73,18 @@ def declare_attackers(state: MatchState, attacker_ids: list[str], attack_targets
             card.tapped = True
     if len(legal) == 1 and card_cant_attack_alone(state, legal[0]):
         lone = legal[0]
-        state.log.append(f"{state.cards[lone].name} can't attack alone.")
+        log_event(state, "attack_restricted", "{card} can't attack alone.", card=state.cards[lone].name)
         legal = []
         legal_targets = {}
     state.attackers = legal
     state.attack_targets = legal_targets
     if legal:
-        names = ", ".join(
-            f"{state.cards[c].name} -> {_defender_label(state, state.attack_targets.get(c, f'player:{defender}'))}"
-            for c in legal
-        )
-        state.log.append(f"Attackers declared: {names}")
+        if log_enabled(state):
+            names = ", ".join(
+                f"{state.cards[c].name} -> {_defender_label(state, state.attack_targets.get(c, f'player:{defender}'))}"
+                for c in legal
+            )
+            log_event(state, "attackers_declared", "Attackers declared: {attackers}", attackers=names)
         for cid in legal:
             emit_event(
                 state,
@@ -331,8 +335,9 @@ def _remove_dead_creatures(state: MatchState) -> None:
                 }
                 state.priority_player = card.controller
                 state.passed_priority = set()
-                state.log.append(
-                    f"Replacement choice required for combat death; {state.players[card.controller].name} must choose one of {len(options)} effects."
+                log_event(
+                    state, "replacement_choice", "Replacement choice required for {event}; {player} must choose one of {count} effects.",
+                    event="combat death", player=state.players[card.controller].name, count=len(options),
                 )
                 return
             emit_event(state, "leaves_battlefield", {"card_id": cid, "controller": card.controller})
@@ -341,11 +346,11 @@ def _remove_dead_creatures(state: MatchState) -> None:
             if destination == "exile":
                 zone_owner.exile.append(cid)
                 card.zone = Zone.EXILE
-                state.log.append(f"{card.name} is exiled instead of dying.")
+                log_event(state, "combat_exiled", "{card} is exiled instead of dying.", card=card.name)
                 continue
             zone_owner.graveyard.append(cid)
             card.zone = Zone.GRAVEYARD
-            state.log.append(f"{card.name} dies in combat.")
+            log_event(state, "combat_dies", _DIES_LINE, card=card.name)
             emit_event(state, "permanent_dies", {"card_id": cid, "controller": card.controller})
             emit_event(state, "creature_dies", {"card_id": cid, "controller": card.controller})
 
@@ -365,11 +370,11 @@ def resume_combat_die_replacement(state: MatchState, card_id: str, replacement_s
     if destination == "exile":
         zone_owner.exile.append(card_id)
         card.zone = Zone.EXILE
-        state.log.append(f"{card.name} is exiled instead of dying in combat.")
+        log_event(state, "combat_exiled", "{card} is exiled instead of dying in combat.", card=card.name)
         return
     zone_owner.graveyard.append(card_id)
     card.zone = Zone.GRAVEYARD
-    state.log.append(f"{card.name} dies in combat.")
+    log_event(state, "combat_dies", _DIES_LINE, card=card.name)
     emit_event(state, "permanent_dies", {"card_id": card_id, "controller": card.controller})
     emit_event(state, "creature_dies", {"card_id": card_id, "controller": card.controller})
 
@@ -503,10 +508,10 @@ def _deal_unblocked_damage(state: MatchState, defender_key: str, amount: int, so
         card = state.cards.get(cid)
         if card and "Planeswalker" in card.types and card.zone == Zone.BATTLEFIELD:
             if source_id is not None and source_id in state.cards and _damage_prevented_by_protection(state, source_id, cid):
-                state.log.append(f"{card.name} prevents {amount} damage.")
+                log_event(state, "damage_prevented", _PREVENTED_LINE, target=card.name, amount=amount)
                 return 0
             card.loyalty = (card.loyalty or 0) - amount
-            state.log.append(f"{card.name} loses {amount} loyalty.")
+            log_event(state, "loyalty_damage", "{card} loses {amount} loyalty.", card=card.name, amount=amount)
             return amount
         # PW left battlefield — damage disappears, does NOT redirect to player
         return 0
@@ -519,7 +524,7 @@ def _deal_unblocked_damage(state: MatchState, defender_key: str, amount: int, so
     )
     post, prevented = (amount, 0) if prevention_locked else consume_player_prevention_shield(state, pid, amount)
     if prevented > 0:
-        state.log.append(f"{state.players[pid].name} prevents {prevented} damage.")
+        log_event(state, "damage_prevented", _PREVENTED_LINE, target=state.players[pid].name, amount=prevented)
     if post <= 0:
         return 0
     state.players[pid].life -= post
@@ -544,7 +549,7 @@ def _mark_creature_damage(
     )
     post, prevented = (amount, 0) if prevention_locked else consume_card_prevention_shield(card, amount)
     if prevented > 0:
-        state.log.append(f"{card.name} prevents {prevented} damage.")
+        log_event(state, "damage_prevented", _PREVENTED_LINE, target=card.name, amount=prevented)
     if post <= 0:
         return
     card.counters[DMG_MARK_KEY] = int(card.counters.get(DMG_MARK_KEY, 0)) + int(post)
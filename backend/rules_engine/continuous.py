@@ -1,80 +1,10 @@
 from __future__ import annotations
 
-import re
 from typing import Any
 
-from game_state.state import Zone
-
-PT_STATIC_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+get\s+([+-]\d+)\/([+-]\d+)"
-)
-PT_SET_RE = re.compile(
-    r"\b(?:base power and toughness\s+(\d+)\/(\d+)|(?:are|become|becomes|is)\s+(\d+)\/(\d+)|set(?:s)?(?:\s+their)?\s+base power and toughness\s+(\d+)\/(\d+))\b"
-)
-PT_SET_SCOPE_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+"
-    r"(?:base power and toughness\s+(\d+)\/(\d+)|(?:are|become|becomes|is)\s+(\d+)\/(\d+)|"
-    r"set(?:s)?(?:\s+their)?\s+base power and toughness\s+(\d+)\/(\d+))\b"
-)
-SELF_SCALE_GRAVE_RE = re.compile(
-    r"\bgets\s+([+-]\d+)\/([+-]\d+)\s+for each\s+([a-z\s]+?)\s+card[s]?\s+in\s+(your|all)\s+graveyard[s]?\b"
-)
-SELF_SCALE_BF_RE = re.compile(
-    r"\bgets\s+([+-]\d+)\/([+-]\d+)\s+for each\s+(other\s+)?([a-z\s]+?)\s+you control\b"
-)
-CARD_TYPE_COUNT_RE = re.compile(r"number of card types among cards in all graveyards", re.IGNORECASE)
-KW_STATIC_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+(?:have|has)\s+([^.]*)"
-)
-PT_AND_KW_STATIC_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+get\s+[+-]\d+\/[+-]\d+\s+and\s+(?:have|has)\s+([^.]*)"
-)
-KW_REMOVE_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+(?:lose|loses)\s+([^.]*)"
-)
-KW_CANT_HAVE_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+can't have\s+([^.]*)"
-)
-PT_AND_KW_REMOVE_RE = re.compile(
-    r"\b(other\s+)?(creature tokens|artifact creatures|[a-z]+ creatures|creatures|[a-z]+s?)\s+"
-    r"(you control|your opponents control)\s+get\s+[+-]\d+\/[+-]\d+\s+and\s+(?:lose|loses)\s+([^.]*)"
-)
-KNOWN_KEYWORDS = [
-    "trample",
-    "first strike",
-    "double strike",
-    "haste",
-    "flash",
-    "lifelink",
-    "deathtouch",
-    "flying",
-    "reach",
-    "menace",
-    "vigilance",
-    "defender",
-    "indestructible",
-    "hexproof",
-    "shroud",
-    "shadow",
-    "fear",
-    "intimidate",
-    "islandwalk",
-    "swampwalk",
-    "mountainwalk",
-    "forestwalk",
-    "plainswalk",
-    "nonbasic landwalk",
-    "snow landwalk",
-    "desertwalk",
-    "wasteswalk",
-    "legendary landwalk",
-]
+from game_state.caches import set_private_cache
+from game_state.state import Zone, layer_version
+from rules_engine.card_abilities import card_abilities
 
 
 def effect_timestamp(card) -> int:
@@ -102,7 +32,7 @@ def _continuous_layer_sort_key(state, source_id: str, layer: str) -> tuple[int,
         layer_rank = 7
         sublayer = 2
     source = state.cards.get(source_id)
-    position = _battlefield_position_map(state).get(source_id, 0)
+    position = battlefield_position_map(state).get(source_id, 0)
     return (
         layer_rank,
         sublayer,
@@ -115,9 +45,8 @@ def _continuous_layer_sort_key(state, source_id: str, layer: str) -> tuple[int,
 
 def effective_power(state, card_id: str) -> int:
     card = state.cards[card_id]
-    base_p, _ = _base_pt_with_layers(state, card_id)
+    base_p, _, p_bonus, _ = _layered_pt(state, card_id)
     base = int(base_p or 0)
-    p_bonus, _ = _continuous_pt_delta(state, card_id)
     counter_bonus = _counter_pt_delta(card)
     temp_bonus = int((getattr(card, "counters", {}) or {}).get("__eot_power", 0))
     return base + p_bonus + counter_bonus + temp_bonus
@@ -125,14 +54,62 @@ def effective_power(state, card_id: str) -> int:
 
 def effective_toughness(state, card_id: str) -> int:
     card = state.cards[card_id]
-    _, base_t = _base_pt_with_layers(state, card_id)
+    _, base_t, _, t_bonus = _layered_pt(state, card_id)
     base = int(base_t or 0)
-    _, t_bonus = _continuous_pt_delta(state, card_id)
     counter_bonus = _counter_pt_delta(card)
     temp_bonus = int((getattr(card, "counters", {}) or {}).get("__eot_toughness", 0))
     return base + t_bonus + counter_bonus + temp_bonus
 
 
+def layer_inputs_key(state) -> tuple | None:
+    """Return a key that changes whenever layered characteristics may change.
+
+    Counters and end-of-turn buffs are read fresh by the callers, so layer
+    results only depend on card characteristics (tracked by the match's layer
+    version) and on battlefield order and graveyard sizes. Lightweight
+    fixtures without full player zones return None.
+    """
+    try:
+        version = layer_version(state)
+        return (
+            version,
+            version.layer,
+            tuple(tuple(player.battlefield) for player in state.players.values()),
+            tuple(len(player.graveyard) for player in state.players.values()),
+        )
+    except (AttributeError, TypeError):
+        return None
+
+
+def _layer_memo(state) -> dict | None:
+    """Return memoized layer results valid for the current layer inputs."""
+    key = layer_inputs_key(state)
+    if key is None:
+        return None
+    try:
+        memo = state.__dict__.get("_layer_memo")
+    except AttributeError:
+        return None
+    if memo is None or memo["key"] != key:
+        memo = {"key": key, "order": None, "positions": None, "pt": {}, "keywords": {}}
+        set_private_cache(state, "_layer_memo", memo)
+    return memo
+
+
+def _layered_pt(state, card_id: str) -> tuple[int | None, int | None, int, int]:
+    memo = _layer_memo(state)
+    if memo is not None:
+        cached = memo["pt"].get(card_id)
+        if cached is not None:
+            return cached
+    base_p, base_t = _base_pt_with_layers(state, card_id)
+    p_bonus, t_bonus = _continuous_pt_delta(state, card_id)
+    result = (base_p, base_t, p_bonus, t_bonus)
+    if memo is not None:
+        memo["pt"][card_id] = result
+    return result
+
+
 def _counter_pt_delta(card) -> int:
     """Return PT bonus from +1/+1 and -1/-1 counters on a card."""
     bonus = 0
@@ -151,6 +128,18 @@ def effective_keywords(state, card_id: str) -> list[str]:
         return sorted(out)
     if "Creature" not in card.types:
         return sorted(out)
+    memo = _layer_memo(state)
+    if memo is not None:
+        cached = memo["keywords"].get(card_id)
+        if cached is None:
+            cached = tuple(_layered_keywords(state, card, out))
+            memo["keywords"][card_id] = cached
+        return list(cached)
+    return _layered_keywords(state, card, out)
+
+
+def _layered_keywords(state, card, out: set[str]) -> list[str]:
+    card_id = card.id
     for src_id in _all_battlefield_ids(state):
         src = state.cards.get(src_id)
         if not src:
@@ -220,9 +209,10 @@ def _base_pt_with_layers(state, card_id: str) -> tuple[int | None, int | None]:
 
 def _self_defined_card_type_pt(state, card) -> tuple[int | None, int | None]:
     """Resolve characteristic-defining PT from distinct graveyard card types."""
-    text = (getattr(card, "oracle_text", "") or "").lower()
-    if not CARD_TYPE_COUNT_RE.search(text):
+    abilities = card_abilities(card)
+    if not abilities.counts_graveyard_card_types:
         return (None, None)
+    text = abilities.text
     types: set[str] = set()
     for player in state.players.values():
         for cid in player.graveyard:
@@ -264,15 +254,11 @@ def _continuous_pt_delta(state, card_id: str) -> tuple[int, int]:
 
 
 def _self_scaling_pt_delta(state, source_card) -> tuple[int, int]:
-    text = (getattr(source_card, "oracle_text", "") or "").lower()
+    abilities = card_abilities(source_card)
     total_p = 0
     total_t = 0
 
-    for m in SELF_SCALE_GRAVE_RE.finditer(text):
-        p_step = int(m.group(1))
-        t_step = int(m.group(2))
-        selector = (m.group(3) or "").strip()
-        scope = (m.group(4) or "your").strip()
+    for p_step, t_step, selector, scope in abilities.graveyard_scaling:
         if scope == "all":
             grave_ids: list[str] = []
             for pid in state.players:
@@ -283,11 +269,7 @@ def _self_scaling_pt_delta(state, source_card) -> tuple[int, int]:
         total_p += p_step * count
         total_t += t_step * count
 
-    for m in SELF_SCALE_BF_RE.finditer(text):
-        p_step = int(m.group(1))
-        t_step = int(m.group(2))
-        other_only = bool((m.group(3) or "").strip())
-        selector = (m.group(4) or "").strip()
+    for p_step, t_step, other_only, selector in abilities.battlefield_scaling:
         bf_ids = list(state.players[source_card.controller].battlefield)
         count = 0
         for cid in bf_ids:
@@ -303,88 +285,23 @@ def _self_scaling_pt_delta(state, source_card) -> tuple[int, int]:
 
 
 def _iter_pt_modifiers(source_card):
-    text = (getattr(source_card, "oracle_text", "") or "").lower()
-    for match in PT_STATIC_RE.finditer(text):
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        p_delta = int(match.group(4))
-        t_delta = int(match.group(5))
-        yield (scope, other_only, subject, p_delta, t_delta)
+    return card_abilities(source_card).pt_modifiers
 
 
 def _iter_pt_setters(source_card):
-    text = (getattr(source_card, "oracle_text", "") or "").lower()
-    scoped_matches = False
-    for match in PT_SET_SCOPE_RE.finditer(text):
-        scoped_matches = True
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        p_set, t_set = _extract_pt_set_groups(match)
-        if p_set is not None and t_set is not None:
-            yield (scope, other_only, subject, p_set, t_set)
-    if not scoped_matches:
-        for match in PT_SET_RE.finditer(text):
-            p_set, t_set = _extract_pt_set_groups(match)
-            if p_set is not None and t_set is not None:
-                yield ("you control", False, "creatures", p_set, t_set)
+    return card_abilities(source_card).pt_setters
 
 
 def _iter_keyword_grants(source_card):
-    text = (getattr(source_card, "oracle_text", "") or "").lower()
-    for match in PT_AND_KW_STATIC_RE.finditer(text):
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        granted_text = match.group(4).strip()
-        granted = [kw for kw in KNOWN_KEYWORDS if kw in granted_text]
-        if granted:
-            yield (scope, other_only, subject, granted)
-    for match in KW_STATIC_RE.finditer(text):
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        granted_text = match.group(4).strip()
-        granted = [kw for kw in KNOWN_KEYWORDS if kw in granted_text]
-        if granted:
-            yield (scope, other_only, subject, granted)
+    return card_abilities(source_card).keyword_grants
 
 
 def _iter_keyword_removals(source_card):
-    text = (getattr(source_card, "oracle_text", "") or "").lower()
-    for match in PT_AND_KW_REMOVE_RE.finditer(text):
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        removed_text = match.group(4).strip()
-        if "all abilities" in removed_text:
-            yield (scope, other_only, subject, {"all abilities"})
-            continue
-        removed = [kw for kw in KNOWN_KEYWORDS if kw in removed_text]
-        if removed:
-            yield (scope, other_only, subject, set(removed))
-    for match in KW_REMOVE_RE.finditer(text):
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        removed_text = match.group(4).strip()
-        if "all abilities" in removed_text:
-            yield (scope, other_only, subject, {"all abilities"})
-            continue
-        removed = [kw for kw in KNOWN_KEYWORDS if kw in removed_text]
-        if removed:
-            yield (scope, other_only, subject, set(removed))
+    return card_abilities(source_card).keyword_removals
+
+
 def _iter_keyword_cant_removals(source_card):
-    text = (getattr(source_card, "oracle_text", "") or "").lower()
-    for match in KW_CANT_HAVE_RE.finditer(text):
-        other_only = bool(match.group(1))
-        subject = match.group(2).strip()
-        scope = match.group(3).strip()
-        removed_text = match.group(4).strip()
-        removed = [kw for kw in KNOWN_KEYWORDS if kw in removed_text]
-        if removed:
-            yield (scope, other_only, subject, set(removed))
+    return card_abilities(source_card).keyword_cant_removals
 
 
 def _scope_controller(source_controller: int, scope: str, target_controller: int) -> bool:
@@ -482,8 +399,17 @@ def _battlefield_card_matches_selector(card, selector: str) -> bool:
 
 
 def _all_battlefield_ids(state) -> list[str]:
+    memo = _layer_memo(state)
+    if memo is not None:
+        if memo["order"] is None:
+            memo["order"] = _sorted_battlefield_ids(state)
+        return memo["order"]
+    return _sorted_battlefield_ids(state)
+
+
+def _sorted_battlefield_ids(state) -> list[str]:
     ids: list[str] = []
-    battlefield_index = _battlefield_position_map(state)
+    battlefield_index = battlefield_position_map(state)
     for pid in state.players:
         ids.extend(list(state.players[pid].battlefield))
     ids.sort(
@@ -497,7 +423,17 @@ def _all_battlefield_ids(state) -> list[str]:
     return ids
 
 
-def _battlefield_position_map(state) -> dict[str, int]:
+def battlefield_position_map(state) -> dict[str, int]:
+    """Return each battlefield id's position across players, in player order."""
+    memo = _layer_memo(state)
+    if memo is not None:
+        if memo["positions"] is None:
+            memo["positions"] = _compute_battlefield_positions(state)
+        return memo["positions"]
+    return _compute_battlefield_positions(state)
+
+
+def _compute_battlefield_positions(state) -> dict[str, int]:
     positions: dict[str, int] = {}
     position = 0
     for pid in sorted(state.players):
@@ -591,16 +527,3 @@ def _source_continuous_layer_entries(state, source_card, target_card_id: str) ->
 
 def _source_continuous_layers(state, source_card, target_card_id: str) -> list[str]:
     return [entry["layer"] for entry in _source_continuous_layer_entries(state, source_card, target_card_id)]
-
-
-def _extract_pt_set_groups(match: re.Match) -> tuple[int | None, int | None]:
-    if match.re is PT_SET_SCOPE_RE:
-        pairs = ((4, 5), (6, 7), (8, 9))
-    else:
-        pairs = ((1, 2), (3, 4), (5, 6))
-    for p_idx, t_idx in pairs:
-        p = match.group(p_idx)
-        t = match.group(t_idx)
-        if p is not None and t is not None:
-            return int(p), int(t)
-    return None, None
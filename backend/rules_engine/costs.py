@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from typing import Any
 
 from game_state.state import MatchState, Zone
-from rules_engine.mana import can_pay_with_pool_and_lands
+from rules_engine.mana import ManaAvailability, can_pay_with_pool_and_lands
 from rules_engine.replacement import replace_die_zone
 
 ALT_COST_RE = re.compile(r"pay\s+((?:\{[^}]+\})+)\s+rather than pay this spell's mana cost", re.IGNORECASE)
@@ -107,7 +107,13 @@ def parse_activated_cost(cost_text: str) -> ActivatedCost:
     )
 
 
-def activated_cost_available(state: MatchState, player_id: int, source_id: str, cost_text: str) -> bool:
+def activated_cost_available(
+    state: MatchState,
+    player_id: int,
+    source_id: str,
+    cost_text: str,
+    availability: ManaAvailability | None = None,
+) -> bool:
     cost = parse_activated_cost(cost_text)
     if not cost.supported:
         return False
@@ -124,7 +130,9 @@ def activated_cost_available(state: MatchState, player_id: int, source_id: str,
         creatures.remove(source_id)
     if len(creatures) < max(0, cost.sacrifice_creatures - (1 if cost.sacrifice_source else 0)):
         return False
-    return not cost.mana_cost or can_pay_with_pool_and_lands(state, player_id, cost.mana_cost, card_name=source.name)
+    return not cost.mana_cost or can_pay_with_pool_and_lands(
+        state, player_id, cost.mana_cost, card_name=source.name, availability=availability,
+    )
 
 
 def apply_activated_costs(state: MatchState, player_id: int, source_id: str, cost_text: str) -> bool:
@@ -212,7 +220,14 @@ def collect_cost_options(state: MatchState, player_id: int, card) -> list[CostOp
     return options
 
 
-def check_cost_option_available(state: MatchState, player_id: int, card, option: CostOption, x_value: int = 0) -> bool:
+def check_cost_option_available(
+    state: MatchState,
+    player_id: int,
+    card,
+    option: CostOption,
+    x_value: int = 0,
+    availability: ManaAvailability | None = None,
+) -> bool:
     player = state.players[player_id]
     if player.life <= option.pay_life:
         return False
@@ -223,6 +238,7 @@ def check_cost_option_available(state: MatchState, player_id: int, card, option:
     return can_pay_with_pool_and_lands(
         state, player_id, option.mana_cost, is_land=("Land" in card.types),
         card_name=card.name, x_value=x_value, spell_types=set(card.types),
+        availability=availability,
     )
 
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import uuid
-
-from game_state.state import MatchState, StackItem, Step, TURN_STEPS, Zone, assign_static_order_on_battlefield_entry, draw_card
+from game_state.match_log import log_event
+from game_state.telemetry import note_action, note_priority_pass, record_anomaly
+from game_state.state import MatchState, StackItem, Step, TURN_STEPS, Zone, allocate_object_id, assign_static_order_on_battlefield_entry, draw_card
 from rules_engine import combat
 from rules_engine.cast_choice import build_cast_hints, enrich_divide_total, validate_cast_choice
 from rules_engine.costs import apply_activated_costs, apply_additional_costs, check_cost_option_available, collect_cost_options, normalize_cost_choice
@@ -115,7 +115,7 @@ class RulesEngine:
                 continue
             card.counters.pop("__crew_until_turn", None)
             if "Creature" in card.types:
-                card.types.remove("Creature")
+                card.types = [value for value in card.types if value != "Creature"]
             state.log.append(f"{card.name} is no longer a creature after cleanup.")
 
     def _advance_sagas(self, state: MatchState) -> None:
@@ -141,7 +141,7 @@ class RulesEngine:
             )
             state.stack.append(
                 StackItem(
-                    id=str(uuid.uuid4()),
+                    id=allocate_object_id(state, "stack"),
                     source_card_id=cid,
                     controller=card.controller,
                     label=f"{card.name} chapter {chapter['number']}",
@@ -257,6 +257,8 @@ class RulesEngine:
         if state.winner is not None:
             return
         kind = action.get("type")
+        if kind != "pass_priority":
+            note_action(state)
 
         if state.pregame_pending:
             self._handle_pregame_action(state, player_id, action)
@@ -367,10 +369,12 @@ class RulesEngine:
             return
 
         if kind == "pass_priority":
+            note_priority_pass(state)
             actor = state.players.get(player_id)
             if actor:
-                state.log.append(
-                    f"{actor.name} passes priority on {state.step.value} (stack={len(state.stack)})."
+                log_event(
+                    state, "priority_pass", "{player} passes priority on {step} (stack={stack_size}).",
+                    player=actor.name, step=state.step.value, stack_size=len(state.stack),
                 )
             both_passed = pass_priority(state, player_id)
             if both_passed:
@@ -499,7 +503,8 @@ class RulesEngine:
                             chosen,
                         )
                     if not check_cost_option_available(state, player_id, card, chosen, x_value=x_value):
-                        state.log.append(f"{player.name} cannot satisfy chosen costs for {card.name}.")
+                        log_event(state, "cost_choice_failed", "{player} cannot satisfy chosen costs for {card}.", player=player.name, card=card.name)
+                        record_anomaly(state, "cost_failures", f"{player.name} cannot satisfy chosen costs for {card.name}.")
                         apply_state_based_actions(state)
                         return
                 action_targets = enrich_divide_total(card, at_targets)
@@ -513,17 +518,17 @@ class RulesEngine:
                 hints = build_cast_hints(state, face_card, player_id, action_targets)
                 ok, error = validate_cast_choice(hints, action_targets)
                 if not ok:
-                    state.log.append(f"Invalid targets for {card.name}: {error}")
+                    _reject_targets(state, card.name, error)
                     apply_state_based_actions(state)
                     return
                 ok_prot, err_prot = validate_protection_targets(state, face_card, action_targets)
                 if not ok_prot:
-                    state.log.append(f"Invalid targets for {card.name}: {err_prot}")
+                    _reject_targets(state, card.name, err_prot)
                     apply_state_based_actions(state)
                     return
                 ok_hs, err_hs = validate_hexproof_shroud_targets(state, player_id, action_targets)
                 if not ok_hs:
-                    state.log.append(f"Invalid targets for {card.name}: {err_hs}")
+                    _reject_targets(state, card.name, err_hs)
                     apply_state_based_actions(state)
                     return
                 target_ids: list[str] = []
@@ -538,13 +543,17 @@ class RulesEngine:
                 )
                 if not paid:
                     if ward_tax > 0:
-                        state.log.append(f"{player.name} cannot pay ward tax ({ward_tax}) for {card.name}.")
+                        log_event(
+                            state, "ward_tax_unpaid", "{player} cannot pay ward tax ({ward_tax}) for {card}.",
+                            player=player.name, ward_tax=ward_tax, card=card.name,
+                        )
                     else:
-                        state.log.append(f"{player.name} cannot pay mana cost for {card.name}.")
+                        log_event(state, "mana_payment_failed", "{player} cannot pay mana cost for {card}.", player=player.name, card=card.name)
                     apply_state_based_actions(state)
                     return
                 if not apply_additional_costs(state, player_id, chosen, cid):
-                    state.log.append(f"{player.name} failed additional costs for {card.name}.")
+                    log_event(state, "additional_cost_failed", "{player} failed additional costs for {card}.", player=player.name, card=card.name)
+                    record_anomaly(state, "additional_cost_failures", f"{player.name} failed additional costs for {card.name}.")
                     apply_state_based_actions(state)
                     return
                 ability = build_ability_spec(state, face_card, player_id, action_targets=action_targets)
@@ -682,12 +691,12 @@ class RulesEngine:
                 action_targets["x_value"] = max(0, min(current_loyalty, int(action_targets.get("x_value", 0) or 0)))
             ok_hs, err_hs = validate_hexproof_shroud_targets(state, player_id, action_targets)
             if not ok_hs:
-                state.log.append(f"Invalid targets for {pw.name}: {err_hs}")
+                _reject_targets(state, pw.name, err_hs)
                 apply_state_based_actions(state)
                 return
             ok_prot, err_prot = validate_protection_targets(state, pw, action_targets)
             if not ok_prot:
-                state.log.append(f"Invalid targets for {pw.name}: {err_prot}")
+                _reject_targets(state, pw.name, err_prot)
                 apply_state_based_actions(state)
                 return
             ability = build_ability_spec(state, proxy, player_id, action_targets=action_targets)
@@ -770,8 +779,8 @@ class RulesEngine:
 
         apply_state_based_actions(state)
 
-    def legal_moves(self, state: MatchState, player_id: int) -> list[dict]:
-        return legal_moves(state, player_id)
+    def legal_moves(self, state: MatchState, player_id: int, rollout: bool = False) -> list[dict]:
+        return legal_moves(state, player_id, rollout=rollout)
 
     def _handle_pregame_action(self, state: MatchState, player_id: int, action: dict) -> None:
         if player_id in state.kept_hands:
@@ -918,6 +927,15 @@ def _extract_equip_cost_text(oracle_text: str) -> str:
     return m.group(1).upper() if m else ""
 
 
+def _reject_targets(state: MatchState, card_name: str, error: str) -> None:
+    log_event(state, "invalid_targets", "Invalid targets for {card}: {error}", card=card_name, error=error)
+    low = str(error).lower()
+    record_anomaly(
+        state, "invalid_targets", f"Invalid targets for {card_name}: {error}",
+        x_value_error="x value is required" in low or "x value must be non-negative" in low,
+    )
+
+
 def _select_face_for_cast(card, selected_face_index) -> object:
     faces = list(getattr(card, "card_faces", []) or [])
     if not faces:
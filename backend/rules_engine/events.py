@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import uuid
 import re
 from typing import Any
 
-from game_state.state import MatchState, StackItem
+from game_state.caches import set_private_cache
+from game_state.state import MatchState, StackItem, allocate_object_id, layer_version
+from game_state.zone_list import ZoneList
+from rules_engine.card_abilities import card_abilities, known_trigger_events
+
+_GATED_EVENTS = known_trigger_events()
 
 
 def emit_event(state: MatchState, event: str, payload: dict[str, Any]) -> None:
@@ -20,8 +24,7 @@ def emit_event_batch(state: MatchState, event: str, payloads: list[dict[str, Any
         for trigger in _collect_triggers(state, event, payload):
             source_id = str(trigger.get("source_card_id", ""))
             source = state.cards.get(source_id)
-            oracle = (getattr(source, "oracle_text", "") or "").lower() if source else ""
-            if "one or more" in oracle:
+            if source is not None and card_abilities(source).one_or_more:
                 if source_id in one_or_more_sources:
                     continue
                 one_or_more_sources.add(source_id)
@@ -83,7 +86,7 @@ def _append_trigger_groups(
         payload = dict(trig["payload"])
         state.stack.append(
             StackItem(
-                id=str(uuid.uuid4()),
+                id=allocate_object_id(state, "stack"),
                 source_card_id=trig["source_card_id"],
                 controller=trig["controller"],
                 label=trig["label"],
@@ -139,6 +142,115 @@ def resume_trigger_order(state: MatchState, requested_order: list[str]) -> bool:
     return True
 
 
+class _TriggerIndex:
+    """Battlefield trigger sources by event, kept current by the battlefield zones.
+
+    Each player's battlefield reports permanents entering and leaving, which
+    update that player's lists in place. A reordered or replaced zone is
+    rebuilt on the next lookup, and an Oracle text change in the match
+    (tracked by its layer version) rebuilds everything.
+    """
+
+    __slots__ = ("state", "version", "oracle", "zones", "sources", "joined")
+
+    def __init__(self, state: MatchState) -> None:
+        self.state = state
+        self.version = layer_version(state)
+        self.oracle = self.version.oracle
+        self.zones: dict[int, _WatchedBattlefield] = {}
+        # event -> player id -> source ids in battlefield order
+        self.sources: dict[str, dict[int, list[str]]] = {}
+        self.joined: dict[str, list[str]] = {}
+        for pid in state.players:
+            self.rebuild(pid)
+
+    def current(self, state: MatchState) -> bool:
+        version = layer_version(state)
+        if version is not self.version or version.oracle != self.oracle:
+            return False
+        for pid, pstate in state.players.items():
+            zone = pstate.battlefield
+            if not isinstance(zone, ZoneList):
+                return False
+            watcher = self.zones.get(pid)
+            if watcher is None or watcher.stale or zone.watcher is not watcher:
+                self.rebuild(pid)
+        return len(self.zones) == len(state.players)
+
+    def rebuild(self, pid: int) -> None:
+        for by_player in self.sources.values():
+            by_player.pop(pid, None)
+        self.joined.clear()
+        zone = self.state.players[pid].battlefield
+        watcher = _WatchedBattlefield(self, pid)
+        self.zones[pid] = watcher
+        if isinstance(zone, ZoneList):
+            zone.watch(watcher)
+        for cid in zone:
+            self.add(pid, cid)
+
+    def add(self, pid: int, cid: str) -> None:
+        card = self.state.cards.get(cid)
+        if card is None:
+            return
+        for trigger_event in card_abilities(card).trigger_events:
+            self.sources.setdefault(trigger_event, {}).setdefault(pid, []).append(cid)
+            self.joined.pop(trigger_event, None)
+
+    def discard(self, pid: int, cid: str) -> None:
+        card = self.state.cards.get(cid)
+        events = card_abilities(card).trigger_events if card is not None else tuple(self.sources)
+        for trigger_event in events:
+            ids = self.sources.get(trigger_event, {}).get(pid)
+            if ids and cid in ids:
+                ids.remove(cid)
+                self.joined.pop(trigger_event, None)
+
+    def candidates(self, event: str) -> list[str]:
+        ids = self.joined.get(event)
+        if ids is None:
+            by_player = self.sources.get(event, {})
+            ids = [cid for pid in self.state.players for cid in by_player.get(pid, ())]
+            self.joined[event] = ids
+        return ids
+
+
+class _WatchedBattlefield:
+    __slots__ = ("index", "pid", "stale")
+
+    def __init__(self, index: _TriggerIndex, pid: int) -> None:
+        self.index = index
+        self.pid = pid
+        self.stale = False
+
+    def entered(self, cid: str) -> None:
+        if not self.stale:
+            self.index.add(self.pid, cid)
+
+    def left(self, cid: str) -> None:
+        if not self.stale:
+            self.index.discard(self.pid, cid)
+
+    def reset(self) -> None:
+        self.stale = True
+
+
+def _trigger_candidates(state: MatchState, event: str) -> list[str]:
+    """Return battlefield card ids that can trigger on ``event``, in scan order.
+
+    Gated events read the incrementally maintained ``_TriggerIndex``. Events
+    without a phrase gate, and begin-step events (delayed sacrifice markers
+    live in counters), scan the whole battlefield.
+    """
+    if event not in _GATED_EVENTS or event == "begin_step":
+        return [cid for pstate in state.players.values() for cid in pstate.battlefield]
+    index = state.__dict__.get("_trigger_index")
+    if index is None or not index.current(state):
+        index = _TriggerIndex(state)
+        set_private_cache(state, "_trigger_index", index)
+    return index.candidates(event)
+
+
 def _collect_triggers(state: MatchState, event: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
     if event in {"spell_cast", "spell_copy"}:
@@ -158,173 +270,173 @@ def _collect_triggers(state: MatchState, event: str, payload: dict[str, Any]) ->
                     payload=payload,
                 )
             )
-    for pid, pstate in state.players.items():
-        for cid in list(pstate.battlefield):
-            card = state.cards[cid]
-            oracle = (card.oracle_text or "").lower()
-            once_each_turn = "only once each turn" in oracle or "this ability triggers only once each turn" in oracle
-            trigger_key = f"{cid}:{event}"
-            if once_each_turn and trigger_key in state.trigger_once_seen_this_turn:
-                continue
-
-            if event == "draw_card" and payload.get("player_id") == card.controller and "whenever you draw a card" in oracle:
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "draw_card" and payload.get("player_id") != card.controller and "whenever an opponent draws a card" in oracle:
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "life_gain" and payload.get("player_id") == card.controller and "whenever you gain life" in oracle:
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "creature_dies" and _matches_creature_dies_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "permanent_dies" and _matches_permanent_dies_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "leaves_battlefield" and _matches_leaves_battlefield_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "day_night_changed" and _matches_day_night_trigger(oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
-            elif event == "enters_battlefield" and _matches_enters_battlefield_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} ETB", event=event, payload=payload))
-            elif event == "sacrifice" and _matches_sacrifice_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} sacrifice trigger", event=event, payload=payload))
-            elif event == "discard" and _matches_discard_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} discard trigger", event=event, payload=payload))
-            elif event == "cycle" and _matches_cycle_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} cycling trigger", event=event, payload=payload))
-            elif event == "combat_damage_dealt" and _matches_combat_damage_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} combat damage trigger", event=event, payload=payload))
-            elif event == "attack_declared" and _matches_attack_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} attack trigger", event=event, payload=payload))
-            elif event == "block_declared" and _matches_block_trigger(state, card, oracle, payload):
-                out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} block trigger", event=event, payload=payload))
-            elif event in {"spell_cast", "spell_copy"}:
-                cast_controller = int(payload.get("controller", 0) or 0)
-                source_card_id = str(payload.get("source_card_id", "") or "")
-                source_card = state.cards.get(source_card_id) if source_card_id else None
-                source_types = {t.lower() for t in (getattr(source_card, "types", []) or [])}
-                if cast_controller == card.controller and "whenever you cast a spell" in oracle:
+    for cid in _trigger_candidates(state, event):
+        card = state.cards[cid]
+        abilities = card_abilities(card)
+        oracle = abilities.text
+        once_each_turn = abilities.once_each_turn
+        trigger_key = f"{cid}:{event}"
+        if once_each_turn and trigger_key in state.trigger_once_seen_this_turn:
+            continue
+
+        if event == "draw_card" and payload.get("player_id") == card.controller and "whenever you draw a card" in oracle:
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "draw_card" and payload.get("player_id") != card.controller and "whenever an opponent draws a card" in oracle:
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "life_gain" and payload.get("player_id") == card.controller and "whenever you gain life" in oracle:
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "creature_dies" and _matches_creature_dies_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "permanent_dies" and _matches_permanent_dies_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "leaves_battlefield" and _matches_leaves_battlefield_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "day_night_changed" and _matches_day_night_trigger(oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} trigger", event=event, payload=payload))
+        elif event == "enters_battlefield" and _matches_enters_battlefield_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} ETB", event=event, payload=payload))
+        elif event == "sacrifice" and _matches_sacrifice_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} sacrifice trigger", event=event, payload=payload))
+        elif event == "discard" and _matches_discard_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} discard trigger", event=event, payload=payload))
+        elif event == "cycle" and _matches_cycle_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} cycling trigger", event=event, payload=payload))
+        elif event == "combat_damage_dealt" and _matches_combat_damage_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} combat damage trigger", event=event, payload=payload))
+        elif event == "attack_declared" and _matches_attack_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} attack trigger", event=event, payload=payload))
+        elif event == "block_declared" and _matches_block_trigger(state, card, oracle, payload):
+            out.append(_trigger_from_oracle(state, cid, card.controller, oracle, default_label=f"{card.name} block trigger", event=event, payload=payload))
+        elif event in {"spell_cast", "spell_copy"}:
+            cast_controller = int(payload.get("controller", 0) or 0)
+            source_card_id = str(payload.get("source_card_id", "") or "")
+            source_card = state.cards.get(source_card_id) if source_card_id else None
+            source_types = {t.lower() for t in (getattr(source_card, "types", []) or [])}
+            if cast_controller == card.controller and "whenever you cast a spell" in oracle:
+                out.append(
+                    _trigger_from_oracle(
+                        state,
+                        cid,
+                        card.controller,
+                        oracle,
+                        default_label=f"{card.name} cast trigger",
+                        event=event,
+                        payload=payload,
+                    )
+                )
+            elif cast_controller == card.controller and (
+                ("whenever you cast an instant spell" in oracle and "instant" in source_types)
+                or ("whenever you cast a sorcery spell" in oracle and "sorcery" in source_types)
+                or ("whenever you cast an instant or sorcery spell" in oracle and ("instant" in source_types or "sorcery" in source_types))
+            ):
+                out.append(
+                    _trigger_from_oracle(
+                        state,
+                        cid,
+                        card.controller,
+                        oracle,
+                        default_label=f"{card.name} cast trigger",
+                        event=event,
+                        payload=payload,
+                    )
+                )
+            elif cast_controller == card.controller and source_card and "creature" not in source_types and (
+                "prowess" in oracle
+                or "magecraft" in oracle
+                or "whenever you cast a noncreature spell" in oracle
+                or "whenever you cast a non-creature spell" in oracle
+                or "whenever you cast or copy an instant or sorcery spell" in oracle
+                or "whenever you cast or copy a noncreature spell" in oracle
+                or "whenever you cast or copy a non-creature spell" in oracle
+                or "gets +1/+1 until end of turn" in oracle
+            ):
+                ability = _trigger_from_oracle(
+                    state,
+                    cid,
+                    card.controller,
+                    oracle,
+                    default_label=f"{card.name} spell trigger",
+                    event=event,
+                    payload=payload,
+                )
+                if ability["effect_key"] != "gain_life" or ability["payload"].get("amount") != 0:
+                    out.append(ability)
+                elif "prowess" in oracle or "magecraft" in oracle or "gets +1/+1 until end of turn" in oracle:
+                    out.append(
+                        {
+                            "source_card_id": cid,
+                            "controller": card.controller,
+                            "label": f"{card.name} spell trigger",
+                            "effect_key": "temporary_pt_buff",
+                            "payload": {"target_card_id": cid, "power": 1, "toughness": 1},
+                        }
+                    )
+        elif event == "begin_step":
+            step = str(payload.get("step", "")).lower()
+            active_player = int(payload.get("active_player", 0) or 0)
+            if step == "upkeep":
+                if "at the beginning of each upkeep" in oracle or "at the beginning of upkeep" in oracle:
                     out.append(
                         _trigger_from_oracle(
                             state,
                             cid,
                             card.controller,
                             oracle,
-                            default_label=f"{card.name} cast trigger",
+                            default_label=f"{card.name} upkeep trigger",
                             event=event,
                             payload=payload,
                         )
                     )
-                elif cast_controller == card.controller and (
-                    ("whenever you cast an instant spell" in oracle and "instant" in source_types)
-                    or ("whenever you cast a sorcery spell" in oracle and "sorcery" in source_types)
-                    or ("whenever you cast an instant or sorcery spell" in oracle and ("instant" in source_types or "sorcery" in source_types))
-                ):
+                elif "at the beginning of your upkeep" in oracle and card.controller == active_player:
                     out.append(
                         _trigger_from_oracle(
                             state,
                             cid,
                             card.controller,
                             oracle,
-                            default_label=f"{card.name} cast trigger",
+                            default_label=f"{card.name} upkeep trigger",
                             event=event,
                             payload=payload,
                         )
                     )
-                elif cast_controller == card.controller and source_card and "creature" not in source_types and (
-                    "prowess" in oracle
-                    or "magecraft" in oracle
-                    or "whenever you cast a noncreature spell" in oracle
-                    or "whenever you cast a non-creature spell" in oracle
-                    or "whenever you cast or copy an instant or sorcery spell" in oracle
-                    or "whenever you cast or copy a noncreature spell" in oracle
-                    or "whenever you cast or copy a non-creature spell" in oracle
-                    or "gets +1/+1 until end of turn" in oracle
-                ):
-                    ability = _trigger_from_oracle(
-                        state,
-                        cid,
-                        card.controller,
-                        oracle,
-                        default_label=f"{card.name} spell trigger",
-                        event=event,
-                        payload=payload,
+            elif step == "end_step":
+                # Delayed sacrifice marker support for token effects.
+                if card.counters.get("__sac_next_end_step", 0) > 0 and card.controller == active_player:
+                    out.append(
+                        {
+                            "source_card_id": cid,
+                            "controller": card.controller,
+                            "label": f"{card.name} delayed sacrifice",
+                            "effect_key": "sacrifice",
+                            "payload": {"target_card_id": cid},
+                        }
                     )
-                    if ability["effect_key"] != "gain_life" or ability["payload"].get("amount") != 0:
-                        out.append(ability)
-                    elif "prowess" in oracle or "magecraft" in oracle or "gets +1/+1 until end of turn" in oracle:
-                        out.append(
-                            {
-                                "source_card_id": cid,
-                                "controller": card.controller,
-                                "label": f"{card.name} spell trigger",
-                                "effect_key": "temporary_pt_buff",
-                                "payload": {"target_card_id": cid, "power": 1, "toughness": 1},
-                            }
-                        )
-            elif event == "begin_step":
-                step = str(payload.get("step", "")).lower()
-                active_player = int(payload.get("active_player", 0) or 0)
-                if step == "upkeep":
-                    if "at the beginning of each upkeep" in oracle or "at the beginning of upkeep" in oracle:
-                        out.append(
-                            _trigger_from_oracle(
-                                state,
-                                cid,
-                                card.controller,
-                                oracle,
-                                default_label=f"{card.name} upkeep trigger",
-                                event=event,
-                                payload=payload,
-                            )
-                        )
-                    elif "at the beginning of your upkeep" in oracle and card.controller == active_player:
-                        out.append(
-                            _trigger_from_oracle(
-                                state,
-                                cid,
-                                card.controller,
-                                oracle,
-                                default_label=f"{card.name} upkeep trigger",
-                                event=event,
-                                payload=payload,
-                            )
-                        )
-                elif step == "end_step":
-                    # Delayed sacrifice marker support for token effects.
-                    if card.counters.get("__sac_next_end_step", 0) > 0 and card.controller == active_player:
-                        out.append(
-                            {
-                                "source_card_id": cid,
-                                "controller": card.controller,
-                                "label": f"{card.name} delayed sacrifice",
-                                "effect_key": "sacrifice",
-                                "payload": {"target_card_id": cid},
-                            }
-                        )
-                    if "at the beginning of each end step" in oracle or "at the beginning of end step" in oracle:
-                        out.append(
-                            _trigger_from_oracle(
-                                state,
-                                cid,
-                                card.controller,
-                                oracle,
-                                default_label=f"{card.name} end-step trigger",
-                                event=event,
-                                payload=payload,
-                            )
+                if "at the beginning of each end step" in oracle or "at the beginning of end step" in oracle:
+                    out.append(
+                        _trigger_from_oracle(
+                            state,
+                            cid,
+                            card.controller,
+                            oracle,
+                            default_label=f"{card.name} end-step trigger",
+                            event=event,
+                            payload=payload,
                         )
-                    elif "at the beginning of your end step" in oracle and card.controller == active_player:
-                        out.append(
-                            _trigger_from_oracle(
-                                state,
-                                cid,
-                                card.controller,
-                                oracle,
-                                default_label=f"{card.name} end-step trigger",
-                                event=event,
-                                payload=payload,
-                            )
+                    )
+                elif "at the beginning of your end step" in oracle and card.controller == active_player:
+                    out.append(
+                        _trigger_from_oracle(
+                            state,
+                            cid,
+                            card.controller,
+                            oracle,
+                            default_label=f"{card.name} end-step trigger",
+                            event=event,
+                            payload=payload,
                         )
-            if once_each_turn:
-                state.trigger_once_seen_this_turn.add(trigger_key)
+                    )
+        if once_each_turn:
+            state.trigger_once_seen_this_turn.add(trigger_key)
     out.sort(key=lambda trig: (0 if trig["controller"] == state.active_player else 1, str(trig["source_card_id"]), str(trig["label"])))
     return out
 
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any, Callable
-import re
+
+from rules_engine.card_abilities import card_abilities
 
 
 @dataclass
@@ -15,6 +16,7 @@ class CostContext:
     generic_increase: int = 0
     state: Any = None
     spell_types: set[str] | None = None
+    static_spell_taxes: tuple[tuple[int, str, str, int], ...] | None = None
 
 
 @dataclass
@@ -45,11 +47,17 @@ def apply_cost_modifiers(context: CostContext) -> CostContext:
     return out
 
 
-_SPELL_TAX_RE = re.compile(
-    r"(?P<scope>your opponents'|your|all)?\s*"
-    r"(?P<kind>noncreature|creature|artifact|enchantment|instant or sorcery|)\s*"
-    r"spells? cost \{(?P<amount>\d+)\} more to cast"
-)
+def static_spell_taxes(state: Any) -> tuple[tuple[int, str, str, int], ...]:
+    """Return ``(controller, scope, kind, amount)`` for every battlefield spell tax."""
+    out: list[tuple[int, str, str, int]] = []
+    for pid in state.players:
+        for cid in state.players[pid].battlefield:
+            source = state.cards.get(cid)
+            if source is None:
+                continue
+            for scope, kind, amount in card_abilities(source).spell_taxes:
+                out.append((source.controller, scope, kind, amount))
+    return tuple(out)
 
 
 def _apply_static_spell_taxes(context: CostContext) -> CostContext:
@@ -60,30 +68,25 @@ def _apply_static_spell_taxes(context: CostContext) -> CostContext:
         return context
     increase = int(context.generic_increase)
     target_types = {str(value).lower() for value in context.spell_types}
-    for pid in context.state.players:
-        for cid in context.state.players[pid].battlefield:
-            source = context.state.cards.get(cid)
-            if source is None:
-                continue
-            text = (getattr(source, "oracle_text", "") or "").lower()
-            for match in _SPELL_TAX_RE.finditer(text):
-                scope = (match.group("scope") or "").strip()
-                if scope == "your" and source.controller != context.player_id:
-                    continue
-                if scope == "your opponents'" and source.controller == context.player_id:
-                    continue
-                kind = (match.group("kind") or "").strip()
-                if kind == "noncreature" and "creature" in target_types:
-                    continue
-                if kind == "creature" and "creature" not in target_types:
-                    continue
-                if kind == "artifact" and "artifact" not in target_types:
-                    continue
-                if kind == "enchantment" and "enchantment" not in target_types:
-                    continue
-                if kind == "instant or sorcery" and not target_types.intersection({"instant", "sorcery"}):
-                    continue
-                increase += int(match.group("amount"))
+    taxes = context.static_spell_taxes
+    if taxes is None:
+        taxes = static_spell_taxes(context.state)
+    for controller, scope, kind, amount in taxes:
+        if scope == "your" and controller != context.player_id:
+            continue
+        if scope == "your opponents'" and controller == context.player_id:
+            continue
+        if kind == "noncreature" and "creature" in target_types:
+            continue
+        if kind == "creature" and "creature" not in target_types:
+            continue
+        if kind == "artifact" and "artifact" not in target_types:
+            continue
+        if kind == "enchantment" and "enchantment" not in target_types:
+            continue
+        if kind == "instant or sorcery" and not target_types.intersection({"instant", "sorcery"}):
+            continue
+        increase += amount
     context.generic_increase = increase
     return context
 
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from dataclasses import dataclass
 from typing import Set
 
+from game_state.match_log import log_event
 from game_state.state import MatchState
+from game_state.telemetry import record_anomaly
 from rules_engine.continuous import has_keyword
-from rules_engine.hooks import CostContext, apply_cost_modifiers
+from rules_engine.hooks import CostContext, apply_cost_modifiers, static_spell_taxes
 
 
 MANA_SYMBOL_RE = re.compile(r"\{([^}]+)\}")
@@ -89,6 +92,34 @@ def count_untapped_nonland_mana_sources_by_color(state: MatchState, player_id: i
     return out
 
 
+_MANA_TAP_LINE = "{player} taps {source} for {color} to pay spell cost."
+
+
+@dataclass(frozen=True)
+class ManaAvailability:
+    """Snapshot of one player's mana sources and the battlefield spell taxes.
+
+    Valid only while the board is unchanged; legal move generation builds one
+    per call so every payability check shares the same battlefield scan.
+    """
+
+    player_id: int
+    pool: dict[str, int]
+    lands: Counter
+    nonlands: Counter
+    spell_taxes: tuple[tuple[int, str, str, int], ...]
+
+
+def mana_availability(state: MatchState, player_id: int) -> ManaAvailability:
+    return ManaAvailability(
+        player_id=player_id,
+        pool=dict(state.players[player_id].mana_pool),
+        lands=count_untapped_lands_by_color(state, player_id),
+        nonlands=count_untapped_nonland_mana_sources_by_color(state, player_id),
+        spell_taxes=static_spell_taxes(state),
+    )
+
+
 def can_pay_with_pool_and_lands(
     state: MatchState,
     player_id: int,
@@ -98,18 +129,27 @@ def can_pay_with_pool_and_lands(
     x_value: int = 0,
     spell_types: set[str] | None = None,
     apply_modifiers: bool = True,
+    availability: ManaAvailability | None = None,
 ) -> bool:
+    if availability is not None and availability.player_id != player_id:
+        availability = None
     context = CostContext(
         player_id=player_id, card_name=card_name, mana_cost=mana_cost,
         state=state, spell_types=spell_types,
+        static_spell_taxes=availability.spell_taxes if availability is not None else None,
     )
     if apply_modifiers:
         context = apply_cost_modifiers(context)
     mana_cost = _apply_generic_delta_to_cost(context.mana_cost, context.generic_reduction, context.generic_increase)
     req = parse_mana_cost(mana_cost, is_land=is_land, x_value=x_value)
-    pool = dict(state.players[player_id].mana_pool)
-    lands = count_untapped_lands_by_color(state, player_id)
-    nonlands = count_untapped_nonland_mana_sources_by_color(state, player_id)
+    if availability is not None:
+        pool = dict(availability.pool)
+        lands = Counter(availability.lands)
+        nonlands = Counter(availability.nonlands)
+    else:
+        pool = dict(state.players[player_id].mana_pool)
+        lands = count_untapped_lands_by_color(state, player_id)
+        nonlands = count_untapped_nonland_mana_sources_by_color(state, player_id)
 
     for color in ["W", "U", "B", "R", "G"]:
         need = req[color]
@@ -165,6 +205,21 @@ def auto_pay_cost(
     card_name: str = "",
     x_value: int = 0,
     spell_types: set[str] | None = None,
+) -> bool:
+    paid = _auto_pay_cost(state, player_id, mana_cost, is_land, card_name, x_value, spell_types)
+    if not paid:
+        record_anomaly(state, "cost_failures", f"{state.players[player_id].name} cannot pay mana cost for {card_name}.")
+    return paid
+
+
+def _auto_pay_cost(
+    state: MatchState,
+    player_id: int,
+    mana_cost: str,
+    is_land: bool,
+    card_name: str,
+    x_value: int,
+    spell_types: set[str] | None,
 ) -> bool:
     context = apply_cost_modifiers(CostContext(
         player_id=player_id, card_name=card_name, mana_cost=mana_cost,
@@ -193,13 +248,13 @@ def auto_pay_cost(
         land_id = _find_untapped_land_for_color(state, player_id, "C")
         if land_id:
             state.cards[land_id].tapped = True
-            state.log.append(f"{player.name} taps {state.cards[land_id].name} for C to pay spell cost.")
+            log_event(state, "mana_tap", _MANA_TAP_LINE, player=player.name, source=state.cards[land_id].name, color="C")
             colorless_need -= 1
             continue
         nonland_id = _find_untapped_nonland_mana_source_for_color(state, player_id, "C")
         if nonland_id:
             state.cards[nonland_id].tapped = True
-            state.log.append(f"{player.name} taps {state.cards[nonland_id].name} for C to pay spell cost.")
+            log_event(state, "mana_tap", _MANA_TAP_LINE, player=player.name, source=state.cards[nonland_id].name, color="C")
             colorless_need -= 1
             continue
         return False
@@ -209,7 +264,7 @@ def auto_pay_cost(
             land_id = _find_untapped_land_for_color(state, player_id, color)
             if land_id:
                 state.cards[land_id].tapped = True
-                state.log.append(f"{player.name} taps {state.cards[land_id].name} for {color} to pay spell cost.")
+                log_event(state, "mana_tap", _MANA_TAP_LINE, player=player.name, source=state.cards[land_id].name, color=color)
                 amount = land_mana_amount(state, player_id, land_id)
                 used = min(req[color], amount)
                 req[color] -= used
@@ -219,7 +274,7 @@ def auto_pay_cost(
             nonland_id = _find_untapped_nonland_mana_source_for_color(state, player_id, color)
             if nonland_id:
                 state.cards[nonland_id].tapped = True
-                state.log.append(f"{player.name} taps {state.cards[nonland_id].name} for {color} to pay spell cost.")
+                log_event(state, "mana_tap", _MANA_TAP_LINE, player=player.name, source=state.cards[nonland_id].name, color=color)
                 req[color] -= 1
                 continue
             return False
@@ -248,7 +303,7 @@ def auto_pay_cost(
                 "C",
             )
             state.cards[land_id].tapped = True
-            state.log.append(f"{player.name} taps {state.cards[land_id].name} for {produced} to pay spell cost.")
+            log_event(state, "mana_tap", _MANA_TAP_LINE, player=player.name, source=state.cards[land_id].name, color=produced)
             amount = land_mana_amount(state, player_id, land_id)
             used = min(generic_need, amount)
             generic_need -= used
@@ -259,7 +314,7 @@ def auto_pay_cost(
         if nonland_id:
             produced = next(iter(_ordered_colors(_nonland_mana_source_colors(state, nonland_id, state.cards[nonland_id]))), "C")
             state.cards[nonland_id].tapped = True
-            state.log.append(f"{player.name} taps {state.cards[nonland_id].name} for {produced} to pay spell cost.")
+            log_event(state, "mana_tap", _MANA_TAP_LINE, player=player.name, source=state.cards[nonland_id].name, color=produced)
             generic_need -= 1
             continue
         return False
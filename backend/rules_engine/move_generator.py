@@ -8,13 +8,18 @@ from rules_engine.continuous import effective_power, has_keyword
 from rules_engine.costs import activated_cost_available, check_cost_option_available, collect_cost_options, parse_activated_cost
 from rules_engine.cycling import cycling_cost, cycling_is_variable, cycling_variant
 from rules_engine.land_rules import compute_max_land_plays_this_turn
-from rules_engine.mana import can_pay_with_pool_and_lands
+from rules_engine.mana import can_pay_with_pool_and_lands, mana_availability
 from rules_engine.oracle_effects import extract_activated_abilities, extract_loyalty_abilities
 from rules_engine.library_permissions import top_library_creature_for_type
 from rules_engine.restrictions import card_cant_attack, can_cast_in_current_timing
 
 
-def legal_moves(state: MatchState, player_id: int) -> list[dict]:
+def legal_moves(state: MatchState, player_id: int, rollout: bool = False) -> list[dict]:
+    """Return every move ``player_id`` can take right now.
+
+    ``rollout`` serves AI playouts: the diagnostic ``*_restricted`` moves are
+    omitted and target hints are only built where casting legality needs them.
+    """
     if state.winner is not None:
         return []
     pending_order = getattr(state, "pending_trigger_order", None)
@@ -59,6 +64,8 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
 
     if state.priority_player != player_id:
         return moves
+    # Nothing below changes the board, so one snapshot serves every cost check.
+    availability = mana_availability(state, player_id)
 
     if state.step == Step.DECLARE_ATTACKERS and state.active_player == player_id and not getattr(state, "attackers_declared", False):
         restricted_attackers: list[dict] = []
@@ -71,18 +78,19 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
             and not has_keyword(state, cid, "defender")
             and not card_cant_attack(state, cid)
         ]
-        for cid in player.battlefield:
-            c = state.cards[cid]
-            if "Creature" not in c.types:
-                continue
-            if c.tapped:
-                restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Tapped"})
-            elif c.summoning_sick and not has_keyword(state, cid, "haste"):
-                restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Summoning sick"})
-            elif has_keyword(state, cid, "defender"):
-                restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Defender can't attack"})
-            elif card_cant_attack(state, cid):
-                restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Can't attack"})
+        if not rollout:
+            for cid in player.battlefield:
+                c = state.cards[cid]
+                if "Creature" not in c.types:
+                    continue
+                if c.tapped:
+                    restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Tapped"})
+                elif c.summoning_sick and not has_keyword(state, cid, "haste"):
+                    restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Summoning sick"})
+                elif has_keyword(state, cid, "defender"):
+                    restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Defender can't attack"})
+                elif card_cant_attack(state, cid):
+                    restricted_attackers.append({"type": "attack_restricted", "card_id": cid, "card_name": c.name, "reason": "Can't attack"})
         if attackers:
             defender_id = 1 if state.active_player == 2 else 2
             defenders = [{"id": f"player:{defender_id}", "label": state.players[defender_id].name, "kind": "player"}]
@@ -112,14 +120,17 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
         blocker_opts = [{"id": cid, "name": state.cards[cid].name} for cid in blockers]
         moves.append({"type": "block", "attackers": attacker_opts, "blockers": blocker_opts})
 
+    max_land_plays = compute_max_land_plays_this_turn(state, player_id)
     for cid in list(player.hand):
         card = state.cards[cid]
+        is_land = _is_land_card(card)
         cycle_cost = cycling_cost(card.oracle_text, allow_variable=True)
         if cycle_cost:
             x_values = range(0, 21) if cycling_is_variable(cycle_cost) else range(1)
             for x_value in x_values:
                 if not can_pay_with_pool_and_lands(
-                    state, player_id, cycle_cost, card_name=card.name, x_value=x_value
+                    state, player_id, cycle_cost, card_name=card.name, x_value=x_value,
+                    availability=availability,
                 ):
                     continue
                 cycle_move = {
@@ -134,7 +145,6 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
                 if cycling_is_variable(cycle_cost):
                     cycle_move["x_value"] = x_value
                 moves.append(cycle_move)
-        max_land_plays = compute_max_land_plays_this_turn(state, player_id)
         if getattr(player, "last_land_play_turn", 0) == state.turn:
             used_land_plays = max(
                 int(getattr(player, "lands_played_this_turn", 0)),
@@ -144,7 +154,7 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
             # Ignore stale counter drift from older turns; only this-turn land records matter.
             used_land_plays = 0
         if (
-            _is_land_card(card)
+            is_land
             and used_land_plays < max_land_plays
             and state.step in {Step.PRECOMBAT_MAIN, Step.POSTCOMBAT_MAIN}
             and state.active_player == player_id
@@ -153,11 +163,13 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
             moves.append({"type": "play_land", "card_id": cid})
         elif (
             card.zone == Zone.HAND
-            and not _is_land_card(card)
+            and not is_land
             and _can_cast_spell(state, card, player_id)
         ):
             timing_ok, timing_reason = can_cast_in_current_timing(state, card, player_id)
             if not timing_ok:
+                if rollout:
+                    continue
                 moves.append(
                     {
                         "type": "cast_spell_restricted",
@@ -168,11 +180,11 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
                 )
                 continue
             options = collect_cost_options(state, player_id, card)
-            available_options = [o for o in options if check_cost_option_available(state, player_id, card, o)]
+            available_options = _available_cost_options(state, player_id, card, options, availability, rollout)
             if not available_options:
                 continue
-            hints = build_cast_hints(state, card, player_id)
             oracle = (card.oracle_text or "").lower()
+            hints = build_cast_hints(state, card, player_id) if "target" in oracle or not rollout else {}
             if "target" in oracle and not _has_any_target_options(hints):
                 continue
             moves.append(
@@ -203,7 +215,6 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
         if int(player.exile_play_until.get(cid, 0) or 0) < int(state.turn):
             continue
         card = state.cards[cid]
-        max_land_plays = compute_max_land_plays_this_turn(state, player_id)
         used_land_plays = max(
             int(getattr(player, "lands_played_this_turn", 0)),
             int(getattr(player, "land_plays_recorded_on_turn", 0)),
@@ -221,11 +232,12 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
             if not timing_ok:
                 continue
             options = collect_cost_options(state, player_id, card)
-            available_options = [o for o in options if check_cost_option_available(state, player_id, card, o)]
+            available_options = _available_cost_options(state, player_id, card, options, availability, rollout)
             if not available_options:
                 continue
-            hints = build_cast_hints(state, card, player_id)
-            if "target" in (card.oracle_text or "").lower() and not _has_any_target_options(hints):
+            oracle = (card.oracle_text or "").lower()
+            hints = build_cast_hints(state, card, player_id) if "target" in oracle or not rollout else {}
+            if "target" in oracle and not _has_any_target_options(hints):
                 continue
             moves.append(
                 {
@@ -250,7 +262,7 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
     if top_card is not None and _can_cast_spell(state, top_card, player_id):
         timing_ok, _ = can_cast_in_current_timing(state, top_card, player_id)
         options = collect_cost_options(state, player_id, top_card)
-        available_options = [o for o in options if check_cost_option_available(state, player_id, top_card, o)]
+        available_options = _available_cost_options(state, player_id, top_card, options, availability, rollout)
         if timing_ok and available_options:
             moves.append(
                 {
@@ -271,7 +283,9 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
                         }
                         for o in available_options
                     ],
-                    "target_hints": build_cast_hints(state, top_card, player_id),
+                    "target_hints": build_cast_hints(state, top_card, player_id)
+                    if "target" in (top_card.oracle_text or "").lower() or not rollout
+                    else {},
                 }
             )
 
@@ -291,8 +305,11 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
                     next_loyalty = (card.loyalty or 0) + int(ability["delta"])
                 if next_loyalty < 0:
                     continue
-                hints_card = type("LoyaltyOracleProxy", (), {"oracle_text": ability["text"], "mana_cost": "", "name": card.name})()
-                hints = build_cast_hints(state, hints_card, player_id)
+                if rollout and "target" not in ability["text"].lower():
+                    hints = {}
+                else:
+                    hints_card = type("LoyaltyOracleProxy", (), {"oracle_text": ability["text"], "mana_cost": "", "name": card.name})()
+                    hints = build_cast_hints(state, hints_card, player_id)
                 if ability.get("x_cost"):
                     hints["requires_x_value"] = True
                 moves.append(
@@ -315,10 +332,13 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
         for ability in extract_activated_abilities(card):
             cost = ability["mana_cost"]
             parsed_cost = parse_activated_cost(cost)
-            if not parsed_cost.supported or not activated_cost_available(state, player_id, cid, cost):
+            if not parsed_cost.supported or not activated_cost_available(state, player_id, cid, cost, availability=availability):
                 continue
-            proxy = type("ActivatedOracleProxy", (), {"oracle_text": ability["text"], "mana_cost": "", "name": card.name})()
-            hints = build_cast_hints(state, proxy, player_id)
+            if rollout and "target" not in ability["text"].lower():
+                hints = {}
+            else:
+                proxy = type("ActivatedOracleProxy", (), {"oracle_text": ability["text"], "mana_cost": "", "name": card.name})()
+                hints = build_cast_hints(state, proxy, player_id)
             moves.append(
                 {
                     "type": "activate_ability",
@@ -340,7 +360,7 @@ def legal_moves(state: MatchState, player_id: int) -> list[dict]:
             equip_cost = _extract_equip_cost(card.oracle_text or "")
             if not equip_cost:
                 continue
-            if not can_pay_with_pool_and_lands(state, player_id, equip_cost):
+            if not can_pay_with_pool_and_lands(state, player_id, equip_cost, availability=availability):
                 continue
             if own_creatures:
                 moves.append(
@@ -396,6 +416,14 @@ def _can_cast_spell(state: MatchState, card, player_id: int) -> bool:
     return False
 
 
+def _available_cost_options(state: MatchState, player_id: int, card, options, availability, rollout: bool) -> list:
+    # Playouts cast with the engine's default choice, the first payable option.
+    if rollout:
+        first = next((o for o in options if check_cost_option_available(state, player_id, card, o, availability=availability)), None)
+        return [first] if first is not None else []
+    return [o for o in options if check_cost_option_available(state, player_id, card, o, availability=availability)]
+
+
 def _has_any_target_options(hints: dict) -> bool:
     return any(
         bool(hints.get(key))
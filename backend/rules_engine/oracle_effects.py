@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Any
 
+from game_state.match_log import log_event
+from game_state.telemetry import record_anomaly
 from game_state.state import CardInstance, MatchState, Zone
 from rules_engine.mana import choose_mana_color_for_player, parse_mana_cost
 
@@ -205,7 +208,15 @@ def infer_effect_from_oracle(
     if _looks_static_or_keyword_only(card.oracle_text or "") or _is_event_layer_resolved(card.oracle_text or ""):
         return "noop", {}
     # Fallback: log uninferrable oracle text instead of silent no-op.
-    state.log.append(f"Oracle effect not inferred for {card.name} (controller={controller}). Text: {card.oracle_text[:120]}")
+    log_event(
+        state, "oracle_fallback", "Oracle effect not inferred for {card} (controller={controller}). Text: {text}",
+        card=card.name, controller=controller, text=card.oracle_text[:120],
+    )
+    record_anomaly(
+        state, "oracle_fallbacks",
+        f"Oracle effect not inferred for {card.name} (controller={controller}). Text: {card.oracle_text[:120]}",
+        card_name=card.name,
+    )
     return "noop", {}
 
 
@@ -759,7 +770,11 @@ def _split_clauses(oracle: str) -> list[str]:
 
 
 def extract_loyalty_abilities(card: CardInstance) -> list[dict[str, Any]]:
-    oracle = card.oracle_text or ""
+    return [dict(ability) for ability in _loyalty_abilities(card.oracle_text or "")]
+
+
+@lru_cache(maxsize=4096)
+def _loyalty_abilities(oracle: str) -> tuple[dict[str, Any], ...]:
     out: list[dict[str, Any]] = []
     for match in LOYALTY_ABILITY_RE.finditer(oracle):
         raw_delta = match.group(1).strip()
@@ -778,7 +793,7 @@ def extract_loyalty_abilities(card: CardInstance) -> list[dict[str, Any]]:
         else:
             delta = int(raw_delta)
             out.append({"delta": delta, "x_cost": False, "x_sign": 0, "text": text, "label": f"{delta:+d}: {text}"})
-    return out
+    return tuple(out)
 
 
 def extract_saga_chapters(oracle_text: str) -> list[dict[str, Any]]:
@@ -796,8 +811,14 @@ def extract_saga_chapters(oracle_text: str) -> list[dict[str, Any]]:
 
 def extract_activated_abilities(card: CardInstance) -> list[dict[str, Any]]:
     """Extract simple mana-cost activated abilities from a card surface."""
+    return [dict(ability) for ability in _activated_abilities(card.oracle_text or "")]
+
+
+# Parsed per oracle text; callers get fresh dicts so the cache stays pristine.
+@lru_cache(maxsize=4096)
+def _activated_abilities(oracle: str) -> tuple[dict[str, Any], ...]:
     out: list[dict[str, Any]] = []
-    for index, match in enumerate(ACTIVATED_ABILITY_RE.finditer(card.oracle_text or "")):
+    for index, match in enumerate(ACTIVATED_ABILITY_RE.finditer(oracle)):
         cost = match.group(1).strip().upper()
         text = match.group(2).strip()
         # Mana abilities are handled by the mana source model and should not
@@ -805,7 +826,7 @@ def extract_activated_abilities(card: CardInstance) -> list[dict[str, Any]]:
         if "add " in text.lower() and "target" not in text.lower():
             continue
         out.append({"index": index, "mana_cost": cost, "text": text, "label": f"{cost}: {text}"})
-    return out
+    return tuple(out)
 
 
 def crew_value(card: CardInstance) -> int | None:
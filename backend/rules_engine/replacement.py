@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-import re
+from rules_engine.card_abilities import DIE_EXILE_RE, CardAbilities, card_abilities
+from rules_engine.continuous import battlefield_position_map, effect_timestamp
 
-from rules_engine.continuous import effect_timestamp
 
+def _battlefield_oracle_texts(state, controller: int | None = None, kind: str | None = None):
+    for card, abilities in _battlefield_abilities(state, controller=controller, kind=kind):
+        yield card, abilities.text
 
-def _battlefield_oracle_texts(state, controller: int | None = None):
-    ordered: list[tuple[tuple[int, int, int, str], object, str]] = []
-    battlefield_index = _battlefield_position_map(state)
+
+def _battlefield_abilities(state, controller: int | None = None, kind: str | None = None):
+    """Yield battlefield cards newest-first with their compiled abilities.
+
+    ``kind`` narrows the scan to sources with that replacement kind.
+    """
+    ordered: list[tuple[tuple[int, int, int, str], object, CardAbilities]] = []
+    battlefield_index = battlefield_position_map(state)
     for pid in state.players:
         for cid in state.players[pid].battlefield:
             card = state.cards[cid]
             if controller is not None and card.controller != controller:
                 continue
+            abilities = card_abilities(card)
+            if kind is not None and kind not in abilities.replacement_kinds:
+                continue
             order_key = (
                 -effect_timestamp(card),
                 -int(getattr(card, "entered_turn", 0) or 0),
@@ -20,37 +31,15 @@ def _battlefield_oracle_texts(state, controller: int | None = None):
                 -int(getattr(card, "instance_order", 0) or 0),
                 str(cid),
             )
-            ordered.append((order_key, card, (card.oracle_text or "").lower()))
-    for _, card, text in sorted(ordered, key=lambda item: item[0]):
-        yield card, text
-
-
-def _battlefield_position_map(state) -> dict[str, int]:
-    positions: dict[str, int] = {}
-    position = 0
-    for pid in sorted(state.players):
-        for cid in state.players[pid].battlefield:
-            positions[cid] = position
-            position += 1
-    return positions
+            ordered.append((order_key, card, abilities))
+    for _, card, abilities in sorted(ordered, key=lambda item: item[0]):
+        yield card, abilities
 
 
 def _matches_phrase(text: str, phrases: tuple[str, ...]) -> bool:
     return any(phrase in text for phrase in phrases)
 
 
-_PLAYER_DAMAGE_PREVENTION_RE = re.compile(
-    r"if a source would deal damage to (?:you|you or (?:a|an|target) (?:permanent|creature) you control|(?:a|an|target) (?:permanent|creature) you control), prevent 1 of that damage"
-)
-_PERMANENT_DAMAGE_PREVENTION_RE = re.compile(
-    r"if a source would deal damage to (?:you or (?:a|an|target) (?:permanent|creature) you control|(?:a|an|target) (?:permanent|creature) you control|(?:a|an|target) permanent you control|(?:a|an|target) creature you control), prevent 1 of that damage"
-)
-_DIE_EXILE_RE = re.compile(
-    r"if a (?:non-token|nontoken|another )?(?:creature|permanent|artifact|enchantment|artifact or enchantment) you control would die, exile it instead"
-    r"|if an? artifact or enchantment you control would die, exile it instead"
-)
-
-
 def replacement_options(
     state,
     event: str,
@@ -78,28 +67,24 @@ def replacement_options(
     candidates: list[tuple[object, str]] = []
     if event_key in {"damage_to_player", "player_damage"} and target_player in state.players:
         candidates = [
-            (card, text)
-            for card, text in _battlefield_oracle_texts(state, controller=target_player)
-            if _PLAYER_DAMAGE_PREVENTION_RE.search(text)
+            (card, abilities.text)
+            for card, abilities in _battlefield_abilities(state, controller=target_player, kind="prevent_player_damage")
         ]
     elif event_key in {"damage_to_permanent", "permanent_damage"} and target_card_id in state.cards:
         target = state.cards[target_card_id]
         candidates = [
-            (card, text)
-            for card, text in _battlefield_oracle_texts(state, controller=target.controller)
-            if _PERMANENT_DAMAGE_PREVENTION_RE.search(text)
+            (card, abilities.text)
+            for card, abilities in _battlefield_abilities(state, controller=target.controller, kind="prevent_permanent_damage")
         ]
     elif event_key in {"life_gain", "gain_life"} and target_player in state.players:
         candidates = [
-            (card, text)
-            for card, text in _battlefield_oracle_texts(state, controller=target_player)
-            if "if you would gain life, draw that many cards instead" in text
+            (card, abilities.text)
+            for card, abilities in _battlefield_abilities(state, controller=target_player, kind="life_gain_to_draw")
         ]
     elif event_key in {"card_draw", "draw"} and target_player in state.players:
         candidates = [
-            (card, text)
-            for card, text in _battlefield_oracle_texts(state, controller=target_player)
-            if "if you would draw a card, gain 1 life instead" in text
+            (card, abilities.text)
+            for card, abilities in _battlefield_abilities(state, controller=target_player, kind="draw_to_life_gain")
         ]
     elif event_key in {"die_zone", "dies"} and target_card_id in state.cards:
         target = state.cards[target_card_id]
@@ -108,10 +93,10 @@ def replacement_options(
             or "token" in {str(t).lower() for t in (target.types or [])}
         )
         candidates = [
-            (card, text)
-            for card, text in _battlefield_oracle_texts(state, controller=target.controller)
-            if not (is_token and ("nontoken" in text or "non-token" in text))
-            and _DIE_EXILE_RE.search(text)
+            (card, abilities.text)
+            for card, abilities in _battlefield_abilities(state, controller=target.controller, kind="die_exile")
+            if not (is_token and ("nontoken" in abilities.text or "non-token" in abilities.text))
+            and DIE_EXILE_RE.search(abilities.text)
         ]
     return [
         {
@@ -136,9 +121,8 @@ def apply_damage_replacements(
     if target_player is None:
         return out
     candidates = [
-        (card, text)
-        for card, text in _battlefield_oracle_texts(state, controller=target_player)
-        if _PLAYER_DAMAGE_PREVENTION_RE.search(text)
+        (card, abilities.text)
+        for card, abilities in _battlefield_abilities(state, controller=target_player, kind="prevent_player_damage")
     ]
     used: set[str] = set()
     requested = replacement_source_id
@@ -167,9 +151,8 @@ def apply_permanent_damage_replacements(
         return out
     target = state.cards[target_card_id]
     candidates = [
-        (card, text)
-        for card, text in _battlefield_oracle_texts(state, controller=target.controller)
-        if _PERMANENT_DAMAGE_PREVENTION_RE.search(text)
+        (card, abilities.text)
+        for card, abilities in _battlefield_abilities(state, controller=target.controller, kind="prevent_permanent_damage")
     ]
     used: set[str] = set()
     requested = replacement_source_id
@@ -206,7 +189,7 @@ def replace_noncombat_damage_to_creature(
         return None
     candidates = [
         (card, text)
-        for card, text in _battlefield_oracle_texts(state, controller=source.controller)
+        for card, text in _battlefield_oracle_texts(state, controller=source.controller, kind="noncombat_damage_to_counters")
         if (
             "would deal noncombat damage to a creature an opponent controls" in text
             or "would deal noncombat damage to a creature your opponent controls" in text
@@ -257,7 +240,8 @@ def damage_cant_be_prevented(
     if bool(getattr(state, "turn_damage_cant_be_prevented", False)):
         return True
     source = state.cards[source_card_id] if source_card_id and source_card_id in state.cards else None
-    for card, text in _battlefield_oracle_texts(state):
+    for card, abilities in _battlefield_abilities(state, kind="damage_cant_be_prevented"):
+        text = abilities.text
         if _matches_phrase(text, ("damage can't be prevented", "damage cannot be prevented")):
             return True
         if combat and _matches_phrase(text, ("combat damage can't be prevented", "combat damage cannot be prevented")):
@@ -323,7 +307,7 @@ def replace_gain_life(
     used = {str(value) for value in (used_source_ids or [])}
     candidates = [
         (card, text)
-        for card, text in _battlefield_oracle_texts(state, controller=target_player)
+        for card, text in _battlefield_oracle_texts(state, controller=target_player, kind="life_gain_to_draw")
         if str(getattr(card, "id", "")) not in used
         and "if you would gain life, draw that many cards instead" in text
     ]
@@ -353,7 +337,7 @@ def replace_draw_cards(
     used = {str(value) for value in (used_source_ids or [])}
     candidates = [
         (card, text)
-        for card, text in _battlefield_oracle_texts(state, controller=target_player)
+        for card, text in _battlefield_oracle_texts(state, controller=target_player, kind="draw_to_life_gain")
         if str(getattr(card, "id", "")) not in used
         and "if you would draw a card, gain 1 life instead" in text
     ]
@@ -383,7 +367,8 @@ def replace_die_zone(
     target = state.cards.get(card_id)
     is_token = bool(target and (getattr(target, "is_token", False) or "token" in {str(t).lower() for t in (target.types or [])}))
     candidates: list[tuple[object, str]] = []
-    for card, text in _battlefield_oracle_texts(state, controller=controller):
+    for card, abilities in _battlefield_abilities(state, controller=controller, kind="die_exile"):
+        text = abilities.text
         if is_token and ("nontoken" in text or "non-token" in text):
             continue
         if _matches_phrase(
@@ -401,7 +386,7 @@ def replace_die_zone(
         ):
             candidates.append((card, text))
             continue
-        if _DIE_EXILE_RE.search(text):
+        if DIE_EXILE_RE.search(text):
             candidates.append((card, text))
     if _choose_replacement_candidate(state, candidates, replacement_source_id, "die zone") is not None:
         return "exile"
@@ -414,7 +399,10 @@ def player_cant_gain_life(state, target_player: int) -> bool:
     for pid in state.players:
         for cid in state.players[pid].battlefield:
             card = state.cards[cid]
-            text = (card.oracle_text or "").lower()
+            abilities = card_abilities(card)
+            if "cant_gain_life" not in abilities.replacement_kinds:
+                continue
+            text = abilities.text
             if "players can't gain life" in text or "players cannot gain life" in text:
                 return True
             if "you can't gain life" in text or "you cannot gain life" in text:
@@ -433,7 +421,10 @@ def player_cant_lose_life(state, target_player: int) -> bool:
     for pid in state.players:
         for cid in state.players[pid].battlefield:
             card = state.cards[cid]
-            text = (card.oracle_text or "").lower()
+            abilities = card_abilities(card)
+            if "cant_lose_life" not in abilities.replacement_kinds:
+                continue
+            text = abilities.text
             if "players can't lose life" in text or "players cannot lose life" in text:
                 return True
             if card.controller == target_player and ("you can't lose life" in text or "you cannot lose life" in text):
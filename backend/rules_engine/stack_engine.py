@@ -1,18 +1,19 @@
 from __future__ import annotations
 
-import uuid
-
 from effects.registry import resolve_effect
-from game_state.state import MatchState, StackItem, Zone, assign_static_order_on_battlefield_entry
+from game_state.match_log import log_event
+from game_state.state import MatchState, StackItem, Zone, allocate_object_id, assign_static_order_on_battlefield_entry
 from rules_engine.attachments import attach_if_legal, is_aura
 from rules_engine.events import emit_event
 from rules_engine.library_permissions import choose_type_for_realmwalker
 from rules_engine.replacement import replacement_options
 
+_RESOLVES_LINE = "{label} resolves."
+
 
 def add_to_stack(state: MatchState, source_card_id: str, controller: int, label: str, effect_key: str, payload: dict, targets: list[str] | None = None) -> StackItem:
     item = StackItem(
-        id=str(uuid.uuid4()),
+        id=allocate_object_id(state, "stack"),
         source_card_id=source_card_id,
         controller=controller,
         label=label,
@@ -21,7 +22,7 @@ def add_to_stack(state: MatchState, source_card_id: str, controller: int, label:
         targets=targets or [],
     )
     state.stack.append(item)
-    state.log.append(f"{state.players[controller].name} casts/activates {label}.")
+    log_event(state, "stack_push", "{player} casts/activates {label}.", player=state.players[controller].name, label=label)
     emit_event(
         state,
         "spell_cast",
@@ -95,16 +96,16 @@ def resolve_top_of_stack(state: MatchState) -> bool:
             }
             state.priority_player = target_player
             state.passed_priority = set()
-            state.log.append(
-                f"Replacement choice required for {event}; "
-                f"{state.players[target_player].name} must choose one of {len(options)} effects."
+            log_event(
+                state, "replacement_choice", "Replacement choice required for {event}; {player} must choose one of {count} effects.",
+                event=event, player=state.players[target_player].name, count=len(options),
             )
             return False
     state.stack.pop()
     payload = dict(item.payload or {})
     is_trigger = bool(payload.get("__trigger_event"))
     if bool(payload.get("__may")) and not bool(payload.get("__may_choose", True)):
-        state.log.append(f"{state.players[item.controller].name} declines optional effect: {item.label}.")
+        log_event(state, "optional_declined", "{player} declines optional effect: {label}.", player=state.players[item.controller].name, label=item.label)
         return True
     payload["__source_card_id"] = item.source_card_id
     resolve_effect(state, item.controller, item.effect_key, payload)
@@ -139,7 +140,7 @@ def resolve_top_of_stack(state: MatchState) -> bool:
             if "as this creature enters, choose a creature type" in (card.oracle_text or "").lower():
                 selected = str(payload.get("chosen_creature_type") or "").strip().lower()
                 card.chosen_creature_type = selected or choose_type_for_realmwalker(state, card.controller)
-                state.log.append(f"{card.name} chooses creature type {card.chosen_creature_type}.")
+                log_event(state, "creature_type_chosen", "{card} chooses creature type {creature_type}.", card=card.name, creature_type=card.chosen_creature_type)
             if "enters with x +1/+1 counters" in (card.oracle_text or "").lower():
                 x_value = max(0, int(payload.get("x_value", 0) or 0))
                 if x_value:
@@ -150,9 +151,9 @@ def resolve_top_of_stack(state: MatchState) -> bool:
                     owner.battlefield.remove(card.id)
                     owner.graveyard.append(card.id)
                     card.zone = Zone.GRAVEYARD
-                    state.log.append(f"{card.name} has no legal attachment target and is put into graveyard.")
-                    state.log.append(f"{item.label} resolves.")
+                    log_event(state, "attachment_failed", "{card} has no legal attachment target and is put into graveyard.", card=card.name)
+                    log_event(state, "stack_resolve", _RESOLVES_LINE, label=item.label)
                     return True
             emit_event(state, "enters_battlefield", {"card_id": card.id, "controller": card.controller})
-    state.log.append(f"{item.label} resolves.")
+    log_event(state, "stack_resolve", _RESOLVES_LINE, label=item.label)
     return True
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from game_state.caches import set_private_cache
+from game_state.match_log import log_event
 from game_state.state import MatchState, Zone
 from rules_engine.attachments import attached_to, attachment_target_is_legal, is_aura, is_equipment
 from rules_engine.events import emit_event, emit_event_batch
-from rules_engine.continuous import effective_toughness, has_keyword
+from rules_engine.continuous import effective_toughness, has_keyword, layer_inputs_key
 from rules_engine.replacement import replace_die_zone, replacement_options
 
+_EXILED_INSTEAD_LINE = "State-based action: {card} is exiled instead of dying."
+_LETHAL_LINE = "State-based action: {card} is put into graveyard due to lethal damage or 0 toughness."
+_REPLACEMENT_CHOICE_LINE = "Replacement choice required for {event}; {player} must choose one of {count} effects."
+
 DMG_MARK_KEY = "__damage_marked"
 DEATHTOUCH_MARK_KEY = "__deathtouch_damaged"
 
@@ -32,11 +38,11 @@ def _move_lethal_creature(state: MatchState, card_id: str, replacement_source_id
     if destination == "exile":
         zone_owner.exile.append(card_id)
         card.zone = Zone.EXILE
-        state.log.append(f"State-based action: {card.name} is exiled instead of dying.")
+        log_event(state, "sba_exiled", _EXILED_INSTEAD_LINE, card=card.name)
         return
     zone_owner.graveyard.append(card_id)
     card.zone = Zone.GRAVEYARD
-    state.log.append(f"State-based action: {card.name} is put into graveyard due to lethal damage or 0 toughness.")
+    log_event(state, "sba_dies", _LETHAL_LINE, card=card.name)
     emit_event(state, "permanent_dies", {"card_id": card_id, "controller": card.controller})
     emit_event(state, "creature_dies", {"card_id": card_id, "controller": card.controller})
 
@@ -65,14 +71,16 @@ def resume_legend_rule_replacement(
     if destination == "exile":
         owner.exile.append(card_id)
         card.zone = Zone.EXILE
-        state.log.append(
-            f"State-based action: {state.players[player_id].name} keeps one {card.name}; the other is exiled by a replacement effect (legend rule)."
+        log_event(
+            state, "legend_rule", "State-based action: {player} keeps one {card}; the other is exiled by a replacement effect (legend rule).",
+            player=state.players[player_id].name, card=card.name,
         )
         return
     owner.graveyard.append(card_id)
     card.zone = Zone.GRAVEYARD
-    state.log.append(
-        f"State-based action: {state.players[player_id].name} keeps one {card.name}; the other is put into graveyard (legend rule)."
+    log_event(
+        state, "legend_rule", "State-based action: {player} keeps one {card}; the other is put into graveyard (legend rule).",
+        player=state.players[player_id].name, card=card.name,
     )
     emit_event(state, "permanent_dies", {"card_id": card_id, "controller": card.controller})
     if "Creature" in card.types:
@@ -108,29 +116,64 @@ def _resolve_lethal_creature_batch(state: MatchState, card_ids: list[str]) -> No
         if destination == "exile":
             owner.exile.append(cid)
             card.zone = Zone.EXILE
-            state.log.append(f"State-based action: {card.name} is exiled instead of dying.")
+            log_event(state, "sba_exiled", _EXILED_INSTEAD_LINE, card=card.name)
             continue
         owner.graveyard.append(cid)
         card.zone = Zone.GRAVEYARD
-        state.log.append(f"State-based action: {card.name} is put into graveyard due to lethal damage or 0 toughness.")
+        log_event(state, "sba_dies", _LETHAL_LINE, card=card.name)
         event = {"card_id": cid, "controller": card.controller}
         death_events.append(event)
         creature_death_events.append(event)
     emit_event_batch(state, "permanent_dies", death_events)
     emit_event_batch(state, "creature_dies", creature_death_events)
 
+def _sba_inputs(card) -> tuple:
+    return (tuple(card.counters.items()), card.loyalty, card.attached_to, tuple(card.types))
+
+
+def _sba_candidates(state: MatchState) -> tuple[dict | None, list[str], bool]:
+    """Return battlefield ids whose state-based inputs changed since the last clean check.
+
+    A change to the layer inputs (characteristics, battlefield membership,
+    graveyard sizes) rechecks every permanent, since it can move effective
+    toughness, keywords and attachment legality. Otherwise only permanents
+    whose counters (damage marks included), loyalty, attachment or types
+    changed are checked. The flag asks for a full pass, which also covers
+    the legend rule. Lightweight fixtures without player zones always get one.
+    """
+    key = layer_inputs_key(state)
+    if key is None:
+        return None, [cid for cid, card in list(state.cards.items()) if card.zone == Zone.BATTLEFIELD], True
+    memo = state.__dict__.get("_sba_memo")
+    if memo is None or memo["key"] != key or len(memo["order"]) != len(state.cards):
+        memo = {"key": key, "order": {cid: index for index, cid in enumerate(state.cards)}, "clean": {}, "stack": None}
+        set_private_cache(state, "_sba_memo", memo)
+    clean = memo["clean"]
+    order = memo["order"]
+    dirty = [
+        cid
+        for cid in dict.fromkeys(cid for player in state.players.values() for cid in player.battlefield)
+        if cid in order and clean.get(cid) != _sba_inputs(state.cards[cid])
+    ]
+    dirty.sort(key=order.__getitem__)
+    return memo, dirty, not clean
+
+
 def apply_state_based_actions(state: MatchState) -> None:
     for pid, player in state.players.items():
         if player.life <= 0:
             state.winner = 1 if pid == 2 else 2
-            state.log.append(f"{player.name} has 0 or less life and loses.")
+            log_event(state, "player_loses", "{player} has 0 or less life and loses.", player=player.name)
 
+    memo, candidates, full = _sba_candidates(state)
     lethal_ids: list[str] = []
-    for cid, card in list(state.cards.items()):
+    for cid in candidates:
+        card = state.cards[cid]
         if "Creature" in card.types and card.zone == Zone.BATTLEFIELD and card.toughness is not None:
-            lethal_from_zero_toughness = effective_toughness(state, cid) <= 0
+            toughness = effective_toughness(state, cid)
+            lethal_from_zero_toughness = toughness <= 0
             indestructible = has_keyword(state, cid, "indestructible")
-            lethal_from_damage = int(card.counters.get(DMG_MARK_KEY, 0)) >= int(effective_toughness(state, cid))
+            lethal_from_damage = int(card.counters.get(DMG_MARK_KEY, 0)) >= int(toughness)
             lethal_from_deathtouch = int(card.counters.get(DEATHTOUCH_MARK_KEY, 0)) > 0
             if lethal_from_zero_toughness or (not indestructible and (lethal_from_damage or lethal_from_deathtouch)):
                 options = replacement_options(state, "die_zone", target_card_id=cid)
@@ -144,15 +187,17 @@ def apply_state_based_actions(state: MatchState) -> None:
                     }
                     state.priority_player = card.controller
                     state.passed_priority = set()
-                    state.log.append(
-                        f"Replacement choice required for lethal state-based action; {state.players[card.controller].name} must choose one of {len(options)} effects."
+                    log_event(
+                        state, "replacement_choice", _REPLACEMENT_CHOICE_LINE,
+                        event="lethal state-based action", player=state.players[card.controller].name, count=len(options),
                     )
                     return
                 lethal_ids.append(cid)
     if lethal_ids:
         _resolve_lethal_creature_batch(state, lethal_ids)
 
-    for cid, card in list(state.cards.items()):
+    for cid in candidates:
+        card = state.cards[cid]
         if "Planeswalker" in card.types and card.zone == Zone.BATTLEFIELD and card.loyalty is not None and card.loyalty <= 0:
             battlefield_owner = state.players[card.controller]
             zone_owner = state.players[getattr(card, "owner", card.controller)]
@@ -161,16 +206,34 @@ def apply_state_based_actions(state: MatchState) -> None:
                 battlefield_owner.battlefield.remove(cid)
                 zone_owner.graveyard.append(cid)
                 card.zone = Zone.GRAVEYARD
-                state.log.append(f"State-based action: {card.name} is put into graveyard due to 0 loyalty.")
+                log_event(state, "sba_loyalty", "State-based action: {card} is put into graveyard due to 0 loyalty.", card=card.name)
                 emit_event(state, "permanent_dies", {"card_id": cid, "controller": card.controller})
 
-    _apply_legend_rule(state)
-    _apply_saga_state_actions(state)
-    _apply_attachment_state_checks(state)
+    if not full and layer_inputs_key(state) != memo["key"]:
+        # Something died, so the remaining checks see a changed battlefield.
+        full = True
+    if full:
+        _apply_legend_rule(state)
+    stack_sources = tuple(item.source_card_id for item in state.stack)
+    if memo is None or full or memo["stack"] != stack_sources:
+        _apply_saga_state_actions(state)
+    else:
+        _apply_saga_state_actions(state, candidates)
+    _apply_attachment_state_checks(state, None if full else candidates)
 
+    if memo is not None and not state.pending_replacement_choice and layer_inputs_key(state) == memo["key"]:
+        # Nothing left the battlefield, so every permanent now passes the checks.
+        memo["clean"] = {
+            cid: _sba_inputs(state.cards[cid])
+            for player in state.players.values()
+            for cid in player.battlefield
+            if cid in state.cards
+        }
+        memo["stack"] = stack_sources
 
-def _apply_saga_state_actions(state: MatchState) -> None:
-    for cid, card in list(state.cards.items()):
+
+def _apply_saga_state_actions(state: MatchState, card_ids: list[str] | None = None) -> None:
+    for cid, card in _cards_to_check(state, card_ids):
         if card.zone != Zone.BATTLEFIELD or "Saga" not in (card.type_line or ""):
             continue
         chapters = [int(item) for item in _saga_chapter_numbers(card.oracle_text)]
@@ -186,7 +249,13 @@ def _apply_saga_state_actions(state: MatchState) -> None:
         battlefield.battlefield.remove(cid)
         owner.graveyard.append(cid)
         card.zone = Zone.GRAVEYARD
-        state.log.append(f"State-based action: {card.name} is sacrificed after its final chapter.")
+        log_event(state, "saga_sacrificed", "State-based action: {card} is sacrificed after its final chapter.", card=card.name)
+
+
+def _cards_to_check(state: MatchState, card_ids: list[str] | None) -> list[tuple]:
+    if card_ids is None:
+        return list(state.cards.items())
+    return [(cid, state.cards[cid]) for cid in card_ids]
 
 
 def _saga_chapter_numbers(oracle_text: str) -> list[int]:
@@ -231,8 +300,9 @@ def _apply_legend_rule(state: MatchState) -> None:
                     }
                     state.priority_player = card.controller
                     state.passed_priority = set()
-                    state.log.append(
-                        f"Replacement choice required for legend rule; {state.players[card.controller].name} must choose one of {len(options)} effects."
+                    log_event(
+                        state, "replacement_choice", _REPLACEMENT_CHOICE_LINE,
+                        event="legend rule", player=state.players[card.controller].name, count=len(options),
                     )
                     return
                 resume_legend_rule_replacement(state, pid, cid, "")
@@ -253,8 +323,8 @@ def _is_legendary(card) -> bool:
     return False
 
 
-def _apply_attachment_state_checks(state: MatchState) -> None:
-    for cid, card in list(state.cards.items()):
+def _apply_attachment_state_checks(state: MatchState, card_ids: list[str] | None = None) -> None:
+    for cid, card in _cards_to_check(state, card_ids):
         if card.zone != Zone.BATTLEFIELD:
             continue
         if not (is_aura(card) or is_equipment(card)):
@@ -267,7 +337,7 @@ def _apply_attachment_state_checks(state: MatchState) -> None:
                     owner.battlefield.remove(cid)
                     owner.graveyard.append(cid)
                     card.zone = Zone.GRAVEYARD
-                    state.log.append(f"State-based action: {card.name} has no legal attachment and is put into graveyard.")
+                    log_event(state, "sba_unattached", "State-based action: {card} has no legal attachment and is put into graveyard.", card=card.name)
             continue
         target = state.cards.get(target_id)
         if not attachment_target_is_legal(state, card, target_id):
@@ -277,7 +347,7 @@ def _apply_attachment_state_checks(state: MatchState) -> None:
                     owner.battlefield.remove(cid)
                     owner.graveyard.append(cid)
                     card.zone = Zone.GRAVEYARD
-                    state.log.append(f"State-based action: {card.name} loses attachment and is put into graveyard.")
+                    log_event(state, "sba_unattached", "State-based action: {card} loses attachment and is put into graveyard.", card=card.name)
             elif is_equipment(card):
                 card.attached_to = None
-                state.log.append(f"State-based action: {card.name} becomes unattached.")
+                log_event(state, "sba_unattached", "State-based action: {card} becomes unattached.", card=card.name)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+try:  # pragma: no cover - import path bootstrap for CLI execution
+    from . import _bootstrap  # type: ignore[attr-defined]  # noqa: F401
+except ImportError:  # pragma: no cover - direct script execution
+    import _bootstrap  # noqa: F401
+import argparse
+import hashlib
+import json
+import time
+from itertools import combinations
+from pathlib import Path
+
+from ai.agent import AIAgent
+from ai.deck_analysis import guess_archetype
+from card_data.hydration import hydrate_deck_cards
+from decks.bootstrap import ensure_builtin_decks
+from decks.selection import select_representative_decks
+from game_state.state import MatchFactory
+from persistence.db import engine
+from persistence.repository import Repository
+from rules_engine.engine import RulesEngine
+from sqlmodel import Session
+
+MODES = ("mcts", "rollout")
+
+
+def _stable_seed(left_name: str, right_name: str, index: int) -> int:
+    digest = hashlib.sha256(f"mcts::{left_name}::{right_name}::{index}".encode("utf-8")).hexdigest()
+    return int(digest[:8], 16)
+
+
+def _agent(mode: str, deck: list[dict], opponent: list[dict], simulations: int) -> AIAgent:
+    return AIAgent(
+        difficulty="master_plus",
+        archetype=guess_archetype(deck),
+        opponent_archetype=guess_archetype(opponent),
+        mcts_simulations=simulations if mode == "mcts" else 0,
+    )
+
+
+def play_game(deck_a: list[dict], deck_b: list[dict], seed: int, modes: tuple[str, str], simulations: int, max_ticks: int) -> dict:
+    """Play one seeded master_plus game with the given lookahead mode per seat."""
+    state = MatchFactory.from_decks(deck_a, deck_b, seed=seed)
+    engine_rules = RulesEngine()
+    agents = {1: _agent(modes[0], deck_a, deck_b, simulations), 2: _agent(modes[1], deck_b, deck_a, simulations)}
+    cpu = {1: 0.0, 2: 0.0}
+    decisions = {1: 0, 2: 0}
+    ticks = 0
+    while state.winner is None and ticks < max_ticks:
+        pid = 1 if state.pregame_pending and 1 not in state.kept_hands else (2 if state.pregame_pending else state.priority_player)
+        legal = engine_rules.legal_moves(state, pid)
+        if not legal:
+            action = {"type": "pass_priority"}
+        else:
+            started = time.process_time()
+            action = agents[pid].choose_action(state, legal, pid).action
+            cpu[pid] += time.process_time() - started
+            decisions[pid] += 1
+        engine_rules.take_action(state, pid, action)
+        if state.step == state.step.COMBAT_DAMAGE:
+            engine_rules.take_action(state, state.active_player, {"type": "combat_damage"})
+        ticks += 1
+    return {"winner": state.winner, "turn": state.turn, "cpu": cpu, "decisions": decisions}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compare the experimental master_plus UCT search against the default greedy rollouts")
+    p.add_argument("--games-per-pair", type=int, default=2)
+    p.add_argument("--max-decks", type=int, default=6)
+    p.add_argument("--max-ticks", type=int, default=3000)
+    p.add_argument("--simulations", type=int, default=48)
+    p.add_argument("--output", default="training_runs/benchmark_mcts.json")
+    args = p.parse_args()
+
+    with Session(engine) as session:
+        repo = Repository(session)
+        ensure_builtin_decks(repo)
+        rows = repo.list_decks()
+        selected = select_representative_decks(rows, args.max_decks, guess_archetype_fn=guess_archetype)
+        decks = [{**deck, "mainboard": hydrate_deck_cards(repo, deck["mainboard"])} for deck in selected]
+
+    totals = {mode: {"wins": 0, "games": 0, "cpu_seconds": 0.0, "decisions": 0} for mode in MODES}
+    timeouts = 0
+    games: list[dict] = []
+    for left, right in combinations(decks, 2):
+        for index in range(max(1, args.games_per_pair)):
+            seed = _stable_seed(left["name"], right["name"], index)
+            # Swap seats every other game so neither mode always plays first.
+            modes = MODES if index % 2 == 0 else MODES[::-1]
+            result = play_game(left["mainboard"], right["mainboard"], seed, modes, args.simulations, args.max_ticks)
+            for pid, mode in ((1, modes[0]), (2, modes[1])):
+                totals[mode]["games"] += 1
+                totals[mode]["wins"] += int(result["winner"] == pid)
+                totals[mode]["cpu_seconds"] += result["cpu"][pid]
+                totals[mode]["decisions"] += result["decisions"][pid]
+            timeouts += int(result["winner"] is None)
+            games.append(
+                {
+                    "deck_a": left["name"],
+                    "deck_b": right["name"],
+                    "seed": seed,
+                    "modes": list(modes),
+                    "winner": result["winner"],
+                    "turn": result["turn"],
+                }
+            )
+
+    summary = {"simulations": args.simulations, "timeouts": timeouts, "modes": {}, "games": games}
+    for mode, row in totals.items():
+        summary["modes"][mode] = {
+            "games": row["games"],
+            "win_rate": round(row["wins"] / row["games"], 3) if row["games"] else 0.0,
+            "decisions": row["decisions"],
+            "cpu_ms_per_decision": round(row["cpu_seconds"] * 1000.0 / row["decisions"], 2) if row["decisions"] else 0.0,
+        }
+
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(json.dumps({"output": str(out), "timeouts": timeouts, "modes": summary["modes"]}))
+
+
+if __name__ == "__main__":
+    main()
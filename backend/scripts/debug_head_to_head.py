@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from ai.agent import AIAgent
+from ai.decision_profile import ProfileHistograms
 from ai.deck_analysis import guess_archetype
 from analytics.decision_taxonomy import decision_reason_code, has_actionable_move, has_meaningful_move, is_actionable_move
 from card_data.display import select_display_image_uri
@@ -128,6 +129,7 @@ def main() -> int:
 
     engine_rules = RulesEngine()
     wins = {1: 0, 2: 0, "timeout": 0}
+    profiles = ProfileHistograms()
 
     with Session(engine) as session:
         repo = Repository(session)
@@ -151,11 +153,16 @@ def main() -> int:
                     if not legal:
                         action = {"type": "pass_priority"}
                         reasoning = "No legal action"
+                        transpositions = {}
+                        profile = {}
                     else:
                         agent = a_agent if pid == 1 else b_agent
                         decision = agent.choose_action(state, legal, pid)
                         action = decision.action
                         reasoning = decision.reasoning
+                        transpositions = agent.transpositions.decision_stats()
+                        profile = agent.last_profile
+                        profiles.add(agent.archetype, profile)
 
                     trace = {
                         "trace": True,
@@ -193,6 +200,8 @@ def main() -> int:
                             stack_empty=not bool(state.stack),
                         ),
                         "reasoning": reasoning,
+                        "transpositions": transpositions,
+                        "profile": profile,
                     }
                     state.log.append(f"AI TRACE {json.dumps(trace, separators=(',', ':'))}")
 
@@ -213,7 +222,7 @@ def main() -> int:
                     "ticks": ticks,
                     "life": {"1": state.players[1].life, "2": state.players[2].life},
                     "library": {"1": len(state.players[1].library), "2": len(state.players[2].library)},
-                    "log": state.log,
+                    "log": list(state.log),
                 }
                 out.write(json.dumps(record, ensure_ascii=True) + "\n")
 
@@ -223,6 +232,7 @@ def main() -> int:
         "matches": args.matches,
         "difficulty": args.difficulty,
         "wins": {"deck_a": wins[1], "deck_b": wins[2], "timeout": wins["timeout"]},
+        "decision_profiles": profiles.to_dict(),
         "output": {
             "run_dir": str(run_dir),
             "games_jsonl": str(games_path),
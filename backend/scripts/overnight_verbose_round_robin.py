@@ -14,6 +14,7 @@ from pathlib import Path
 import re
 
 from ai.agent import AIAgent
+from ai.decision_profile import ProfileHistograms
 from ai.deck_analysis import guess_archetype
 from analytics.decision_taxonomy import decision_reason_code, has_actionable_move, has_meaningful_move, is_actionable_move
 from analytics.replay_tools import classify_timeout_state
@@ -131,6 +132,7 @@ def run() -> int:
         global_counts: Counter = Counter()
         top_errors: Counter = Counter()
         pair_summaries: list[dict] = []
+        profiles = ProfileHistograms()
 
         engine_rules = RulesEngine()
         game_counter = 0
@@ -165,11 +167,16 @@ def run() -> int:
                         if not legal:
                             action = {"type": "pass_priority"}
                             reasoning = "No legal action"
+                            transpositions = {}
+                            profile = {}
                         else:
                             agent = a_agent if pid == 1 else b_agent
                             decision = agent.choose_action(state, legal, pid)
                             action = decision.action
                             reasoning = decision.reasoning
+                            transpositions = agent.transpositions.decision_stats()
+                            profile = agent.last_profile
+                            profiles.add(agent.archetype, profile)
 
                         legal_non_pass = has_actionable_move(legal)
                         meaningful_non_pass = has_meaningful_move(legal)
@@ -217,6 +224,10 @@ def run() -> int:
                             "opp_graveyard_count": len(state.players[1 if pid == 2 else 2].graveyard),
                             "library_count": len(state.players[pid].library),
                             "opp_library_count": len(state.players[1 if pid == 2 else 2].library),
+                            "life": {
+                                "self": state.players[pid].life,
+                                "opp": state.players[1 if pid == 2 else 2].life,
+                            },
                             "legal_non_pass": legal_non_pass,
                             "legal_non_pass_count": sum(1 for move in legal if is_actionable_move(move)),
                             "legal_action_types": sorted({str(m.get("type")) for m in legal if is_actionable_move(m)}),
@@ -224,6 +235,8 @@ def run() -> int:
                             "action": compact_action(action),
                             "reason_code": reason_code,
                             "reasoning": reasoning,
+                            "transpositions": transpositions,
+                            "profile": profile,
                         }
                         state.log.append(f"AI TRACE {json.dumps(trace_line, separators=(',', ':'))}")
 
@@ -249,7 +262,7 @@ def run() -> int:
                     if stalled_pass_streak >= 3:
                         pair_counts["stall_streaks"] += 1
 
-                    analytics._scan_log_for_anomalies(state.log, pair_counts, top_errors)
+                    analytics._merge_telemetry(state.telemetry, pair_counts, top_errors)
                     pair_turns.append(state.turn)
                     game_counter += 1
 
@@ -273,16 +286,16 @@ def run() -> int:
                         },
                     }
 
-                    has_anomaly = any(k in pair_counts for k in ["invalid_targets", "cost_failures", "additional_cost_failures", "repeated_error_bursts"]) and any(
-                        x in "\n".join(state.log).lower() for x in ["invalid targets for", "cannot pay mana cost", "cannot satisfy chosen costs", "failed additional costs"]
+                    has_anomaly = any(
+                        state.telemetry.counts[k] for k in ["invalid_targets", "cost_failures", "additional_cost_failures", "repeated_error_bursts"]
                     )
                     has_behavior_anomaly = passed_with_options > 0 or missed_land_windows > 0 or stalled_pass_streak >= 3
 
                     if args.write_full_log_for_all_games:
-                        game_record["log"] = state.log
+                        game_record["log"] = list(state.log)
                         all_games.write(json.dumps(game_record, ensure_ascii=True) + "\n")
                     elif has_anomaly or has_behavior_anomaly or state.winner is None:
-                        game_record["log"] = state.log
+                        game_record["log"] = list(state.log)
                         anomalies.write(json.dumps(game_record, ensure_ascii=True) + "\n")
 
                     if game_counter % 50 == 0:
@@ -337,6 +350,7 @@ def run() -> int:
             "stall_streaks": int(global_counts["stall_streaks"]),
         },
         "top_errors": [{"message": m, "count": c} for m, c in top_errors.most_common(100)],
+        "decision_profiles": profiles.to_dict(),
         "pair_summaries": sorted(
             pair_summaries,
             key=lambda x: x["timeouts"] * 5 + x["invalid_targets"] * 3 + x["cost_failures"] * 2 + x["repeated_error_bursts"],
@@ -18,6 +18,7 @@ from card_data.hydration import hydrate_deck_cards
 from decks.bootstrap import ensure_builtin_decks, ensure_expansion_top_decks
 from decks.selection import select_representative_decks
 from game_state.state import MatchFactory
+from game_state.state_hash import state_hash
 from persistence.db import engine
 from persistence.repository import Repository
 from rules_engine.engine import RulesEngine
@@ -91,14 +92,15 @@ def run_game(deck_a: list[dict], deck_b: list[dict], seed: int, difficulty: str,
             engine_rules.take_action(state, state.active_player, {"type": "combat_damage"})
         ticks += 1
 
-    normalized_log = [normalize_log_line(line) for line in state.log]
-    log_hash = hashlib.sha256("\n".join(normalized_log).encode("utf-8")).hexdigest()
+    log = list(state.log)
+    log_hash = hashlib.sha256("\n".join(log).encode("utf-8")).hexdigest()
     return {
         "winner": state.winner,
         "turn": state.turn,
         "ticks": ticks,
         "log_hash": log_hash,
-        "log": normalized_log,
+        "state_hash": f"{state_hash(state):016x}",
+        "log": log,
         "timeout": state.winner is None,
     }
 
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+try:  # pragma: no cover - import path bootstrap for CLI execution
+    from . import _bootstrap  # type: ignore[attr-defined]  # noqa: F401
+except ImportError:  # pragma: no cover - direct script execution
+    import _bootstrap  # noqa: F401
+import argparse
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from ai.linear_eval import WEIGHTS_PATH, LinearEvalModel, example_features, fit_linear_eval, save_linear_eval
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Fit the learned linear board evaluation from extracted training examples")
+    p.add_argument("examples", nargs="+", help="training_examples.jsonl files from extract_training_examples.py")
+    p.add_argument("--l2", type=float, default=1000.0, help="Ridge penalty on standardized weights")
+    p.add_argument("--holdout", type=float, default=0.2, help="Share of games held out to report generalization")
+    p.add_argument("--out", default=str(WEIGHTS_PATH), help="Weights file to write")
+    return p.parse_args()
+
+
+def load_training_rows(paths: list[Path]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """Feature matrix and win labels from decided games, with each row's game key."""
+    features: list[list[float]] = []
+    labels: list[float] = []
+    games: list[str] = []
+    for path in paths:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if row.get("winner") not in (1, 2):
+                    continue
+                vector = example_features(row)
+                if vector is None:
+                    continue
+                features.append(vector)
+                labels.append(1.0 if row.get("winner") == row.get("pid") else 0.0)
+                games.append(f"{path}:{row.get('game')}")
+    return np.array(features, dtype=float), np.array(labels, dtype=float), games
+
+
+def score_model(model: LinearEvalModel, features: np.ndarray, labels: np.ndarray) -> dict[str, float]:
+    p = 1.0 / (1.0 + np.exp(-np.clip(model.logits(features), -30.0, 30.0)))
+    log_loss = float(-np.mean(labels * np.log(p + 1e-12) + (1.0 - labels) * np.log(1.0 - p + 1e-12)))
+    accuracy = float(np.mean((p >= 0.5) == (labels >= 0.5)))
+    return {"log_loss": round(log_loss, 4), "accuracy": round(accuracy, 4)}
+
+
+def main() -> int:
+    args = parse_args()
+    paths = [Path(p) for p in args.examples]
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        raise SystemExit(f"training examples not found: {', '.join(missing)}")
+
+    features, labels, game_keys = load_training_rows(paths)
+    if len(features) == 0 or len(set(labels.tolist())) < 2:
+        raise SystemExit("need examples from both won and lost positions")
+    games = len(set(game_keys))
+    report: dict = {"examples": len(features), "games": games}
+    # Positions from one game are strongly correlated, so hold out whole games.
+    held_out = np.array([zlib.crc32(key.encode()) % 1000 < args.holdout * 1000 for key in game_keys])
+    if held_out.any() and not held_out.all():
+        trial = fit_linear_eval(features[~held_out], labels[~held_out], l2=args.l2)
+        report["held_out"] = score_model(trial, features[held_out], labels[held_out])
+    model = fit_linear_eval(features, labels, l2=args.l2)
+    out = Path(args.out)
+    save_linear_eval(model, out, games=games, l2=args.l2)
+    report.update(output=str(out), train=score_model(model, features, labels))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
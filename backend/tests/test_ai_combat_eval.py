@@ -0,0 +1,147 @@
+import random
+from itertools import product
+
+from ai import combat_eval
+from ai.agent import AIAgent
+from ai.heuristics import evaluate_board
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+from rules_engine.engine import RulesEngine
+
+KEYWORDS = ["first strike", "double strike", "deathtouch", "trample", "lifelink", "menace", "indestructible"]
+
+
+def _combat_state(seed: int, attackers: int, blockers: int, life: int = 20):
+    rng = random.Random(seed)
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Forest"}],
+        [{"quantity": 60, "card_name": "Forest"}],
+        seed=seed,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.step = Step.DECLARE_BLOCKERS
+    state.active_player = 1
+    state.priority_player = 2
+    state.players[2].life = life
+    for index in range(attackers + blockers):
+        controller = 1 if index < attackers else 2
+        card = CardInstance(
+            f"{'a' if controller == 1 else 'b'}{index}", "Creature", controller, controller, Zone.BATTLEFIELD, ["Creature"],
+            power=rng.randint(0, 5), toughness=rng.randint(1, 5),
+            keywords=rng.sample(KEYWORDS, rng.choice([0, 0, 1, 2])),
+        )
+        state.cards[card.id] = card
+        state.players[controller].battlefield.append(card.id)
+        if controller == 1:
+            card.tapped = True
+            state.attackers.append(card.id)
+    return state
+
+
+def _simulate(state, blocks: dict[str, list[str]]):
+    engine = RulesEngine()
+    sim = state.fork()
+    engine.take_action(sim, 2, {"type": "block", "blocks": blocks})
+    engine.take_action(sim, 1, {"type": "combat_damage"})
+    return sim
+
+
+def test_resolution_matches_full_combat_simulation_on_random_boards() -> None:
+    checked = 0
+    for seed in range(20):
+        state = _combat_state(seed, attackers=2, blockers=3)
+        attackers = [combat_eval.combatant(state, aid) for aid in state.attackers]
+        blockers = [combat_eval.combatant(state, bid, attackers=state.attackers) for bid in state.players[2].battlefield]
+        for targets in product([None, *range(len(attackers))], repeat=len(blockers)):
+            groups = {attacker.id: [] for attacker in attackers}
+            for blocker, target in zip(blockers, targets):
+                if target is not None and attackers[target].id in blocker.can_block:
+                    groups[attackers[target].id].append(blocker)
+            if any(group and len(group) < attacker.min_blockers for attacker in attackers for group in [groups[attacker.id]]):
+                continue
+            sim = _simulate(state, {aid: [b.id for b in group] for aid, group in groups.items() if group})
+            dead = set()
+            life = {1: 20, 2: 20}
+            for attacker in attackers:
+                outcome = combat_eval.resolve_block(attacker, groups[attacker.id])
+                dead |= outcome.dead
+                life[1] += outcome.attacker_life_gain
+                life[2] += outcome.defender_life_gain - outcome.through
+            assert dead == {cid for cid in state.cards if state.cards[cid].zone == Zone.BATTLEFIELD and sim.cards[cid].zone != Zone.BATTLEFIELD}
+            assert (sim.players[1].life, sim.players[2].life) == (life[1], life[2])
+            checked += 1
+    assert checked > 250
+
+
+def _simulated_block_score(state, blocks: dict[str, list[str]]) -> float | None:
+    """The block search's scoring rules, applied to a fully simulated combat."""
+    sim = _simulate(state, blocks)
+    incoming = sum(max(0, state.cards[aid].power) for aid in state.attackers)
+    initial_life = state.players[2].life
+    if initial_life > incoming and blocks and all(
+        sum(state.cards[bid].power for bid in group) < state.cards[aid].toughness for aid, group in blocks.items()
+    ):
+        return None
+    score = evaluate_board(sim, 2) - evaluate_board(state, 2) + (sim.players[2].life - initial_life) * 4.0
+    blockers_lost = len(set(state.players[2].battlefield) - set(sim.players[2].battlefield))
+    attackers_lost = len(set(state.players[1].battlefield) - set(sim.players[1].battlefield))
+    if initial_life > incoming and blockers_lost > attackers_lost:
+        if attackers_lost == 0:
+            return None
+        score -= (blockers_lost - attackers_lost) * (12.0 + incoming)
+    if sim.winner is not None:
+        score -= 1000.0
+    return score
+
+
+def test_block_search_finds_the_best_simulated_assignment() -> None:
+    for seed in range(25):
+        state = _combat_state(100 + seed, attackers=3, blockers=3, life=random.Random(seed).randint(3, 12))
+        blocker_ids = list(state.players[2].battlefield)
+        best = None
+        for targets in product([None, *state.attackers], repeat=len(blocker_ids)):
+            blocks: dict[str, list[str]] = {}
+            for bid, aid in zip(blocker_ids, targets):
+                if aid is not None:
+                    blocks.setdefault(aid, []).append(bid)
+            score = _simulated_block_score(state, blocks)
+            if score is not None and (best is None or score > best + 1e-9):
+                best = score
+
+        chosen = AIAgent(difficulty="master")._search_block_assignments(
+            state,
+            [{"id": aid} for aid in state.attackers],
+            [{"id": bid} for bid in blocker_ids],
+        )
+        normalized = {aid: group if isinstance(group, list) else [group] for aid, group in (chosen or {}).items()}
+        assert abs(_simulated_block_score(state, normalized) - best) < 1e-6
+
+
+def test_block_search_handles_boards_beyond_exhaustive_enumeration() -> None:
+    state = _combat_state(7, attackers=6, blockers=9, life=8)
+    attackers = [combat_eval.combatant(state, aid) for aid in state.attackers]
+    blockers = [combat_eval.combatant(state, bid, attackers=state.attackers) for bid in state.players[2].battlefield]
+    plan = combat_eval.search_blocks(attackers, blockers, lambda a, g, o: -o.through - len(o.dead), lambda plan: 0.0)
+
+    assert plan is not None and plan.complete
+    used = [bid for group in plan.blocks.values() for bid in group]
+    assert len(used) == len(set(used))
+    choice = AIAgent(difficulty="master")._search_block_assignments(
+        state,
+        [{"id": aid} for aid in state.attackers],
+        [{"id": bid} for bid in state.players[2].battlefield],
+    )
+    assert choice
+
+
+def test_identical_blockers_are_searched_once() -> None:
+    attacker = combat_eval.Combatant("atk", 1, 1, 4, 4)
+    twins = [combat_eval.Combatant(f"bear{i}", 2, 2, 2, 2, can_block=frozenset({"atk"})) for i in range(6)]
+
+    def value(attacker, group, outcome) -> float:
+        return 10.0 * ("atk" in outcome.dead) - 3.0 * len(outcome.dead - {"atk"}) - outcome.through
+
+    plan = combat_eval.search_blocks([attacker], twins, value, lambda plan: 0.0)
+
+    assert plan.blocks == {"atk": ("bear0", "bear1")}
+    assert plan.nodes <= 5
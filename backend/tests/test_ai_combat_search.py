@@ -201,3 +201,67 @@ def test_master_attack_search_avoids_throwing_small_creature_into_large_blocker(
         state, [attacker_large.id, attacker_small.id], 1
     )
     assert attacker_small.id not in chosen
+
+
+def _attack_state(seed: int, mine: list[tuple], theirs: list[tuple], my_life: int = 20, opp_life: int = 20):
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Forest"}],
+        [{"quantity": 60, "card_name": "Forest"}],
+        seed=seed,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.step = Step.DECLARE_ATTACKERS
+    state.turn = 7
+    state.active_player = 1
+    state.priority_player = 1
+    state.players[1].life = my_life
+    state.players[2].life = opp_life
+    for controller, specs in ((1, mine), (2, theirs)):
+        for index, (power, toughness, keywords, tapped) in enumerate(specs):
+            card = CardInstance(
+                f"p{controller}-{index}", "Creature", controller, controller, Zone.BATTLEFIELD, ["Creature"],
+                power=power, toughness=toughness, keywords=list(keywords),
+            )
+            card.entered_turn = 0
+            card.tapped = tapped
+            state.cards[card.id] = card
+            state.players[controller].battlefield.append(card.id)
+    return state
+
+
+def test_master_attack_search_holds_back_against_lethal_crackback() -> None:
+    state = _attack_state(
+        670,
+        mine=[(2, 2, (), False), (2, 2, (), False)],
+        theirs=[(0, 4, ("defender",), False), (3, 3, (), True), (3, 3, (), True)],
+        my_life=4,
+    )
+    chosen = AIAgent(difficulty="master", archetype="Aggro")._choose_attackers(state, ["p1-0", "p1-1"], 1)
+    assert len(chosen) <= 1
+
+
+def test_master_attack_search_sends_everything_for_lethal_through_a_blocker() -> None:
+    state = _attack_state(
+        671,
+        mine=[(2, 2, (), False), (2, 2, (), False), (2, 2, (), False)],
+        theirs=[(2, 2, (), False), (5, 5, (), True), (5, 5, (), True)],
+        my_life=5,
+        opp_life=3,
+    )
+    chosen = AIAgent(difficulty="master", archetype="Midrange")._choose_attackers(state, ["p1-0", "p1-1", "p1-2"], 1)
+    assert sorted(chosen) == ["p1-0", "p1-1", "p1-2"]
+
+
+def test_master_attack_search_plans_wide_boards() -> None:
+    mine = [(1, 1, (), False)] * 8 + [(2, 2, ("flying", "vigilance"), False)]
+    theirs = [(1, 1, (), False)] * 8
+    state = _attack_state(672, mine, theirs)
+    candidates = [f"p1-{index}" for index in range(len(mine))]
+    agent = AIAgent(difficulty="master", archetype="Tokens")
+
+    chosen = agent._search_attack_assignments(state, candidates, 1)
+
+    assert chosen is not None
+    # Nothing on the other side flies, and vigilance keeps it home as a blocker.
+    assert "p1-8" in chosen
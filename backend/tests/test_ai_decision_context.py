@@ -0,0 +1,45 @@
+from ai.agent import AIAgent
+from ai.decision_context import DecisionContext
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+
+
+def _board_state():
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Mountain"}],
+        [{"quantity": 60, "card_name": "Mountain"}],
+        seed=23,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.step = Step.PRECOMBAT_MAIN
+    for index in range(6):
+        pid = 1 + index % 2
+        cid = f"bear-{index}"
+        state.cards[cid] = CardInstance(cid, "Bear", pid, pid, Zone.BATTLEFIELD, ["Creature"], power=2, toughness=2)
+        state.players[pid].battlefield.append(cid)
+    return state
+
+
+def test_context_memoizes_root_helpers_without_changing_rankings() -> None:
+    state = _board_state()
+    agent = AIAgent(difficulty="hard", archetype="Control")
+    legal = agent.engine.legal_moves(state, 1)
+    plain = agent._score_and_order_moves(state, legal, 1)
+
+    agent._decision_context = DecisionContext(state)
+    assert agent._score_and_order_moves(state, legal, 1) == plain
+    memo = agent._decision_context.memo
+    assert ("_board_role", 1) in memo and ("_root_evaluation", 1) in memo
+    assert agent._decision_context.combat_stats
+
+    branch = state.fork()
+    branch.players[2].life = 3
+    assert agent._board_role(branch, 1) == "race"
+    assert agent._board_role(state, 1) == memo[("_board_role", 1)] != "race"
+
+
+def test_choose_action_drops_the_context_afterwards() -> None:
+    state = _board_state()
+    agent = AIAgent(difficulty="hard")
+    agent.choose_action(state, agent.engine.legal_moves(state, 1), 1)
+    assert agent._decision_context is None
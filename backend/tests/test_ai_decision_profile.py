@@ -0,0 +1,74 @@
+from ai.agent import AIAgent
+from ai.decision_profile import DecisionProfile, ProfileHistograms, SearchWork
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+from rules_engine.engine import RulesEngine
+
+
+def _state():
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Forest"}],
+        [{"quantity": 60, "card_name": "Forest"}],
+        seed=9,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.turn = 5
+    state.step = Step.DECLARE_ATTACKERS
+    state.active_player = state.priority_player = 1
+    for cid, controller in [("wolf", 1), ("bear", 2)]:
+        card = CardInstance(cid, cid.title(), controller, controller, Zone.BATTLEFIELD, ["Creature"], power=2, toughness=2)
+        state.cards[cid] = card
+        state.players[controller].battlefield.append(cid)
+    return state
+
+
+def test_choose_action_records_stage_breakdown() -> None:
+    state = _state()
+    agent = AIAgent(difficulty="master")
+    bystander = AIAgent(difficulty="master")
+    assert agent.last_profile == {}
+    decision = agent.choose_action(state, RulesEngine().legal_moves(state, 1), 1)
+    assert decision.action
+    profile = agent.last_profile
+    assert profile["total_ms"] >= 0
+    stages = profile["stages"]
+    assert {"forced_land_play", "strategic_plan", "rank_moves"} <= set(stages)
+    for row in stages.values():
+        assert set(row) == {"ms", "forks", "take_action", "legal_moves"}
+    assert sum(row["forks"] for row in stages.values()) > 0
+    assert sum(row["take_action"] for row in stages.values()) > 0
+    assert agent.engine.work.forks == sum(row["forks"] for row in stages.values())
+    assert bystander.engine.work.snapshot() == (0, 0, 0)
+
+
+def test_profile_counts_work_inside_a_stage() -> None:
+    work = SearchWork()
+    profile = DecisionProfile(work)
+
+    def probe(n: int) -> int:
+        work.forks += n
+        return n
+
+    assert profile.run("probe", probe, 3) == 3
+    profile.run("probe", probe, 2)
+    profile.run("idle", lambda: None)
+    summary = profile.summary()
+    assert list(summary["stages"]) == ["probe", "idle"]
+    assert summary["stages"]["probe"]["forks"] == 5
+    assert summary["stages"]["idle"]["forks"] == 0
+
+
+def test_histograms_bucket_stage_latency_by_archetype() -> None:
+    histograms = ProfileHistograms()
+    histograms.add("aggro", {"total_ms": 30.0, "stages": {"rank_moves": {"ms": 0.5, "forks": 4, "take_action": 4, "legal_moves": 1}}})
+    histograms.add("aggro", {"total_ms": 700.0, "stages": {"rank_moves": {"ms": 12.0, "forks": 6, "take_action": 2, "legal_moves": 0}}})
+    histograms.add("control", {})
+    out = histograms.to_dict()
+    assert list(out) == ["aggro"]
+    rank = out["aggro"]["rank_moves"]
+    assert (rank["calls"], rank["forks"], rank["take_action"], rank["legal_moves"]) == (2, 10, 6, 1)
+    assert rank["histogram_ms"]["<1"] == 1 and rank["histogram_ms"]["<20"] == 1
+    assert rank["max_ms"] == 12.0 and rank["mean_ms"] == 6.25
+    decision = out["aggro"]["decision"]
+    assert decision["histogram_ms"]["<100"] == 1 and decision["histogram_ms"][">=500"] == 1
+    assert list(out["aggro"]) == ["decision", "rank_moves"]
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from analytics.service import AnalyticsService
 from analytics.replay_tools import classify_first_divergence
-from collections import Counter
 from scripts.anomaly_cluster_report import classify
 
 
@@ -38,47 +37,6 @@ def test_ai_diagnostics_reports_matchup_metrics() -> None:
     assert repo.saved and repo.saved[0][0] == "ai_diagnostics"
 
 
-def test_scan_log_tracks_stall_and_land_window_anomalies() -> None:
-    repo = FakeRepo()
-    svc = AnalyticsService(repo)
-    out = Counter()
-    top = Counter()
-    svc._scan_log_for_anomalies(
-        [
-            "Player A passes priority.",
-            "Player B passes priority.",
-            "Player A passes priority.",
-            "Player B passes priority.",
-            "Missed land-play window for Player A.",
-        ],
-        out,
-        top,
-    )
-    assert out["stall_pass_streaks"] == 1
-    assert out["missed_land_windows"] == 1
-
-
-def test_scan_log_attributes_unhandled_oracle_effects_to_cards() -> None:
-    repo = FakeRepo()
-    svc = AnalyticsService(repo)
-    out = Counter()
-    top = Counter()
-    cards = Counter()
-    svc._scan_log_for_anomalies(
-        [
-            "Oracle effect not inferred for Mystic Card (controller=1). Text: Whenever you cast a spell, do something unusual.",
-            "Oracle effect not inferred for Mystic Card (controller=1). Text: Whenever you cast a spell, do something unusual.",
-            "Oracle effect not inferred for Other Card (controller=2). Text: Choose a result.",
-        ],
-        out,
-        top,
-        cards,
-    )
-
-    assert out["oracle_fallbacks"] == 3
-    assert cards.most_common(2) == [("Mystic Card", 2), ("Other Card", 1)]
-
-
 def test_compare_replay_logs_reports_first_divergence() -> None:
     repo = FakeRepo()
     svc = AnalyticsService(repo)
@@ -221,23 +179,3 @@ def test_anomaly_cluster_labels_x_value_and_stack_signals() -> None:
     assert "x_spell_error_loop" in labels
     assert "stack_target" in labels
     assert "stall_pass" in labels
-
-
-def test_scan_log_for_anomalies_counts_x_spell_and_main_phase_loops() -> None:
-    repo = FakeRepo()
-    svc = AnalyticsService(repo)
-    out = Counter()
-    top = Counter()
-    svc._scan_log_for_anomalies(
-        [
-            'AI TRACE {"step":"precombat_main","action":{"type":"pass_priority"}}',
-            'AI TRACE {"step":"precombat_main","action":{"type":"pass_priority"}}',
-            "Invalid targets for Secure the Wastes: X value is required and must be non-negative.",
-            "Invalid targets for Secure the Wastes: X value is required and must be non-negative.",
-        ],
-        out,
-        top,
-    )
-
-    assert out["main_phase_pass_loops"] >= 2
-    assert out["x_spell_error_loops"] == 1
@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+
+from ai import linear_eval
+from ai.agent import AIAgent
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+from rules_engine.engine import RulesEngine
+
+
+def _state():
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Forest"}],
+        [{"quantity": 60, "card_name": "Forest"}],
+        seed=5,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.turn = 6
+    state.step = Step.PRECOMBAT_MAIN
+    state.active_player = state.priority_player = 1
+    state.players[2].life = 13
+    for cid, controller, keywords in [("bird", 1, ["Flying"]), ("bear", 2, [])]:
+        card = CardInstance(cid, cid.title(), controller, controller, Zone.BATTLEFIELD, ["Creature"], power=2, toughness=2, keywords=keywords)
+        state.cards[cid] = card
+        state.players[controller].battlefield.append(cid)
+    return state
+
+
+def _trace_row(state, pid: int, winner: int) -> dict:
+    opp = 1 if pid == 2 else 2
+
+    def battlefield(player_id: int) -> list[dict]:
+        return [
+            {
+                "types": list(state.cards[cid].types),
+                "tapped": state.cards[cid].tapped,
+                "power": state.cards[cid].power,
+                "toughness": state.cards[cid].toughness,
+                "keywords": list(state.cards[cid].keywords),
+                "loyalty": state.cards[cid].loyalty,
+            }
+            for cid in state.players[player_id].battlefield
+        ]
+
+    return {
+        "winner": winner,
+        "pid": pid,
+        "turn": state.turn,
+        "active_player": state.active_player,
+        "hand_size": len(state.players[pid].hand),
+        "opp_hand_size": len(state.players[opp].hand),
+        "battlefield": battlefield(pid),
+        "opp_battlefield": battlefield(opp),
+        "graveyard_count": len(state.players[pid].graveyard),
+        "opp_graveyard_count": len(state.players[opp].graveyard),
+        "library_count": len(state.players[pid].library),
+        "opp_library_count": len(state.players[opp].library),
+        "life": {"self": state.players[pid].life, "opp": state.players[opp].life},
+    }
+
+
+def test_state_and_trace_features_agree() -> None:
+    state = _state()
+    for pid in (1, 2):
+        features = linear_eval.state_features(state, pid)
+        assert len(features) == len(linear_eval.FEATURE_NAMES)
+        assert linear_eval.example_features(_trace_row(state, pid, 1)) == features
+    named = dict(zip(linear_eval.FEATURE_NAMES, linear_eval.state_features(state, 1)))
+    assert (named["self_evasive_power"], named["opp_evasive_power"], named["opp_life"]) == (2.0, 0.0, 13.0)
+    assert linear_eval.example_features({"pid": 1}) is None
+
+
+def test_fitted_model_round_trips_and_scores_batches(tmp_path) -> None:
+    rng = np.random.default_rng(3)
+    features = rng.normal(size=(400, len(linear_eval.FEATURE_NAMES)))
+    own, opp = linear_eval.FEATURE_NAMES.index("self_life"), linear_eval.FEATURE_NAMES.index("opp_life")
+    labels = (features[:, own] - features[:, opp] + rng.normal(scale=0.5, size=400) > 0).astype(float)
+    model = linear_eval.fit_linear_eval(features, labels)
+    assert model.weights[own] > 0 > model.weights[opp]
+
+    path = tmp_path / "linear_eval.json"
+    linear_eval.save_linear_eval(model, path, games=0)
+    loaded = linear_eval.load_linear_eval(path)
+    assert np.allclose(loaded.logits(features), model.logits(features), atol=1e-3)
+
+    state = _state()
+    children = []
+    for move in RulesEngine().legal_moves(state, 1):
+        if move["type"] == "play_land":
+            child = state.fork()
+            RulesEngine().take_action(child, 1, move)
+            children.append(child)
+    batch = linear_eval.evaluate_board_batch([state, *children], 1, loaded)
+    single = [linear_eval.evaluate_board_batch([s], 1, loaded)[0] for s in [state, *children]]
+    assert np.allclose(batch, single)
+    assert linear_eval.evaluate_board_batch([], 1, loaded) == []
+
+    payload = json.loads(path.read_text())
+    payload["feature_names"] = payload["feature_names"][:-1]
+    path.write_text(json.dumps(payload))
+    assert linear_eval.load_linear_eval(path) is None
+
+
+def test_agent_uses_the_shipped_weights_only_when_asked() -> None:
+    assert AIAgent(difficulty="master").eval_model is None
+    agent = AIAgent(difficulty="master", learned_eval=True)
+    assert agent.eval_model is not None
+    state = _state()
+    assert agent._board_values([state], 1) == linear_eval.evaluate_board_batch([state], 1, agent.eval_model)
+    assert agent.choose_action(state, RulesEngine().legal_moves(state, 1), 1).action
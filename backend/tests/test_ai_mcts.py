@@ -0,0 +1,132 @@
+from ai.agent import AIAgent
+from ai.mcts import MCTSNode, MCTSSearch
+from ai.transposition import move_key
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+from game_state.state_hash import state_hash
+from rules_engine.engine import RulesEngine
+
+
+def _lethal_state():
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Mountain"}],
+        [{"quantity": 60, "card_name": "Mountain"}],
+        seed=19,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.turn = 4
+    state.step = Step.PRECOMBAT_MAIN
+    state.active_player = state.priority_player = 1
+    state.players[2].life = 3
+    bolt = CardInstance(
+        "bolt", "Lightning Bolt", 1, 1, Zone.HAND, ["Instant"], mana_cost="{R}",
+        oracle_text="Lightning Bolt deals 3 damage to any target.",
+    )
+    state.cards[bolt.id] = bolt
+    state.players[1].hand.append(bolt.id)
+    land = next(cid for cid in state.players[1].hand if state.cards[cid].name == "Mountain")
+    state.players[1].hand.remove(land)
+    state.players[1].battlefield.append(land)
+    state.cards[land].zone = Zone.BATTLEFIELD
+    return state
+
+
+def test_search_prefers_the_winning_line_and_reuses_its_tree() -> None:
+    state = _lethal_state()
+    agent = AIAgent(difficulty="master_plus")
+    legal = RulesEngine().legal_moves(state, 1)
+    bolt = next(
+        agent._materialize_action(state, move, 1)
+        for move in legal
+        if move.get("type") == "cast_spell" and move.get("card_id") == "bolt"
+    )
+    moves = [{"type": "pass_priority"}, bolt]
+    search = MCTSSearch(agent.engine, agent._mcts_moves, simulations=48)
+    search.begin_decision((state.id, state.turn))
+
+    stats = search.search(state, 1, moves)
+    assert sum(visits for visits, _ in stats.values()) == 12
+    pass_key, bolt_key = sorted(stats, key=lambda key: "pass_priority" not in key)
+    assert stats[bolt_key][1] > stats[pass_key][1]
+
+    search.search(state, 1, moves)
+    assert search.reused_visits == 12
+    search.begin_decision((state.id, state.turn + 1))
+    search.search(state, 1, moves)
+    assert search.reused_visits == 0
+
+
+def test_master_plus_keeps_the_rollouts_unless_uct_is_requested(monkeypatch) -> None:
+    def no_search(*args):
+        raise AssertionError("UCT search is opt-in")
+
+    state = _lethal_state()
+    state.players[1].lands_played_this_turn = 1
+    state.players[1].last_land_play_turn = state.turn
+    agent = AIAgent(difficulty="master_plus")
+    monkeypatch.setattr(agent.mcts, "search", no_search)
+    assert agent.choose_action(state, agent.engine.legal_moves(state, 1), 1).action.get("card_id") == "bolt"
+
+    opted_in = AIAgent(difficulty="master_plus", mcts_simulations=48)
+    searched = []
+    search = opted_in.mcts.search
+    monkeypatch.setattr(opted_in.mcts, "search", lambda *args: searched.append(args) or search(*args))
+    assert opted_in.choose_action(state, opted_in.engine.legal_moves(state, 1), 1).action.get("card_id") == "bolt"
+    assert searched
+
+
+def test_search_stops_when_the_decision_budget_is_spent() -> None:
+    state = _lethal_state()
+    agent = AIAgent(difficulty="master_plus")
+    calls = []
+    search = MCTSSearch(agent.engine, agent._mcts_moves, simulations=40, spend=lambda: calls.append(1) or len(calls) < 3)
+    stats = search.search(state, 1, [{"type": "pass_priority"}, {"type": "play_land", "card_id": state.players[1].hand[0]}])
+    assert len(calls) == 3
+    assert sum(visits for visits, _ in stats.values()) == 2
+    assert search.search(state, 1, [{"type": "pass_priority"}]) == {}
+
+
+def test_expansion_reuses_the_stored_node_for_a_known_position() -> None:
+    state = _lethal_state()
+    agent = AIAgent(difficulty="master_plus")
+    land = next(cid for cid in state.players[1].hand if state.cards[cid].name == "Mountain")
+    moves = [{"type": "pass_priority"}, {"type": "play_land", "card_id": land}]
+    after = state.fork()
+    agent.engine.take_action(after, 1, moves[1])
+    search = MCTSSearch(agent.engine, agent._mcts_moves, simulations=8)
+    search.begin_decision((state.id, state.turn))
+    known = MCTSNode(after.priority_player)
+    known.visits, known.value_sum = 5, 4.0
+    search._nodes[(1, state_hash(after))] = known
+
+    search.search(state, 1, moves)
+    root = search._nodes[(1, state_hash(state))]
+    child = root.children[move_key(moves[1])][1]
+    assert child is known and known.visits > 5
+    for _, node in root.children.values():
+        assert any(stored is node for stored in search._nodes.values())
+
+
+def test_leaf_waves_are_scored_in_one_evaluator_call() -> None:
+    state = _lethal_state()
+    agent = AIAgent(difficulty="master_plus")
+    legal = RulesEngine().legal_moves(state, 1)
+    moves = [agent._materialize_action(state, move, 1) for move in legal[:3]]
+
+    def stats_for(batch: int) -> tuple[dict, list[int]]:
+        calls: list[int] = []
+
+        def evaluate(states, player_id):
+            calls.append(len(states))
+            return agent._board_values(states, player_id)
+
+        search = MCTSSearch(agent.engine, agent._mcts_moves, simulations=48, evaluate=evaluate, batch=batch)
+        search.begin_decision((state.id, state.turn))
+        return search.search(state, 1, moves), calls
+
+    sequential, single_calls = stats_for(1)
+    assert sequential == MCTSSearch(agent.engine, agent._mcts_moves, simulations=48).search(state, 1, moves)
+    assert set(single_calls) <= {1}
+    batched, wave_calls = stats_for(8)
+    assert max(wave_calls) > 1 and len(wave_calls) < len(single_calls)
+    assert sum(visits for visits, _ in batched.values()) == sum(visits for visits, _ in sequential.values())
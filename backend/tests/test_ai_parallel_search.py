@@ -0,0 +1,79 @@
+from ai.agent import AIAgent
+from ai.parallel_search import RootTask, run_root_tasks, shutdown_search_pools
+from game_state.serializers import serialize_match_snapshot
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+
+
+def _deck() -> list[dict]:
+    return [
+        {"quantity": 24, "card_name": "Mountain"},
+        {"quantity": 36, "card_name": "Goblin Guide", "mana_cost": "{R}", "type_line": "Creature — Goblin Scout",
+         "oracle_text": "Haste", "power": "2", "toughness": "2"},
+    ]
+
+
+def test_root_candidates_score_the_same_for_any_worker_count() -> None:
+    state = MatchFactory.from_decks(_deck(), _deck(), seed=31)
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.step = Step.PRECOMBAT_MAIN
+    state.active_player = state.priority_player = 1
+    agent = AIAgent(difficulty="master")
+    legal = agent.engine.legal_moves(state, 1)
+    candidates = [agent._materialize_action(state, move, 1) for move in legal[:3]]
+    config = {"difficulty": "master", "archetype": "Aggro", "opponent_archetype": None, "mcts_simulations": 0}
+    snapshot = serialize_match_snapshot(state)
+    tasks = [RootTask(snapshot, config, move, 1, 2, 200) for move in candidates]
+    try:
+        inline = run_root_tasks(tasks, workers=1)
+        pooled = run_root_tasks(tasks, workers=2)
+    finally:
+        shutdown_search_pools()
+    assert pooled == inline
+    assert all(len(scores) == 3 and nodes > 0 for scores, nodes in inline)
+    serial = agent.search_root_candidate(state, candidates[0], 1, 2)
+    assert serial == inline[0]
+
+
+def _crowded_state():
+    state = MatchFactory.from_decks(_deck(), _deck(), seed=31)
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.turn = 10
+    state.players[1].lands_played_this_turn = 1
+    state.players[1].last_land_play_turn = 10
+    state.step = Step.PRECOMBAT_MAIN
+    state.active_player = state.priority_player = 1
+    for pid in (1, 2):
+        for n in range(5):
+            cid = f"m{pid}{n}"
+            state.cards[cid] = CardInstance(cid, "Mountain", pid, pid, Zone.BATTLEFIELD, ["Land"], type_line="Basic Land — Mountain")
+            state.players[pid].battlefield.append(cid)
+        for n in range(2):
+            cid = f"g{pid}{n}"
+            state.cards[cid] = CardInstance(cid, "Goblin Guide", pid, pid, Zone.BATTLEFIELD, ["Creature"], power=2, toughness=2)
+            state.players[pid].battlefield.append(cid)
+    return state
+
+
+def test_choose_action_picks_the_same_move_for_any_worker_count() -> None:
+    state = _crowded_state()
+    picks = []
+    try:
+        for workers in (0, 2):
+            agent = AIAgent(difficulty="master", archetype="Control", search_workers=workers)
+            picks.append(agent.choose_action(state, agent.engine.legal_moves(state, 1), 1).action)
+    finally:
+        shutdown_search_pools()
+    assert picks[0] == picks[1]
+
+
+def test_inline_root_search_shares_the_agents_table(monkeypatch) -> None:
+    def no_snapshots(state):
+        raise AssertionError("inline root search should not snapshot the state")
+
+    monkeypatch.setattr("ai.agent.serialize_match_snapshot", no_snapshots)
+    state = _crowded_state()
+    agent = AIAgent(difficulty="master", archetype="Control", think_ms=60_000)
+    assert agent.choose_action(state, agent.engine.legal_moves(state, 1), 1).action
+    assert len(agent.transpositions) > 0
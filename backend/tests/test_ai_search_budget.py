@@ -1,4 +1,5 @@
 from ai.agent import AIAgent
+from ai.search_budget import SearchBudget, interactive_think_ms
 from game_state.state import CardInstance, MatchFactory, Zone
 
 
@@ -35,3 +36,42 @@ def test_master_skips_deep_copy_search_on_dense_token_boards(monkeypatch) -> Non
     agent._rank_moves(state, [{"type": "pass_priority"}], 1)
 
     assert called == 0
+
+
+def test_search_budget_stops_at_node_or_time_limit() -> None:
+    budget = SearchBudget(max_nodes=2)
+    assert budget.spend() and budget.spend()
+    assert not budget.spend()
+    assert budget.exhausted and not budget.spend()
+    assert not SearchBudget(think_ms=-1.0).spend()
+    assert SearchBudget().spend(10_000)
+
+
+def test_spent_budget_still_returns_a_ranked_legal_move(monkeypatch) -> None:
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Island"}],
+        [{"quantity": 60, "card_name": "Island"}],
+        seed=72,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    legal = [{"type": "pass_priority"}, {"type": "play_land", "card_id": state.players[1].hand[0]}]
+    simulated = []
+    for think_ms, max_nodes in ((None, 0), (0.0, None)):
+        agent = AIAgent(difficulty="master", think_ms=think_ms, max_nodes=max_nodes)
+        monkeypatch.setattr(agent, "_choose_forced_land_play", lambda *args: None)
+        monkeypatch.setattr(agent, "_best_reply_delta", lambda *args: simulated.append(args) or 0.0)
+        decision = agent.choose_action(state, legal, 1)
+        assert decision.action["type"] in {"pass_priority", "play_land"}
+        assert agent.last_search["exhausted"] and agent.last_search["nodes"] == 1
+    assert simulated == []
+    assert AIAgent(difficulty="master_plus").max_nodes > AIAgent(difficulty="master").max_nodes
+
+
+def test_agents_are_node_limited_unless_a_time_cap_is_requested() -> None:
+    agent = AIAgent(difficulty="master")
+    assert (agent.think_ms, agent.max_nodes) == (None, 400)
+    assert AIAgent(difficulty="easy").think_ms is None
+    capped = AIAgent(difficulty="master", think_ms=interactive_think_ms("master"))
+    assert capped.think_ms == 750.0
+    assert interactive_think_ms("hard") < interactive_think_ms("master_plus")
@@ -0,0 +1,75 @@
+from ai.agent import AIAgent
+from ai.transposition import TranspositionTable
+from game_state.state import MatchFactory
+
+
+def test_table_evicts_least_recently_used_and_resets_per_turn() -> None:
+    table = TranspositionTable(capacity=2)
+    table.begin_decision(("m", 1))
+    table.put("a", 1.0)
+    table.put("b", 2.0, {"type": "pass_priority"})
+    assert table.get("a").score == 1.0
+    table.put("c", 3.0)
+    assert table.get("b") is None
+    assert table.get("a") is not None and table.get("c") is not None
+    assert table.decision_stats() == {"hits": 3, "lookups": 4, "hit_rate": 0.75, "size": 2}
+
+    table.begin_decision(("m", 1))
+    assert len(table) == 2 and table.decision_stats()["lookups"] == 0
+    table.begin_decision(("m", 2))
+    assert len(table) == 0
+
+
+def test_line_scores_are_reused_across_decisions_in_a_turn() -> None:
+    deck = [
+        {"quantity": 30, "card_name": "Mountain"},
+        {"quantity": 30, "card_name": "Lightning Bolt", "mana_cost": "{R}", "type_line": "Instant",
+         "oracle_text": "Lightning Bolt deals 3 damage to any target."},
+    ]
+    state = MatchFactory.from_decks(deck, deck, seed=5)
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    agent = AIAgent(difficulty="master")
+    move = {"type": "pass_priority"}
+
+    agent.transpositions.begin_decision((state.id, state.turn))
+    first = agent._strategic_line_score(state, move, 1, depth=1)
+    assert agent.transpositions.decision_stats()["lookups"] > 1
+
+    agent.transpositions.begin_decision((state.id, state.turn))
+    assert agent._strategic_line_score(state, move, 1, depth=1) == first
+    assert agent.transpositions.decision_stats() == {
+        "hits": 1,
+        "lookups": 1,
+        "hit_rate": 1.0,
+        "size": len(agent.transpositions),
+    }
+
+
+def test_rankings_and_lookahead_are_reused_for_a_known_position() -> None:
+    deck = [
+        {"quantity": 30, "card_name": "Mountain"},
+        {"quantity": 30, "card_name": "Lightning Bolt", "mana_cost": "{R}", "type_line": "Instant",
+         "oracle_text": "Lightning Bolt deals 3 damage to any target."},
+    ]
+    state = MatchFactory.from_decks(deck, deck, seed=5)
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    agent = AIAgent(difficulty="master")
+    legal = agent.engine.legal_moves(state, 1)
+    calls = []
+    simulate = agent._simulate_delta
+    agent._simulate_delta = lambda *args: calls.append(args[1]) or simulate(*args)
+
+    agent.transpositions.begin_decision((state.id, state.turn))
+    first = agent._rank_moves(state, legal, 1)
+    assert len(calls) == len(legal)
+
+    agent.transpositions.begin_decision((state.id, state.turn))
+    assert agent._rank_moves(state, legal, 1) == first
+    assert agent._rank_moves(state, legal[:2], 1)
+    assert len(calls) == len(legal)
+
+    agent.transpositions.begin_decision((state.id, state.turn + 1))
+    agent._rank_moves(state, legal, 1)
+    assert len(calls) == 2 * len(legal)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ai.agent import AIAgent
 from analytics.service import AnalyticsService
 
 
@@ -36,6 +37,48 @@ def test_batch_is_deterministic_for_same_inputs() -> None:
     assert [row["deck_a_on_play"] for row in out1["game_results"]] == [True, False]
 
 
+def test_batch_worker_pool_matches_serial_run() -> None:
+    deck_a = [{"quantity": 24, "card_name": "Mountain"}, {"quantity": 36, "card_name": "Raging Goblin"}]
+    deck_b = [{"quantity": 60, "card_name": "Forest"}]
+    serial = AnalyticsService(_DummyRepo()).run_batch(deck_a, deck_b, matches=3, difficulty="hard", max_ticks=80)  # type: ignore[arg-type]
+    progress: list[int] = []
+    pooled = AnalyticsService(_DummyRepo()).run_batch(  # type: ignore[arg-type]
+        deck_a, deck_b, matches=3, difficulty="hard", max_ticks=80, workers=2, progress_callback=lambda done, total: progress.append(done)
+    )
+    assert pooled == serial
+    assert progress == [1, 2, 3]
+    assert any(row["turns"] > 1 for row in serial["game_results"])
+
+
+def test_master_batch_pool_matches_serial_run_with_search(monkeypatch) -> None:
+    pinger = {"quantity": 12, "card_name": "Prodigal Sorcerer", "mana_cost": "{2}{R}", "type_line": "Creature — Human Wizard",
+              "oracle_text": "{T}: This creature deals 1 damage to any target.", "power": "1", "toughness": "1"}
+    goblin = {"quantity": 24, "card_name": "Goblin Guide", "mana_cost": "{R}", "type_line": "Creature — Goblin Scout",
+              "oracle_text": "Haste", "power": "2", "toughness": "2"}
+    bear = {"quantity": 24, "card_name": "Grizzly Bears", "mana_cost": "{1}{G}", "type_line": "Creature — Bear",
+            "oracle_text": "", "power": "2", "toughness": "2"}
+    wall = {"quantity": 12, "card_name": "Wall of Wood", "mana_cost": "{G}", "type_line": "Creature — Wall",
+            "oracle_text": "Defender", "power": "0", "toughness": "3"}
+    deck_a = [{"quantity": 24, "card_name": "Mountain"}, pinger, goblin]
+    deck_b = [{"quantity": 24, "card_name": "Forest"}, bear, wall]
+
+    searched: list[int] = []
+    choose_action = AIAgent.choose_action
+
+    def record(agent, *args):
+        decision = choose_action(agent, *args)
+        searched.append(agent.last_search["nodes"])
+        return decision
+
+    monkeypatch.setattr(AIAgent, "choose_action", record)
+    serial = AnalyticsService(_DummyRepo()).run_batch(deck_a, deck_b, matches=2, difficulty="master", max_ticks=1500)  # type: ignore[arg-type]
+    monkeypatch.undo()
+    pooled = AnalyticsService(_DummyRepo()).run_batch(deck_a, deck_b, matches=2, difficulty="master", max_ticks=1500, workers=2)  # type: ignore[arg-type]
+    assert pooled == serial
+    assert all(row["winner"] is not None and row["turns"] >= 10 for row in serial["game_results"])
+    assert max(searched) > 50
+
+
 def test_batch_exposes_first_divergence_report() -> None:
     repo = _DummyRepo()
     service = AnalyticsService(repo)  # type: ignore[arg-type]
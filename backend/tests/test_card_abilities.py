@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from rules_engine.card_abilities import compile_card_abilities
+
+
+def test_compiled_abilities_are_shared_per_oracle_text() -> None:
+    text = "Other Elf creatures you control get +1/+1 and have trample."
+    first = compile_card_abilities(text)
+    assert compile_card_abilities(str(text)) is first
+    assert first.pt_modifiers == (("you control", True, "elf creatures", 1, 1),)
+    assert first.keyword_grants == (("you control", True, "elf creatures", ("trample",)),)
+
+
+def test_compiled_abilities_record_triggers_replacements_and_taxes() -> None:
+    soul_warden = compile_card_abilities("Whenever another creature enters the battlefield, you gain 1 life.")
+    assert "enters_battlefield" in soul_warden.trigger_events
+    assert "draw_card" not in soul_warden.trigger_events
+
+    thalia = compile_card_abilities("First strike\nNoncreature spells cost {1} more to cast.")
+    assert thalia.spell_taxes == (("", "noncreature", 1),)
+
+    rest = compile_card_abilities("If a creature you control would die, exile it instead.")
+    assert "die_exile" in rest.replacement_kinds
+    assert "enters_battlefield" not in rest.trigger_events
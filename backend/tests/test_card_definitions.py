@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import copy
+
+from game_state.serializers import deserialize_match_snapshot, serialize_match_snapshot
+from game_state.state import MatchFactory
+
+
+DECK = [
+    {"quantity": 20, "card_name": "Mountain", "type_line": "Basic Land — Mountain"},
+    {
+        "quantity": 40,
+        "card_name": "Monastery Swiftspear",
+        "mana_cost": "{R}",
+        "type_line": "Creature — Human Monk",
+        "oracle_text": "Haste\nProwess",
+        "power": "1",
+        "toughness": "2",
+    },
+]
+
+
+def _state():
+    state = MatchFactory.from_decks(DECK, DECK, seed=11)
+    state.pregame_pending = False
+    return state
+
+
+def test_copies_of_a_deck_entry_share_one_definition() -> None:
+    state = _state()
+    spears = [card for card in state.cards.values() if card.name == "Monastery Swiftspear"]
+    assert len({id(card.definition) for card in spears}) == 1
+    assert all(card.oracle_text is spears[0].definition.oracle_text for card in spears)
+    assert spears[0].keywords == ("haste",)
+    branch = copy.deepcopy(state)
+    assert branch.cards[spears[0].id].definition is spears[0].definition
+
+
+def test_snapshot_stores_definitions_once_and_keeps_overrides() -> None:
+    state = _state()
+    spear = next(card for card in state.cards.values() if card.name == "Monastery Swiftspear")
+    spear.keywords = [*spear.keywords, "flying"]
+    spear.oracle_text = "Haste\nProwess\nFlying"
+
+    snapshot = serialize_match_snapshot(state)
+    assert len(snapshot["card_definitions"]) == 2
+    assert "oracle_text" not in snapshot["cards"][next(
+        cid for cid, card in state.cards.items() if card.name == "Mountain"
+    )]
+    restored = deserialize_match_snapshot(snapshot)
+    assert restored.cards[spear.id].oracle_text == "Haste\nProwess\nFlying"
+    assert list(restored.cards[spear.id].keywords) == ["haste", "flying"]
+    assert restored.cards[spear.id].definition is spear.definition
+    assert serialize_match_snapshot(restored) == snapshot
+
+
+def test_snapshot_without_definitions_still_loads() -> None:
+    state = _state()
+    snapshot = serialize_match_snapshot(state)
+    definitions = snapshot.pop("card_definitions")
+    for raw in snapshot["cards"].values():
+        raw.update(definitions[raw.pop("definition")])
+
+    restored = deserialize_match_snapshot(snapshot)
+    for cid, card in state.cards.items():
+        assert restored.cards[cid].definition is card.definition
+        assert restored.cards[cid].oracle_text == card.oracle_text
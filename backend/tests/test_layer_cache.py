@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from game_state.state import CardInstance, MatchFactory, Zone
+from rules_engine import continuous
+from rules_engine.continuous import continuous_layer_trace, effective_keywords, effective_power, effective_toughness
+
+
+def _board():
+    deck = [{"quantity": 60, "card_name": "Island"}]
+    state = MatchFactory.from_decks(deck, deck, seed=41)
+    cards = [
+        CardInstance(id="elf", name="Elf", owner=1, controller=1, zone=Zone.BATTLEFIELD, types=["Creature"], type_line="Creature — Elf", power=1, toughness=1),
+        CardInstance(
+            id="lord", name="Lord", owner=1, controller=1, zone=Zone.BATTLEFIELD, types=["Creature"], type_line="Creature — Elf",
+            power=2, toughness=2, oracle_text="Other Elf creatures you control get +1/+1 and have trample.", effect_timestamp=3,
+        ),
+        CardInstance(
+            id="blight", name="Blight", owner=2, controller=2, zone=Zone.BATTLEFIELD, types=["Enchantment"],
+            oracle_text="Creatures your opponents control get -1/-1 and lose trample.", effect_timestamp=5,
+        ),
+    ]
+    for card in cards:
+        state.cards[card.id] = card
+        state.players[card.controller].battlefield.append(card.id)
+    return state
+
+
+def _uncached(state, card_id: str) -> tuple[int, int, list[str]]:
+    state.__dict__.pop("_layer_memo", None)
+    result = (effective_power(state, card_id), effective_toughness(state, card_id), effective_keywords(state, card_id))
+    state.__dict__.pop("_layer_memo", None)
+    return result
+
+
+def test_memoized_layers_match_fresh_computation_and_trace() -> None:
+    state = _board()
+    for cid in ("elf", "lord"):
+        memoized = (effective_power(state, cid), effective_toughness(state, cid), effective_keywords(state, cid))
+        assert memoized == _uncached(state, cid)
+        trace = continuous_layer_trace(state, cid)
+        assert (trace["effective_power"], trace["effective_toughness"]) == memoized[:2]
+    assert effective_power(state, "elf") == 1
+    assert effective_keywords(state, "elf") == []
+
+
+def test_memoized_layers_invalidate_on_zone_control_and_counter_changes() -> None:
+    state = _board()
+    assert effective_power(state, "elf") == 1
+
+    state.cards["elf"].counters["+1/+1"] = 2
+    assert effective_power(state, "elf") == 3
+
+    state.cards["blight"].zone = Zone.GRAVEYARD
+    state.players[2].battlefield.remove("blight")
+    state.players[2].graveyard.append("blight")
+    assert effective_power(state, "elf") == 4
+    assert effective_keywords(state, "elf") == ["trample"]
+
+    state.cards["lord"].controller = 2
+    state.players[1].battlefield.remove("lord")
+    state.players[2].battlefield.append("lord")
+    assert effective_power(state, "elf") == 3
+    assert (effective_power(state, "elf"), effective_toughness(state, "elf"), effective_keywords(state, "elf")) == _uncached(state, "elf")
+
+
+def test_layer_memo_is_not_shared_with_forks() -> None:
+    state = _board()
+    effective_power(state, "elf")
+    assert "_layer_memo" in state.__dict__
+    branch = state.fork()
+    assert "_layer_memo" not in branch.__dict__
+    assert continuous._all_battlefield_ids(branch) == continuous._all_battlefield_ids(state)
+
+
+def test_writes_to_other_states_keep_the_layer_memo() -> None:
+    state = _board()
+    other = _board()
+    effective_power(state, "elf")
+    memo = state.__dict__["_layer_memo"]
+
+    branch = state.fork()
+    branch.cards["elf"].power = 5
+    other.cards["lord"].oracle_text = ""
+    effective_power(other, "elf")
+    assert effective_power(state, "elf") == 1
+    assert state.__dict__["_layer_memo"] is memo
+    assert effective_power(branch, "elf") == 5
+
+    state.cards["elf"].power = 3
+    assert effective_power(state, "elf") == 3
+    assert state.__dict__["_layer_memo"] is not memo
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from game_state.state import CardInstance, MatchState, PlayerState, Step, Zone
+from rules_engine.costs import check_cost_option_available, collect_cost_options
+from rules_engine.mana import can_pay_with_pool_and_lands, mana_availability
+from rules_engine.move_generator import legal_moves
+
+
+def _card(cid: str, name: str, owner: int, zone: Zone, types: list[str], mana_cost: str = "", oracle_text: str = "") -> CardInstance:
+    return CardInstance(
+        id=cid, name=name, owner=owner, controller=owner, zone=zone, types=types,
+        mana_cost=mana_cost, oracle_text=oracle_text, type_line=" ".join(types),
+    )
+
+
+def _state() -> MatchState:
+    cards = {
+        "m1": _card("m1", "Mountain", 1, Zone.BATTLEFIELD, ["Land"]),
+        "m2": _card("m2", "Mountain", 1, Zone.BATTLEFIELD, ["Land"]),
+        "elf": _card("elf", "Llanowar Elves", 1, Zone.BATTLEFIELD, ["Creature"], "{G}", "{T}: Add {G}."),
+        "tax": _card("tax", "Thalia, Guardian of Thraben", 2, Zone.BATTLEFIELD, ["Creature"], "{1}{W}",
+                     "First strike\nNoncreature spells cost {1} more to cast."),
+        "bolt": _card("bolt", "Lightning Bolt", 1, Zone.HAND, ["Instant"], "{R}"),
+        "rift": _card("rift", "Fireblast Rift", 1, Zone.HAND, ["Sorcery"], "{2}{R}"),
+        "bear": _card("bear", "Grizzly Bears", 1, Zone.HAND, ["Creature"], "{1}{G}"),
+    }
+    cards["elf"].summoning_sick = False
+    players = {
+        1: PlayerState(id=1, name="P1", battlefield=["m1", "m2", "elf"], hand=["bolt", "rift", "bear"]),
+        2: PlayerState(id=2, name="P2", battlefield=["tax"]),
+    }
+    return MatchState(
+        id="mana-availability", players=players, cards=cards, stack=[],
+        active_player=1, priority_player=1, step=Step.PRECOMBAT_MAIN, turn=3, pregame_pending=False,
+    )
+
+
+def test_shared_availability_matches_fresh_payability_checks():
+    state = _state()
+    availability = mana_availability(state, 1)
+    for cid in state.players[1].hand:
+        card = state.cards[cid]
+        for option in collect_cost_options(state, 1, card):
+            assert check_cost_option_available(state, 1, card, option, availability=availability) == (
+                check_cost_option_available(state, 1, card, option)
+            )
+    for cost in ["{R}", "{G}{G}", "{2}{R}", "{3}", "{4}", "{C}"]:
+        assert can_pay_with_pool_and_lands(state, 1, cost, availability=availability) == (
+            can_pay_with_pool_and_lands(state, 1, cost)
+        )
+    # The opponent's tax still applies through the snapshot: {2}{R} + 1 exceeds three sources.
+    rift = state.cards["rift"]
+    assert not check_cost_option_available(state, 1, rift, collect_cost_options(state, 1, rift)[0], availability=availability)
+    cast_ids = {move["card_id"] for move in legal_moves(state, 1) if move["type"] == "cast_spell"}
+    assert cast_ids == {"bolt", "bear"}
+
+
+def test_availability_for_another_player_is_ignored():
+    state = _state()
+    other = mana_availability(state, 2)
+    assert can_pay_with_pool_and_lands(state, 1, "{2}{R}", availability=other)
+    assert not can_pay_with_pool_and_lands(state, 2, "{1}", availability=mana_availability(state, 2))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from ai.agent import AIAgent
+from game_state.match_log import MatchLog, log_event
+from game_state.state import MatchFactory
+from rules_engine.engine import RulesEngine
+
+
+class _Holder:
+    def __init__(self, log) -> None:
+        self.log = log
+
+
+def _write_sample(holder: _Holder) -> None:
+    for _ in range(4):
+        log_event(holder, "priority_pass", "{player} passes priority on {step} (stack={stack_size}).",
+                  player="A", step="precombat_main", stack_size=0)
+    log_event(holder, "invalid_targets", "Invalid targets for {card}: {error}",
+              card="Fireball", error="X value is required and must be non-negative.")
+    log_event(holder, "invalid_targets", "Invalid targets for {card}: {error}",
+              card="Fireball", error="X value is required and must be non-negative.")
+    log_event(holder, "oracle_fallback", "Oracle effect not inferred for {card} (controller={controller}). Text: {text}",
+              card="Odd Card", controller=1, text="Do something {weird}.")
+    log_event(holder, "mana_payment_failed", "{player} cannot pay mana cost for {card}.", player="A", card="Bear")
+    holder.log.append("A missed land-play window.")
+
+
+def test_typed_events_render_like_plain_lines() -> None:
+    typed, plain = _Holder(MatchLog()), _Holder([])
+    _write_sample(typed)
+    _write_sample(plain)
+
+    assert list(typed.log) == plain.log
+    assert typed.log[-2] == "A cannot pay mana cost for Bear."
+    assert [event.fields["card"] for event in typed.log.events("invalid_targets")] == ["Fireball", "Fireball"]
+
+
+def test_limit_disabled_and_forked_logs() -> None:
+    log = MatchLog(limit=3)
+    for index in range(5):
+        log.append(f"line {index}")
+    assert list(log) == ["line 2", "line 3", "line 4"]
+    assert log.dropped == 2
+
+    state = MatchFactory.from_decks([{"quantity": 60, "card_name": "Island"}], [{"quantity": 60, "card_name": "Island"}], seed=2)
+    branch = state.fork()
+    branch.log.append("ignored")
+    assert len(branch.log) == 0
+    assert list(state.fork(with_log=True).log) == list(state.log)
+
+
+def test_stack_and_combat_lines_are_typed_events() -> None:
+    deck = [
+        {"quantity": 24, "card_name": "Mountain"},
+        {"quantity": 36, "card_name": "Goblin Guide", "mana_cost": "{R}", "type_line": "Creature — Goblin Scout",
+         "oracle_text": "Haste", "power": "2", "toughness": "2"},
+    ]
+    state = MatchFactory.from_decks(deck, deck, seed=5)
+    engine = RulesEngine()
+    agents = {1: AIAgent(difficulty="easy"), 2: AIAgent(difficulty="easy")}
+    for _ in range(600):
+        if state.winner is not None:
+            break
+        pid = (1 if 1 not in state.kept_hands else 2) if state.pregame_pending else state.priority_player
+        engine.take_action(state, pid, agents[pid].choose_action(state, engine.legal_moves(state, pid), pid).action)
+    kinds = {event.kind for event in state.log.events()}
+    assert {"stack_push", "stack_resolve", "attackers_declared"} <= kinds
+    assert any(line.startswith("Attackers declared: Goblin Guide -> ") for line in state.log)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from game_state.match_log import MatchLog
+from game_state.state import MatchFactory, Step, Zone
+from game_state.telemetry import MatchTelemetry
+from rules_engine.engine import RulesEngine
+
+
+def _main_phase_state():
+    state = MatchFactory.from_decks([{"quantity": 60, "card_name": "Island"}], [{"quantity": 60, "card_name": "Island"}], seed=5)
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.active_player = 1
+    state.priority_player = 1
+    state.step = Step.PRECOMBAT_MAIN
+    return state
+
+
+def _hexproof_cast(state):
+    target_id = state.players[2].hand[0]
+    state.players[2].hand.remove(target_id)
+    state.players[2].battlefield.append(target_id)
+    target = state.cards[target_id]
+    target.zone = Zone.BATTLEFIELD
+    target.types = ["Creature"]
+    target.keywords = ["hexproof"]
+    spell_id = state.players[1].hand[0]
+    spell = state.cards[spell_id]
+    spell.name = "Needle Ray"
+    spell.types = ["Instant"]
+    spell.type_line = "Instant"
+    spell.mana_cost = "{U}"
+    spell.oracle_text = "Destroy target creature."
+    land_id = state.players[1].hand[1]
+    state.players[1].hand.remove(land_id)
+    state.players[1].battlefield.append(land_id)
+    land = state.cards[land_id]
+    land.zone = Zone.BATTLEFIELD
+    land.types = ["Land"]
+    land.name = "Island"
+    return {"type": "cast_spell", "card_id": spell_id, "targets": {"target_card_id": target_id}}
+
+
+def test_streak_counters_are_tracked_online() -> None:
+    telemetry = MatchTelemetry()
+    for _ in range(4):
+        telemetry.record_pass((3, "precombat_main", 0))
+    assert telemetry.counts["stall_pass_streaks"] == 1
+
+    for _ in range(3):
+        telemetry.record_pass((3, "precombat_main", 0))
+    telemetry.record_action()
+    telemetry.record_pass((3, "precombat_main", 0))
+    assert telemetry.counts["stall_pass_streaks"] == 1
+
+    for _ in range(3):
+        telemetry.record_anomaly("invalid_targets", "Invalid targets for Fireball: X value is required.", x_value_error=True)
+    assert telemetry.counts["invalid_targets"] == 3
+    assert telemetry.counts["x_spell_error_loops"] == 1
+    assert telemetry.counts["repeated_error_bursts"] == 1
+
+    telemetry.record_anomaly("oracle_fallbacks", "Oracle effect not inferred for Odd Card.", card_name="Odd Card")
+    assert telemetry.oracle_fallback_cards["Odd Card"] == 1
+
+
+def test_a_stall_is_four_passes_at_one_point_of_the_turn() -> None:
+    telemetry = MatchTelemetry()
+    # Both players passing through a step is progress, not a stall.
+    for step in ("upkeep", "draw", "precombat_main", "beginning_of_combat"):
+        telemetry.record_pass((3, step, 0))
+        telemetry.record_pass((3, step, 0))
+    assert telemetry.counts["stall_pass_streaks"] == 0
+
+    for depth in (0, 0, 1, 1, 1):
+        telemetry.record_pass((3, "precombat_main", depth))
+    assert telemetry.counts["stall_pass_streaks"] == 0
+    telemetry.record_pass((3, "precombat_main", 1))
+    assert telemetry.counts["stall_pass_streaks"] == 1
+
+
+def test_engine_counts_failures_with_log_disabled() -> None:
+    state = _main_phase_state()
+    state.log = MatchLog(enabled=False)
+    engine = RulesEngine()
+
+    engine.take_action(state, 1, _hexproof_cast(state))
+
+    assert len(state.log) == 0
+    assert state.telemetry.counts["invalid_targets"] == 1
+    assert any("Needle Ray" in error for error in state.telemetry.errors)
+
+
+def test_forks_do_not_leak_counts() -> None:
+    state = _main_phase_state()
+    engine = RulesEngine()
+    action = _hexproof_cast(state)
+
+    branch = state.fork()
+    engine.take_action(branch, 1, action)
+    assert state.telemetry.counts["invalid_targets"] == 0
+    assert not branch.telemetry.counts
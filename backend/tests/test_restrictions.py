@@ -106,6 +106,45 @@ def test_cast_only_during_your_turn_restriction_and_move_hint() -> None:
     restricted = [m for m in moves if m.get("type") == "cast_spell_restricted" and m.get("card_id") == cid]
     assert len(restricted) == 1
     assert "your turn" in restricted[0]["reason"].lower()
+    assert engine.legal_moves(state, 1, rollout=True) == [{"type": "pass_priority"}]
+
+
+def test_rollout_moves_drop_restricted_entries_only() -> None:
+    state = MatchFactory.from_decks([{"quantity": 60, "card_name": "Island"}], [{"quantity": 60, "card_name": "Island"}])
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.active_player = 1
+    state.priority_player = 1
+    state.step = Step.DECLARE_ATTACKERS
+
+    ready = _setup_creature(state, 1, "Ready", 2, 2)
+    sick = _setup_creature(state, 1, "Fresh", 3, 3)
+    state.cards[sick].summoning_sick = True
+
+    engine = RulesEngine()
+    full = engine.legal_moves(state, 1)
+    rollout = engine.legal_moves(state, 1, rollout=True)
+    assert {"type": "attack_restricted", "card_id": sick, "card_name": "Fresh", "reason": "Summoning sick"} in full
+    assert rollout == [move for move in full if not move["type"].endswith("_restricted")]
+    assert next(move for move in rollout if move["type"] == "attack")["options"] == [ready]
+
+
+def test_rollout_moves_keep_hints_for_targeted_abilities() -> None:
+    state = MatchFactory.from_decks([{"quantity": 60, "card_name": "Island"}], [{"quantity": 60, "card_name": "Island"}])
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.active_player = 1
+    state.priority_player = 1
+    state.step = Step.PRECOMBAT_MAIN
+
+    pinger = _setup_creature(state, 1, "Pinger", 1, 1, "{T}: This creature deals 1 damage to any target.")
+    _setup_creature(state, 2, "Bear", 2, 2)
+
+    engine = RulesEngine()
+    full = next(m for m in engine.legal_moves(state, 1) if m["type"] == "activate_ability" and m["card_id"] == pinger)
+    rollout = next(m for m in engine.legal_moves(state, 1, rollout=True) if m["type"] == "activate_ability" and m["card_id"] == pinger)
+    assert rollout["target_hints"]
+    assert rollout["target_hints"] == full["target_hints"]
 
 
 def test_static_you_cant_cast_spells_during_combat_enforced() -> None:
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from ai.agent import AIAgent
+from game_state.serializers import deserialize_match_snapshot, serialize_match_snapshot
 from game_state.state import MatchFactory
 from main import ACTIVE_MATCHES, MatchController, get_match_replay
 from rules_engine.engine import RulesEngine
+from rules_engine.stack_engine import add_to_stack
 from scripts.regression_matrix_replay import _normalize_log_line, classify_first_divergence, classify_log_line, run_match
 from analytics.replay_tools import classify_timeout_state
 
@@ -32,6 +34,18 @@ def test_seeded_mulligans_are_reproducible_even_after_prior_random_use() -> None
     assert [a.cards[cid].name for cid in a.players[1].library[:10]] == [b.cards[cid].name for cid in b.players[1].library[:10]]
 
 
+def test_seeded_match_and_stack_ids_are_reproducible() -> None:
+    deck = [{"quantity": 4, "card_name": "Lightning Bolt"}, {"quantity": 56, "card_name": "Mountain"}]
+    a = MatchFactory.from_decks(deck, deck, seed=123)
+    b = MatchFactory.from_decks(deck, deck, seed=123)
+    assert a.id == b.id != MatchFactory.from_decks(deck, deck, seed=124).id
+
+    items = [add_to_stack(state, state.players[1].hand[0], 1, "Test", "gain_life", {"amount": 1}) for state in (a, b)]
+    assert items[0].id == items[1].id == "stack-0001"
+    restored = deserialize_match_snapshot(serialize_match_snapshot(a))
+    assert add_to_stack(restored, restored.players[1].hand[0], 1, "Test", "gain_life", {"amount": 1}).id == "stack-0002"
+
+
 def test_best_of_replay_aggregates_games_deterministically() -> None:
     deck = [{"quantity": 4, "card_name": "Lightning Bolt"}, {"quantity": 56, "card_name": "Mountain"}]
 
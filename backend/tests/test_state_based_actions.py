@@ -0,0 +1,49 @@
+from game_state.state import CardInstance, MatchFactory, Zone
+from rules_engine.state_based_actions import DMG_MARK_KEY, _sba_candidates, apply_state_based_actions
+
+
+def _state_with(*cards: CardInstance) -> object:
+    state = MatchFactory.from_decks(
+        [{"quantity": 60, "card_name": "Forest"}],
+        [{"quantity": 60, "card_name": "Forest"}],
+        seed=11,
+    )
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    for card in cards:
+        state.cards[card.id] = card
+        state.players[card.controller].battlefield.append(card.id)
+    return state
+
+
+def test_clean_check_skips_unchanged_permanents_and_catches_new_damage() -> None:
+    bear = CardInstance("bear", "Bear", 1, 1, Zone.BATTLEFIELD, ["Creature"], power=2, toughness=2)
+    wolf = CardInstance("wolf", "Wolf", 2, 2, Zone.BATTLEFIELD, ["Creature"], power=2, toughness=2)
+    state = _state_with(bear, wolf)
+
+    apply_state_based_actions(state)
+    assert _sba_candidates(state)[1] == []
+
+    wolf.counters[DMG_MARK_KEY] = 2
+    assert _sba_candidates(state)[1] == ["wolf"]
+    apply_state_based_actions(state)
+    assert wolf.zone == Zone.GRAVEYARD
+    assert bear.zone == Zone.BATTLEFIELD
+
+
+def test_anthem_leaving_rechecks_every_permanent() -> None:
+    anthem = CardInstance(
+        "anthem", "Anthem", 1, 1, Zone.BATTLEFIELD, ["Enchantment"], oracle_text="Creatures you control get +1/+1."
+    )
+    bear = CardInstance("bear", "Bear", 1, 1, Zone.BATTLEFIELD, ["Creature"], power=1, toughness=1)
+    bear.counters[DMG_MARK_KEY] = 1
+    state = _state_with(anthem, bear)
+
+    apply_state_based_actions(state)
+    assert bear.zone == Zone.BATTLEFIELD
+
+    state.players[1].battlefield.remove("anthem")
+    state.players[1].graveyard.append("anthem")
+    anthem.zone = Zone.GRAVEYARD
+    apply_state_based_actions(state)
+    assert bear.zone == Zone.GRAVEYARD
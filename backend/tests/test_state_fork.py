@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from game_state.serializers import serialize_match_snapshot
+from game_state.state import CardInstance, MatchFactory, Step, Zone
+from rules_engine.engine import RulesEngine
+
+
+def _main_phase_state():
+    deck = [{"quantity": 60, "card_name": "Mountain"}]
+    state = MatchFactory.from_decks(deck, deck, seed=11)
+    state.pregame_pending = False
+    state.kept_hands = {1, 2}
+    state.step = Step.PRECOMBAT_MAIN
+    state.active_player = 1
+    state.priority_player = 1
+    return state
+
+
+def test_fork_is_independent_of_parent() -> None:
+    state = _main_phase_state()
+    state.cards["bear"] = CardInstance(
+        id="bear",
+        name="Grizzly Bears",
+        owner=1,
+        controller=1,
+        zone=Zone.BATTLEFIELD,
+        types=["Creature"],
+        power=2,
+        toughness=2,
+    )
+    state.players[1].battlefield.append("bear")
+    before = serialize_match_snapshot(state)
+
+    branch = state.fork()
+    branch.cards["bear"].tapped = True
+    branch.cards["bear"].counters["+1/+1"] = 2
+    branch.cards["bear"].keywords = [*branch.cards["bear"].keywords, "flying"]
+    branch.players[1].battlefield.remove("bear")
+    branch.players[2].life = 3
+    branch.passed_priority.add(2)
+    branch.rng.random()
+    branch.log.append("branch only")
+
+    assert serialize_match_snapshot(state) == before
+    assert branch.cards["bear"].oracle_text is state.cards["bear"].oracle_text
+
+
+def test_fork_replays_actions_like_parent() -> None:
+    state = _main_phase_state()
+    branch = state.fork(with_log=True)
+    engine = RulesEngine()
+    land = next(cid for cid in state.players[1].hand if state.cards[cid].name == "Mountain")
+
+    engine.take_action(state, 1, {"type": "play_land", "card_id": land})
+    engine.take_action(branch, 1, {"type": "play_land", "card_id": land})
+
+    assert serialize_match_snapshot(branch) == serialize_match_snapshot(state)
+
+
+def test_fork_starts_with_empty_log_by_default() -> None:
+    state = _main_phase_state()
+    assert state.log
+    assert state.fork().log == []
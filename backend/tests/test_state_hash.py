@@ -0,0 +1,97 @@
+from ai.agent import AIAgent
+from effects.registry import resolve_effect
+from game_state.state import MatchFactory, Step
+from game_state.state_hash import compute_state_hash, state_hash, zobrist_key
+from rules_engine.engine import RulesEngine
+
+
+def _deck() -> list[dict]:
+    return [
+        {"quantity": 20, "card_name": "Mountain"},
+        {"quantity": 12, "card_name": "Lightning Bolt", "mana_cost": "{R}", "type_line": "Instant",
+         "oracle_text": "Lightning Bolt deals 3 damage to any target."},
+        {"quantity": 28, "card_name": "Goblin Guide", "mana_cost": "{R}", "type_line": "Creature — Goblin Scout",
+         "oracle_text": "Haste", "power": "2", "toughness": "2"},
+    ]
+
+
+def test_incremental_hash_matches_recomputation_through_a_game() -> None:
+    state = MatchFactory.from_decks(_deck(), _deck(), seed=21)
+    engine = RulesEngine()
+    agents = {1: AIAgent(difficulty="easy"), 2: AIAgent(difficulty="easy")}
+    for tick in range(400):
+        if state.winner is not None:
+            break
+        pid = (1 if 1 not in state.kept_hands else 2) if state.pregame_pending else state.priority_player
+        legal = engine.legal_moves(state, pid)
+        action = agents[pid].choose_action(state, legal, pid).action
+        if tick % 25 == 0:
+            before = state_hash(state, verify=True)
+            branch = state.fork()
+            assert state_hash(branch) == before
+            engine.take_action(branch, pid, action)
+            state_hash(branch, verify=True)
+            assert state_hash(state, verify=True) == before
+        engine.take_action(state, pid, action)
+        state_hash(state, verify=True)
+    assert state.turn > 2
+
+
+def test_same_position_reached_in_a_different_order_hashes_equal() -> None:
+    deck = [{"quantity": 60, "card_name": "Mountain"}]
+    a = MatchFactory.from_decks(deck, deck, seed=3)
+    b = MatchFactory.from_decks(deck, deck, seed=3)
+    first, second = a.players[1].hand[:2]
+    state_hash(a)
+    state_hash(b)
+    a.cards[first].tapped = True
+    a.cards[second].tapped = True
+    b.cards[second].tapped = True
+    b.cards[first].tapped = True
+    assert state_hash(a) == state_hash(b) == compute_state_hash(a)
+    a.cards[first].tapped = False
+    assert state_hash(a) != state_hash(b)
+
+
+def test_forks_inherit_the_tracker_and_combat_is_part_of_the_position() -> None:
+    state = MatchFactory.from_decks(_deck(), _deck(), seed=8)
+    before = state_hash(state)
+    branch = state.fork()
+    assert branch.__dict__["_state_hash"] is not state.__dict__["_state_hash"]
+    card = next(iter(branch.cards.values()))
+    card.tapped = not card.tapped
+    assert state_hash(branch, verify=True) != before
+    assert state_hash(state, verify=True) == before
+
+    state.attackers = [card.id]
+    state.attackers_declared = True
+    assert state_hash(state, verify=True) != before
+
+
+def test_characteristics_and_pending_choices_are_part_of_the_position() -> None:
+    state = MatchFactory.from_decks(_deck(), _deck(), seed=4)
+    card = state.cards[state.players[1].hand[0]]
+    seen = {state_hash(state, verify=True)}
+
+    resolve_effect(state, 1, "grant_keyword", {"target_card_id": card.id, "keyword": "flying"})
+    seen.add(state_hash(state, verify=True))
+    card.types = [*card.types, "Artifact"]
+    seen.add(state_hash(state, verify=True))
+    card.oracle_text = "Vigilance"
+    seen.add(state_hash(state, verify=True))
+    state.temporary_control_changes[card.id] = {"controller": 2, "until_turn": 3}
+    seen.add(state_hash(state, verify=True))
+    state.kept_hands.add(1)
+    seen.add(state_hash(state, verify=True))
+    state.pending_trigger_order = {"event": "etb", "groups": {"1": ["a", "b"]}}
+    seen.add(state_hash(state, verify=True))
+    state.pending_trigger_order = {"event": "etb", "groups": {"1": ["b", "a"]}}
+    seen.add(state_hash(state, verify=True))
+    state.players[2].exile_play_until["x"] = 4
+    seen.add(state_hash(state, verify=True))
+    assert len(seen) == 9
+
+
+def test_zobrist_keys_do_not_depend_on_which_equal_value_was_seen_first() -> None:
+    assert zobrist_key("step", "precombat_main") != zobrist_key("step", Step.PRECOMBAT_MAIN)
+    assert zobrist_key("flags", (0,)) != zobrist_key("flags", (False,))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from game_state.state import CardInstance, MatchFactory, Zone, draw_card
+from rules_engine.events import _trigger_candidates
+
+
+def _state_with_tokens(count: int):
+    deck = [{"quantity": 60, "card_name": "Island"}]
+    state = MatchFactory.from_decks(deck, deck, seed=13)
+    state.pregame_pending = False
+    for index in range(count):
+        cid = f"token-{index}"
+        state.cards[cid] = CardInstance(
+            id=cid, name="Soldier Token", owner=1, controller=1, zone=Zone.BATTLEFIELD, types=["Creature", "Token"], power=1, toughness=1
+        )
+        state.players[1].battlefield.append(cid)
+    return state
+
+
+def test_trigger_index_only_lists_cards_that_can_trigger() -> None:
+    state = _state_with_tokens(30)
+    state.cards["drawer"] = CardInstance(
+        id="drawer", name="Scribe", owner=2, controller=2, zone=Zone.BATTLEFIELD, types=["Creature"],
+        oracle_text="Whenever an opponent draws a card, that player loses 1 life.",
+    )
+    state.players[2].battlefield.append("drawer")
+
+    assert _trigger_candidates(state, "draw_card") == ["drawer"]
+    assert _trigger_candidates(state, "life_gain") == []
+
+    life_before = state.players[1].life
+    draw_card(state, 1)
+    assert state.stack and state.stack[-1].source_card_id == "drawer"
+    assert state.players[1].life == life_before
+
+
+def test_trigger_index_follows_battlefield_and_oracle_changes() -> None:
+    state = _state_with_tokens(3)
+    assert _trigger_candidates(state, "life_gain") == []
+
+    state.cards["token-1"].oracle_text = "Whenever you gain life, put a +1/+1 counter on this creature."
+    assert _trigger_candidates(state, "life_gain") == ["token-1"]
+
+    state.players[1].battlefield.remove("token-1")
+    assert _trigger_candidates(state, "life_gain") == []
+
+
+def test_trigger_index_is_updated_in_place_as_permanents_move() -> None:
+    state = _state_with_tokens(2)
+    oracle = "Whenever you gain life, put a +1/+1 counter on this creature."
+    for cid, controller in [("ajani-1", 2), ("ajani-2", 1)]:
+        state.cards[cid] = CardInstance(id=cid, name="Pridemate", owner=controller, controller=controller, zone=Zone.BATTLEFIELD, types=["Creature"], oracle_text=oracle)
+    assert _trigger_candidates(state, "life_gain") == []
+    index = state.__dict__["_trigger_index"]
+
+    state.players[2].battlefield.append("ajani-1")
+    state.players[1].battlefield.append("ajani-2")
+    assert _trigger_candidates(state, "life_gain") == ["ajani-2", "ajani-1"]
+    state.players[2].battlefield.pop()
+    assert _trigger_candidates(state, "life_gain") == ["ajani-2"]
+    state.players[1].battlefield.insert(0, "ajani-1")
+    assert _trigger_candidates(state, "life_gain") == ["ajani-1", "ajani-2"]
+    assert state.__dict__["_trigger_index"] is index
+
+    branch = state.fork()
+    branch.players[1].battlefield.remove("ajani-2")
+    assert _trigger_candidates(branch, "life_gain") == ["ajani-1"]
+    assert _trigger_candidates(state, "life_gain") == ["ajani-1", "ajani-2"]
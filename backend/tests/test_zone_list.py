@@ -0,0 +1,48 @@
+import copy
+import json
+import pickle
+import random
+
+from game_state.serializers import deserialize_match_snapshot, serialize_match_snapshot
+from game_state.state import MatchFactory, PlayerState
+from game_state.zone_list import ZoneList
+
+
+def test_zone_list_keeps_list_semantics_with_indexed_lookups() -> None:
+    zone = ZoneList(["a", "b", "c"])
+    assert "b" in zone and "z" not in zone
+    assert zone.index("c") == 2
+
+    zone.append("d")
+    assert zone.index("d") == 3
+    zone.remove("b")
+    assert zone == ["a", "c", "d"]
+    assert zone.index("d") == 2
+    assert zone.pop() == "d"
+    assert "d" not in zone
+
+    zone.insert(0, "z")
+    zone[1:] = ["x", "y"]
+    assert zone == ["z", "x", "y"] and zone.index("y") == 2
+    random.Random(3).shuffle(zone)
+    assert sorted(zone) == ["x", "y", "z"]
+    assert all(zone.index(cid) == position for position, cid in enumerate(zone))
+    assert isinstance(zone[:2], list) and json.dumps(zone) == json.dumps(list(zone))
+
+
+def test_zone_list_survives_copies_pickles_and_snapshots() -> None:
+    zone = ZoneList(["a", "b"])
+    for clone in (copy.deepcopy(zone), pickle.loads(pickle.dumps(zone)), zone.copy()):
+        assert isinstance(clone, ZoneList) and clone == zone and "b" in clone
+
+    player = PlayerState(id=1, name="A", hand=["x"])
+    player.graveyard = ["y"]
+    assert isinstance(player.hand, ZoneList) and isinstance(player.graveyard, ZoneList)
+
+    deck = [{"quantity": 60, "card_name": "Island"}]
+    state = MatchFactory.from_decks(deck, deck, seed=4)
+    payload = serialize_match_snapshot(state)
+    assert isinstance(payload["players"]["1"]["library"], list)
+    restored = deserialize_match_snapshot(json.loads(json.dumps(payload)))
+    assert isinstance(restored.players[1].library, ZoneList)
+    assert restored.players[1].library == state.players[1].library